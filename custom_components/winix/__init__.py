@@ -4,49 +4,143 @@ from collections.abc import Iterable
 from typing import Final
 
 from awesomeversion import AwesomeVersion
+import voluptuous as vol
 from winix import auth
 
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
     CONF_PASSWORD,
     CONF_USERNAME,
-    STATE_UNAVAILABLE,
-    Platform,
     __version__,
 )
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import (
-    aiohttp_client,
+    config_validation as cv,
     device_registry as dr,
     entity_registry as er,
 )
 
+from .bulk import (
+    BulkOperation,
+    async_run_bulk,
+    brightness_level_operation,
+    child_lock_operation,
+    power_operation,
+    preset_mode_operation,
+    speed_operation,
+)
 from .const import (
+    ATTR_BRIGHTNESS_LEVEL,
+    ATTR_CHILD_LOCK,
+    ATTR_POWER,
+    BULK_SERVICES,
+    CONF_FAST_STARTUP,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_SNAPSHOT_NAME,
     FAN_SERVICES,
     LOGGER,
+    PRESET_MODES,
+    SERVICE_BULK_SET_BRIGHTNESS_LEVEL,
+    SERVICE_BULK_SET_CHILD_LOCK,
+    SERVICE_BULK_SET_POWER,
+    SERVICE_BULK_SET_PRESET_MODE,
+    SERVICE_BULK_SET_SPEED,
+    SERVICE_PROFILE,
     SERVICE_REMOVE_STALE_ENTITIES,
+    SERVICE_SNAPSHOT,
+    SERVICE_START_TRACE,
+    SERVICE_STOP_TRACE,
+    SNAPSHOT_SERVICES,
+    TRACE_SERVICES,
     WINIX_AUTH_RESPONSE,
     WINIX_DOMAIN,
     WINIX_NAME,
     __min_ha_version__,
 )
+from .credentials import async_get_credentials, async_remove_credentials
+from .device_wrapper import WinixDeviceWrapper
+from .driver import BrightnessLevel
 from .helpers import Helpers, WinixException
 from .manager import WinixManager
+from .profiler import async_start_profile, async_stop_profile
+from .snapshot import async_restore, async_snapshot
+from .transport import async_get_transport
 
 type WinixConfigEntry = ConfigEntry[WinixManager]
 
-SUPPORTED_PLATFORMS = [
-    Platform.BINARY_SENSOR,
-    Platform.FAN,
-    Platform.HUMIDIFIER,
-    Platform.NUMBER,
-    Platform.SENSOR,
-    Platform.SELECT,
-    Platform.SWITCH,
-]
-DEFAULT_SCAN_INTERVAL: Final = 30
+ATTR_DURATION: Final = "duration"
+ATTR_NAME: Final = "name"
+ATTR_PERCENTAGE: Final = "percentage"
+ATTR_PRESET_MODE: Final = "preset_mode"
+ATTR_SAMPLE_RATE: Final = "sample_rate"
+
+BULK_TARGET_SCHEMA = {
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+}
+BULK_SERVICE_SCHEMAS = {
+    SERVICE_BULK_SET_POWER: vol.Schema(
+        {**BULK_TARGET_SCHEMA, vol.Required(ATTR_POWER): cv.boolean}
+    ),
+    SERVICE_BULK_SET_PRESET_MODE: vol.Schema(
+        {**BULK_TARGET_SCHEMA, vol.Required(ATTR_PRESET_MODE): vol.In(PRESET_MODES)}
+    ),
+    SERVICE_BULK_SET_SPEED: vol.Schema(
+        {
+            **BULK_TARGET_SCHEMA,
+            vol.Required(ATTR_PERCENTAGE): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=100)
+            ),
+        }
+    ),
+    SERVICE_BULK_SET_BRIGHTNESS_LEVEL: vol.Schema(
+        {
+            **BULK_TARGET_SCHEMA,
+            vol.Required(ATTR_BRIGHTNESS_LEVEL): vol.All(
+                vol.Coerce(int), vol.In([e.value for e in BrightnessLevel])
+            ),
+        }
+    ),
+    SERVICE_BULK_SET_CHILD_LOCK: vol.Schema(
+        {**BULK_TARGET_SCHEMA, vol.Required(ATTR_CHILD_LOCK): cv.boolean}
+    ),
+}
+SNAPSHOT_SERVICE_SCHEMA = vol.Schema(
+    {
+        **BULK_TARGET_SCHEMA,
+        vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT_NAME): cv.string,
+    }
+)
+TRACE_SERVICE_SCHEMAS = {
+    SERVICE_START_TRACE: vol.Schema(
+        {
+            **BULK_TARGET_SCHEMA,
+            vol.Optional(ATTR_SAMPLE_RATE, default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+        }
+    ),
+    SERVICE_STOP_TRACE: vol.Schema(BULK_TARGET_SCHEMA),
+}
+PROFILE_SERVICE_SCHEMA = vol.Schema(
+    {
+        **BULK_TARGET_SCHEMA,
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)
+        ),
+    }
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: WinixConfigEntry) -> bool:
@@ -79,10 +173,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: WinixConfigEntry) -> boo
             "No authentication data found. Please reconfigure the integration."
         )
 
-    # Grab the client once and pass it around
-    client = aiohttp_client.async_get_clientsession(hass)
+    # All the entries share one rate limited transport
+    transport = async_get_transport(hass)
 
-    manager = WinixManager(hass, entry, auth_response, DEFAULT_SCAN_INTERVAL, client)
+    # Shared with the drivers so that new tokens are used without a reload
+    credentials = async_get_credentials(hass, entry.entry_id, auth_response)
+    manager = WinixManager(hass, entry, credentials, DEFAULT_SCAN_INTERVAL, transport)
     new_auth_response = await async_prepare_devices(
         hass, manager, user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
     )
@@ -107,30 +203,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: WinixConfigEntry) -> boo
             else "unchanged",
         )
 
-        auth_response.access_token = new_auth_response.access_token
-        auth_response.refresh_token = new_auth_response.refresh_token
-        auth_response.id_token = new_auth_response.id_token
-
         # Update tokens into entry.data
         hass.config_entries.async_update_entry(
             entry,
-            data={**user_input, WINIX_AUTH_RESPONSE: auth_response},
+            data={**user_input, WINIX_AUTH_RESPONSE: new_auth_response},
         )
 
-    await manager.async_config_entry_first_refresh()
-    manager.update_features()  # Update features after the first refresh to ensure we have the latest state
+    if entry.options.get(CONF_FAST_STARTUP, False):
+        await manager.async_fast_first_refresh()
+    else:
+        await manager.async_config_entry_first_refresh()
+        manager.update_features()  # Update features after the first refresh to ensure we have the latest state
+
+    manager.async_start_polling(transport.async_register_entry(entry.entry_id))
+    manager.async_start_discovery()
+    entry.async_on_unload(manager.async_stop_polling)
+    entry.async_on_unload(lambda: transport.async_unregister_entry(entry.entry_id))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     entry.runtime_data = manager
-    await hass.config_entries.async_forward_entry_setups(entry, SUPPORTED_PLATFORMS)
+    # Only the platforms of the current devices, the others are set up when needed
+    await manager.async_setup_platforms()
 
     setup_hass_services(hass)
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: WinixConfigEntry) -> None:
+    """Apply the polling options without reloading the entry."""
+    entry.runtime_data.async_apply_options()
+
+
 async def async_prepare_devices(
     hass: HomeAssistant, manager: WinixManager, username: str, password: str
 ) -> auth.WinixAuthResponse | None:
-    """Prepare devices asynchronously. Returns new auth response if re-login was performed.
+    """Prepare devices asynchronously. Returns new auth response if the tokens were refreshed or re-login was performed.
 
     Raises ConfigEntryAuthFailed or ConfigEntryNotReady.
     """
@@ -145,26 +252,37 @@ async def async_prepare_devices(
 
         if err.result_code in ("900", "400", "NotAuthorizedException"):
             LOGGER.info(
-                "Failed to get device list (code=%s, message=%s), reauthenticating with stored credentials",
+                "Failed to get device list (code=%s, message=%s), refreshing the tokens",
                 err.result_code,
                 err.result_message,
             )
 
+            # The refresh token outlives the other tokens, the password login is
+            # only needed once it is rejected as well.
             try:
-                # Avoid blocking the event loop (https://developers.home-assistant.io/docs/asyncio_blocking_operations)
-                new_auth_response = await hass.async_add_executor_job(
-                    Helpers.login, username, password
+                new_auth_response = await Helpers.async_refresh_auth(
+                    hass, manager.credentials
+                )
+                await manager.prepare_devices_wrappers()
+            except WinixException as refresh_err:
+                LOGGER.info(
+                    "Token refresh failed (code=%s), reauthenticating with stored credentials",
+                    refresh_err.result_code,
                 )
+            else:
+                return new_auth_response
+
+            try:
+                new_auth_response = await Helpers.async_login(hass, username, password)
             except WinixException as login_err:
                 raise ConfigEntryAuthFailed("Unable to authenticate.") from login_err
 
             LOGGER.info("Reauthenticating successful, getting device list again")
+            manager.credentials.update(new_auth_response)
 
             # Try preparing device wrappers again with new auth response
             try:
-                await manager.prepare_devices_wrappers(
-                    new_auth_response.access_token, new_auth_response.id_token
-                )
+                await manager.prepare_devices_wrappers()
             except WinixException as err_retry:
                 raise ConfigEntryAuthFailed(
                     "Unable to access device data even after re-login."
@@ -185,8 +303,9 @@ async def async_prepare_devices(
 def setup_hass_services(hass: HomeAssistant) -> None:
     """Home Assistant services."""
 
+    @callback
     def remove_stale_entities(call: ServiceCall) -> None:
-        """Remove stale entities."""
+        """Remove the entities of the devices which are no longer in the accounts."""
         device_registry = dr.async_get(hass)
         entity_registry = er.async_get(hass)
 
@@ -194,24 +313,33 @@ def setup_hass_services(hass: HomeAssistant) -> None:
         entity_ids = set()
         device_ids = set()
 
-        for state in hass.states.async_all(SUPPORTED_PLATFORMS):
-            entity_id = state.entity_id
-            entity = entity_registry.async_get(entity_id)
+        # The devices of the entries which are not loaded are unknown, their
+        # entities are left alone.
+        for entry in hass.config_entries.async_loaded_entries(WINIX_DOMAIN):
+            macs = {
+                wrapper.device_stub.mac.lower()
+                for wrapper in entry.runtime_data.get_device_wrappers()
+            }
 
-            if entity and entity.unique_id.startswith(
-                f"{entity.domain}.{WINIX_DOMAIN}_"
+            for entity in er.async_entries_for_config_entry(
+                entity_registry, entry.entry_id
             ):
-                device_id = entity.device_id
-                device = device_registry.async_get(device_id)
+                # Both the legacy "<domain>.winix_<key>_<mac>" and the newer
+                # "<key>_<mac>" unique ids end with the mac.
+                mac = entity.unique_id.rpartition("_")[2]
+                device = (
+                    device_registry.async_get(entity.device_id)
+                    if entity.device_id
+                    else None
+                )
 
-                if state.state == STATE_UNAVAILABLE or not device:
-                    entity_ids.add(entity_id)
-                    device_ids.add(device_id)
+                if mac not in macs or not device:
+                    entity_ids.add(entity.entity_id)
+                    if device:
+                        device_ids.add(device.id)
 
         if entity_ids:
-            hass.add_job(
-                async_remove, entity_registry, device_registry, entity_ids, device_ids
-            )
+            async_remove(entity_registry, device_registry, entity_ids, device_ids)
         else:
             LOGGER.debug("Nothing to remove")
 
@@ -219,6 +347,151 @@ def setup_hass_services(hass: HomeAssistant) -> None:
         WINIX_DOMAIN, SERVICE_REMOVE_STALE_ENTITIES, remove_stale_entities
     )
 
+    async def bulk_service_handler(call: ServiceCall) -> ServiceResponse:
+        """Apply a setting to the selected devices through the bulk executor."""
+        data = call.data
+        operation: BulkOperation
+
+        if call.service == SERVICE_BULK_SET_POWER:
+            operation = power_operation(data[ATTR_POWER])
+        elif call.service == SERVICE_BULK_SET_PRESET_MODE:
+            operation = preset_mode_operation(data[ATTR_PRESET_MODE])
+        elif call.service == SERVICE_BULK_SET_SPEED:
+            operation = speed_operation(data[ATTR_PERCENTAGE])
+        elif call.service == SERVICE_BULK_SET_BRIGHTNESS_LEVEL:
+            operation = brightness_level_operation(data[ATTR_BRIGHTNESS_LEVEL])
+        else:
+            operation = child_lock_operation(data[ATTR_CHILD_LOCK])
+
+        targets = async_get_target_wrappers(
+            hass, data.get(ATTR_ENTITY_ID), data.get(ATTR_DEVICE_ID)
+        )
+        LOGGER.debug("Service '%s' invoked for %d devices", call.service, len(targets))
+
+        summary = await async_run_bulk([wrapper for wrapper, _ in targets], operation)
+
+        # Let the entities of the affected devices write their new state
+        for manager in {id(manager): manager for _, manager in targets}.values():
+            manager.async_update_listeners()
+
+        return summary
+
+    for service_name, schema in BULK_SERVICE_SCHEMAS.items():
+        hass.services.async_register(
+            WINIX_DOMAIN,
+            service_name,
+            bulk_service_handler,
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    async def snapshot_service_handler(call: ServiceCall) -> ServiceResponse:
+        """Save or restore a snapshot of the selected devices."""
+        targets = async_get_target_wrappers(
+            hass, call.data.get(ATTR_ENTITY_ID), call.data.get(ATTR_DEVICE_ID)
+        )
+        wrappers = [wrapper for wrapper, _ in targets]
+
+        if call.service == SERVICE_SNAPSHOT:
+            return await async_snapshot(hass, call.data[ATTR_NAME], wrappers)
+
+        summary = await async_restore(hass, call.data[ATTR_NAME], wrappers)
+        for manager in {id(manager): manager for _, manager in targets}.values():
+            manager.async_update_listeners()
+        return summary
+
+    for service_name in SNAPSHOT_SERVICES:
+        hass.services.async_register(
+            WINIX_DOMAIN,
+            service_name,
+            snapshot_service_handler,
+            schema=SNAPSHOT_SERVICE_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    async def trace_service_handler(call: ServiceCall) -> ServiceResponse:
+        """Start or stop tracing the selected devices."""
+        targets = async_get_target_wrappers(
+            hass, call.data.get(ATTR_ENTITY_ID), call.data.get(ATTR_DEVICE_ID)
+        )
+
+        if call.service == SERVICE_START_TRACE:
+            for wrapper, _ in targets:
+                wrapper.tracer.start(call.data[ATTR_SAMPLE_RATE])
+            return {"devices": len(targets)}
+
+        return {
+            wrapper.device_stub.mac.lower(): wrapper.tracer.stop()
+            for wrapper, _ in targets
+            if wrapper.tracer.enabled
+        }
+
+    for service_name, schema in TRACE_SERVICE_SCHEMAS.items():
+        hass.services.async_register(
+            WINIX_DOMAIN,
+            service_name,
+            trace_service_handler,
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    async def profile_service_handler(call: ServiceCall) -> ServiceResponse:
+        """Profile the selected devices and write the report."""
+        targets = async_get_target_wrappers(
+            hass, call.data.get(ATTR_ENTITY_ID), call.data.get(ATTR_DEVICE_ID)
+        )
+        return await async_start_profile(
+            hass, [wrapper for wrapper, _ in targets], call.data[ATTR_DURATION]
+        )
+
+    hass.services.async_register(
+        WINIX_DOMAIN,
+        SERVICE_PROFILE,
+        profile_service_handler,
+        schema=PROFILE_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_get_target_wrappers(
+    hass: HomeAssistant,
+    entity_ids: Iterable[str] | None,
+    device_ids: Iterable[str] | None,
+) -> list[tuple[WinixDeviceWrapper, WinixManager]]:
+    """Return the device wrappers selected by entity or device ids.
+
+    All the devices of all loaded entries are returned if nothing was selected.
+    """
+
+    macs: set[str] | None = None
+    if entity_ids or device_ids:
+        device_registry = dr.async_get(hass)
+        entity_registry = er.async_get(hass)
+
+        selected_device_ids = set(device_ids or [])
+        for entity_id in entity_ids or []:
+            entity = entity_registry.async_get(entity_id)
+            if entity and entity.device_id:
+                selected_device_ids.add(entity.device_id)
+
+        macs = set()
+        for device_id in selected_device_ids:
+            device = device_registry.async_get(device_id)
+            if device:
+                macs.update(
+                    identifier
+                    for domain, identifier in device.identifiers
+                    if domain == WINIX_DOMAIN
+                )
+
+    return [
+        (wrapper, entry.runtime_data)
+        for entry in hass.config_entries.async_loaded_entries(WINIX_DOMAIN)
+        for wrapper in entry.runtime_data.get_device_wrappers()
+        if macs is None or wrapper.device_stub.mac.lower() in macs
+    ]
+
 
 @callback
 def async_remove(
@@ -237,10 +510,13 @@ def async_remove(
         LOGGER.debug("Removing device %s", device_id)
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def async_unload_entry(hass: HomeAssistant, entry: WinixConfigEntry) -> bool:
     """Unload a config entry."""
+    # The profiled devices can belong to this entry
+    await async_stop_profile(hass)
+
     unload_ok = await hass.config_entries.async_unload_platforms(
-        entry, SUPPORTED_PLATFORMS
+        entry, entry.runtime_data.platforms
     )
 
     other_loaded_entries = [
@@ -251,13 +527,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not other_loaded_entries:
         # If this is the last loaded instance, then unregister services
         hass.services.async_remove(WINIX_DOMAIN, SERVICE_REMOVE_STALE_ENTITIES)
+        hass.services.async_remove(WINIX_DOMAIN, SERVICE_PROFILE)
 
-        for service_name in FAN_SERVICES:
+        for service_name in (
+            FAN_SERVICES + BULK_SERVICES + SNAPSHOT_SERVICES + TRACE_SERVICES
+        ):
             hass.services.async_remove(WINIX_DOMAIN, service_name)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the credentials of a removed config entry."""
+    async_remove_credentials(hass, entry.entry_id)
+
+
 def is_valid_ha_version() -> bool:
     """Check if HA version is valid for this integration."""
     return AwesomeVersion(__version__) >= AwesomeVersion(__min_ha_version__)
@@ -14,7 +14,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import WinixConfigEntry
 from .const import BINARY_SENSOR_AUTO_DRY, BINARY_SENSOR_WATER_TANK, LOGGER
 from .device_wrapper import WinixDeviceWrapper
-from .manager import WinixEntity, WinixManager
+from .manager import WinixEntity, WinixManager, async_add_device_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -51,14 +51,13 @@ async def async_setup_entry(
     """Set up the Winix binary sensors."""
     manager = entry.runtime_data
 
-    entities = [
-        WinixBinarySensor(wrapper, manager, description)
-        for description in BINARY_SENSOR_DESCRIPTIONS
-        for wrapper in manager.get_device_wrappers()
-        if description.exists_fn(wrapper)
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s binary sensors", len(entities))
+    count = async_add_device_entities(
+        manager,
+        BINARY_SENSOR_DESCRIPTIONS,
+        lambda wrapper, description: WinixBinarySensor(wrapper, manager, description),
+        async_add_entities,
+    )
+    LOGGER.info("Added %s binary sensors", count)
 
 
 class WinixBinarySensor(WinixEntity, BinarySensorEntity):
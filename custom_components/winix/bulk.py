@@ -0,0 +1,154 @@
+"""Fleet-wide bulk operations for Winix devices."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from .const import (
+    ATTR_AIRFLOW,
+    BULK_MAX_CONCURRENCY,
+    BULK_RESULT_FAILED,
+    BULK_RESULT_OFF,
+    BULK_RESULT_SKIPPED,
+    BULK_RESULT_UNSUPPORTED,
+    BULK_RESULT_UPDATED,
+    LOGGER,
+)
+from .device_wrapper import WinixDeviceWrapper, get_preset_mode
+
+type BulkOperation = Callable[[WinixDeviceWrapper], Awaitable[str]]
+
+
+async def async_run_bulk(
+    wrappers: Iterable[WinixDeviceWrapper],
+    operation: BulkOperation,
+    max_concurrency: int = BULK_MAX_CONCURRENCY,
+) -> dict[str, Any]:
+    """Run the operation on all the wrappers and return a per-device summary.
+
+    At most max_concurrency devices are commanded at the same time, the commands for
+    a single device are still issued sequentially by the operation.
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    wrappers = list(wrappers)
+
+    async def _run(wrapper: WinixDeviceWrapper) -> dict[str, str]:
+        result = {
+            "device": wrapper.device_stub.alias,
+            "mac": wrapper.device_stub.mac,
+        }
+
+        async with semaphore:
+            try:
+                result["result"] = await operation(wrapper)
+            except Exception as err:  # pylint: disable=broad-except # noqa: BLE001
+                LOGGER.warning(
+                    "Bulk operation failed for %s: %s", wrapper.device_stub.alias, err
+                )
+                result["result"] = BULK_RESULT_FAILED
+                result["error"] = str(err)
+
+        return result
+
+    results = await asyncio.gather(*(_run(wrapper) for wrapper in wrappers))
+
+    summary: dict[str, Any] = {
+        outcome: 0
+        for outcome in (
+            BULK_RESULT_UPDATED,
+            BULK_RESULT_SKIPPED,
+            BULK_RESULT_UNSUPPORTED,
+            BULK_RESULT_OFF,
+            BULK_RESULT_FAILED,
+        )
+    }
+    for result in results:
+        summary[result["result"]] += 1
+
+    summary["devices"] = results
+    return summary
+
+
+def power_operation(on: bool) -> BulkOperation:
+    """Return an operation which powers devices on or off."""
+
+    async def _operation(wrapper: WinixDeviceWrapper) -> str:
+        if wrapper.is_on == on:
+            return BULK_RESULT_SKIPPED
+
+        if on:
+            await wrapper.async_ensure_on()
+        else:
+            await wrapper.async_turn_off()
+        return BULK_RESULT_UPDATED
+
+    return _operation
+
+
+def preset_mode_operation(preset_mode: str) -> BulkOperation:
+    """Return an operation which puts purifiers in the preset mode."""
+
+    async def _operation(wrapper: WinixDeviceWrapper) -> str:
+        if not wrapper.is_air_purifier:
+            return BULK_RESULT_UNSUPPORTED
+
+        if wrapper.is_on and get_preset_mode(wrapper) == preset_mode:
+            return BULK_RESULT_SKIPPED
+
+        await wrapper.async_set_preset_mode(preset_mode)
+        return BULK_RESULT_UPDATED
+
+    return _operation
+
+
+def speed_operation(percentage: int) -> BulkOperation:
+    """Return an operation which sets the fan speed from a percentage."""
+
+    async def _operation(wrapper: WinixDeviceWrapper) -> str:
+        speed = wrapper.profile.percentage_to_speed(percentage)
+        already_set = not wrapper.is_air_purifier or (
+            wrapper.is_on and wrapper.is_manual and not wrapper.is_sleep
+        )
+
+        if already_set and (wrapper.get_state() or {}).get(ATTR_AIRFLOW) == speed:
+            return BULK_RESULT_SKIPPED
+
+        await wrapper.async_set_speed(speed)
+        return BULK_RESULT_UPDATED
+
+    return _operation
+
+
+def brightness_level_operation(brightness_level: int) -> BulkOperation:
+    """Return an operation which sets the brightness level."""
+
+    async def _operation(wrapper: WinixDeviceWrapper) -> str:
+        if not wrapper.features.supports_brightness_level:
+            return BULK_RESULT_UNSUPPORTED
+
+        # Winix only accepts brightness changes while the purifier is running
+        if not wrapper.is_on:
+            return BULK_RESULT_OFF
+
+        if await wrapper.async_set_brightness_level(brightness_level):
+            return BULK_RESULT_UPDATED
+        return BULK_RESULT_SKIPPED
+
+    return _operation
+
+
+def child_lock_operation(on: bool) -> BulkOperation:
+    """Return an operation which turns the child lock on or off."""
+
+    async def _operation(wrapper: WinixDeviceWrapper) -> str:
+        if not wrapper.features.supports_child_lock:
+            return BULK_RESULT_UNSUPPORTED
+
+        if on:
+            changed = await wrapper.async_child_lock_on()
+        else:
+            changed = await wrapper.async_child_lock_off()
+        return BULK_RESULT_UPDATED if changed else BULK_RESULT_SKIPPED
+
+    return _operation
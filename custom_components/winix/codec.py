@@ -0,0 +1,38 @@
+"""JSON codec for the Winix cloud responses.
+
+orjson is used when it is available, Home Assistant ships it, otherwise the
+standard library decoder is used. Both accept the response bytes directly.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+JSON_DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError,)
+"""Raised on invalid JSON by either decoder, orjson.JSONDecodeError is a ValueError"""
+
+
+def _stdlib_loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode using the standard library."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Encode using the standard library."""
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+if orjson is None:  # pragma: no cover
+    CODEC_NAME = "json"
+    json_loads = _stdlib_loads
+    json_dumps = _stdlib_dumps
+else:
+    CODEC_NAME = "orjson"
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
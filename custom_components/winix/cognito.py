@@ -0,0 +1,104 @@
+"""Minimal async client for the Amazon Cognito calls used by Winix."""
+
+from http import HTTPStatus
+from typing import Any
+
+import aiohttp
+
+from .codec import JSON_DECODE_ERRORS, json_dumps, json_loads
+from .const import DEFAULT_POST_TIMEOUT
+
+COGNITO_REGION = "us-east-1"
+
+_IDP_URL = "https://cognito-idp.{region}.amazonaws.com/"
+_IDENTITY_URL = "https://cognito-identity.{region}.amazonaws.com/"
+_CONTENT_TYPE = "application/x-amz-json-1.1"
+
+
+class CognitoError(Exception):
+    """Error response of a Cognito service."""
+
+    def __init__(self, code: str, message: str) -> None:
+        """Initialize the error, code is the exception name like NotAuthorizedException."""
+        super().__init__(f"{code}: {message}" if code else message)
+        self.code = code
+
+
+class CognitoClient:
+    """Client of the AWS JSON protocol of the Cognito services.
+
+    Only calls which are allowed without AWS credentials are supported, so the
+    requests are not signed.
+    """
+
+    def __init__(
+        self, session: aiohttp.ClientSession, region: str = COGNITO_REGION
+    ) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._idp_url = _IDP_URL.format(region=region)
+        self._identity_url = _IDENTITY_URL.format(region=region)
+
+    async def async_refresh_tokens(
+        self, client_id: str, refresh_token: str
+    ) -> dict[str, Any]:
+        """Return the AuthenticationResult of the REFRESH_TOKEN flow of InitiateAuth.
+
+        Raises CognitoError, aiohttp.ClientError or TimeoutError.
+        """
+        response = await self._async_call(
+            self._idp_url,
+            "AWSCognitoIdentityProviderService.InitiateAuth",
+            {
+                "ClientId": client_id,
+                "AuthFlow": "REFRESH_TOKEN",
+                "AuthParameters": {"REFRESH_TOKEN": refresh_token},
+            },
+        )
+
+        result = response.get("AuthenticationResult")
+        if not result:
+            raise CognitoError("", "AuthenticationResult missing from response.")
+        return result
+
+    async def async_get_id(
+        self, identity_pool_id: str, logins: dict[str, str]
+    ) -> str | None:
+        """Return the IdentityId of GetId for the logins.
+
+        Raises CognitoError, aiohttp.ClientError or TimeoutError.
+        """
+        response = await self._async_call(
+            self._identity_url,
+            "AWSCognitoIdentityService.GetId",
+            {"IdentityPoolId": identity_pool_id, "Logins": logins},
+        )
+        return response.get("IdentityId")
+
+    async def _async_call(
+        self, url: str, target: str, payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Call an operation and return its response.
+
+        Raises CognitoError, aiohttp.ClientError or TimeoutError.
+        """
+        response = await self._session.post(
+            url,
+            data=json_dumps(payload),
+            headers={"Content-Type": _CONTENT_TYPE, "X-Amz-Target": target},
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_POST_TIMEOUT),
+        )
+        body = await response.read()
+
+        try:
+            data = json_loads(body) if body else {}
+        except JSON_DECODE_ERRORS:
+            data = {}
+
+        if response.status != HTTPStatus.OK:
+            # The type can be qualified, e.g. "com.amazonaws...#NotAuthorizedException"
+            code = str(data.get("__type", "")).rpartition("#")[2]
+            message = data.get("message") or data.get("Message")
+            raise CognitoError(code, message or f"Request failed ({response.status})")
+
+        return data
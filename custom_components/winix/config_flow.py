@@ -7,10 +7,32 @@ import voluptuous as vol
 from winix import auth
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    TextSelector,
+)
 
-from .const import LOGGER, WINIX_AUTH_RESPONSE, WINIX_DOMAIN, WINIX_NAME
+from .const import (
+    CONF_DEHUMIDIFIER_SCAN_INTERVAL,
+    CONF_DEVICE_SCAN_INTERVALS,
+    CONF_FAST_STARTUP,
+    CONF_HISTORY_WINDOWS,
+    CONF_PURIFIER_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    HISTORY_WINDOWS,
+    LOGGER,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    WINIX_AUTH_RESPONSE,
+    WINIX_DOMAIN,
+    WINIX_NAME,
+)
 from .helpers import Helpers, WinixException
 
 REAUTH_SCHEMA = vol.Schema({vol.Required(CONF_PASSWORD): str})
@@ -22,6 +44,45 @@ AUTH_DATA_SCHEMA = vol.Schema(
     }
 )
 
+SCAN_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=MIN_SCAN_INTERVAL,
+        max=MAX_SCAN_INTERVAL,
+        mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
+# 0 falls back to the next level
+SCAN_INTERVAL_OVERRIDE_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=0,
+        max=MAX_SCAN_INTERVAL,
+        mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
+
+def _validate_overrides(user_input: dict[str, Any]) -> dict[str, str]:
+    """Validate that the interval overrides are either unset or above the minimum."""
+    return {
+        key: "interval_too_short"
+        for key, value in user_input.items()
+        if 0 < value < MIN_SCAN_INTERVAL
+    }
+
+
+def _parse_history_windows(value: str) -> list[int] | None:
+    """Return the minutes of a comma separated list of windows, None if invalid."""
+    try:
+        windows = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        return None
+    if not windows or any(window <= 0 for window in windows):
+        return None
+    return windows
+
 
 class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
     """Config flow handler."""
@@ -32,6 +93,14 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
         """Start a config flow."""
         self._reauth_unique_id = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> WinixOptionsFlow:
+        """Get the options flow for this handler."""
+        return WinixOptionsFlow()
+
     async def _validate_input(self, username: str, password: str):
         """Validate the user input."""
         try:
@@ -103,7 +172,7 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
                         WINIX_AUTH_RESPONSE: auth_response,
                     },
                 )
-                await self.hass.config_entries.async_reload(existing_entry.entry_id)
+                await self._async_apply_credentials(existing_entry, auth_response)
                 return self.async_abort(reason="reauth_successful")
 
         return self.async_show_form(
@@ -112,3 +181,142 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
             data_schema=REAUTH_SCHEMA,
             errors=errors,
         )
+
+    async def _async_apply_credentials(
+        self, entry: config_entries.ConfigEntry, auth_response: auth.WinixAuthResponse
+    ) -> None:
+        """Hand the new tokens to a loaded entry, other entries are reloaded."""
+        if entry.state is config_entries.ConfigEntryState.LOADED:
+            try:
+                await entry.runtime_data.async_update_credentials(auth_response)
+            except WinixException as err:
+                LOGGER.warning("Unable to apply the new credentials: %s", err)
+            else:
+                return
+
+        await self.hass.config_entries.async_reload(entry.entry_id)
+
+
+class WinixOptionsFlow(config_entries.OptionsFlow):
+    """Options flow handler for the polling intervals and the history windows."""
+
+    def __init__(self) -> None:
+        """Start an options flow."""
+        self._options: dict[str, Any] = {}
+
+    def _get_devices(self) -> dict[str, str]:
+        """Return the mac of the devices by name, empty if the entry is not loaded."""
+        if self.config_entry.state is not config_entries.ConfigEntryState.LOADED:
+            return {}
+
+        devices: dict[str, str] = {}
+        for wrapper in self.config_entry.runtime_data.get_device_wrappers():
+            mac = wrapper.device_stub.mac.lower()
+            name = wrapper.device_stub.alias
+            devices[f"{name} ({mac})" if name in devices else name] = mac
+        return devices
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the global and product group intervals and the history windows."""
+
+        errors: dict[str, str] = {}
+        options = self.config_entry.options
+
+        if user_input is not None:
+            intervals = {
+                key: value
+                for key, value in user_input.items()
+                if key not in (CONF_FAST_STARTUP, CONF_HISTORY_WINDOWS)
+            }
+            errors = _validate_overrides(
+                {
+                    key: value
+                    for key, value in intervals.items()
+                    if key != CONF_SCAN_INTERVAL
+                }
+            )
+            history_windows = _parse_history_windows(
+                user_input.get(CONF_HISTORY_WINDOWS, "")
+            )
+            if history_windows is None:
+                errors[CONF_HISTORY_WINDOWS] = "invalid_history_windows"
+
+            if not errors:
+                self._options = {
+                    **options,
+                    **{key: int(value) for key, value in intervals.items()},
+                    CONF_FAST_STARTUP: user_input.get(CONF_FAST_STARTUP, False),
+                    CONF_HISTORY_WINDOWS: history_windows,
+                }
+                if self._get_devices():
+                    return await self.async_step_devices()
+                return self.async_create_entry(data=self._options)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): SCAN_INTERVAL_SELECTOR,
+                    vol.Required(
+                        CONF_PURIFIER_SCAN_INTERVAL,
+                        default=options.get(CONF_PURIFIER_SCAN_INTERVAL, 0),
+                    ): SCAN_INTERVAL_OVERRIDE_SELECTOR,
+                    vol.Required(
+                        CONF_DEHUMIDIFIER_SCAN_INTERVAL,
+                        default=options.get(CONF_DEHUMIDIFIER_SCAN_INTERVAL, 0),
+                    ): SCAN_INTERVAL_OVERRIDE_SELECTOR,
+                    vol.Required(
+                        CONF_FAST_STARTUP,
+                        default=options.get(CONF_FAST_STARTUP, False),
+                    ): BooleanSelector(),
+                    vol.Required(
+                        CONF_HISTORY_WINDOWS,
+                        default=", ".join(
+                            str(window)
+                            for window in options.get(
+                                CONF_HISTORY_WINDOWS,
+                                [window // 60 for window in HISTORY_WINDOWS],
+                            )
+                        ),
+                    ): TextSelector(),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_devices(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the per-device intervals."""
+
+        errors: dict[str, str] = {}
+        devices = self._get_devices()
+
+        if user_input is not None:
+            errors = _validate_overrides(user_input)
+            if not errors:
+                self._options[CONF_DEVICE_SCAN_INTERVALS] = {
+                    devices[name]: int(value)
+                    for name, value in user_input.items()
+                    if value and name in devices
+                }
+                return self.async_create_entry(data=self._options)
+
+        intervals = self._options.get(CONF_DEVICE_SCAN_INTERVALS, {})
+        return self.async_show_form(
+            step_id="devices",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(name, default=intervals.get(mac, 0)): (
+                        SCAN_INTERVAL_OVERRIDE_SELECTOR
+                    )
+                    for name, mac in devices.items()
+                }
+            ),
+            errors=errors,
+        )
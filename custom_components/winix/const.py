@@ -1,5 +1,7 @@
 """Constants for the Winix component."""
 
+from dataclasses import dataclass
+from datetime import timedelta
 from enum import StrEnum, unique
 import logging
 from typing import Final
@@ -39,6 +41,12 @@ SENSOR_PM25: Final = "pm2_5"
 SENSOR_AQI: Final = "aqi"
 SENSOR_FILTER_LIFE: Final = "filter_life"
 SENSOR_MAX_FILTER_LIFE: Final = "max_filter_life"
+SENSOR_FILTER_REPLACEMENT: Final = "filter_replacement"
+SENSOR_FILTER_USAGE_RATE: Final = "filter_usage_rate"
+SENSOR_RSSI: Final = "rssi"
+SENSOR_DATA_AGE: Final = "data_age"
+SENSOR_POLL_LATENCY: Final = "poll_latency"
+SENSOR_POLL_SUCCESS_RATE: Final = "poll_success_rate"
 
 BINARY_SENSOR_WATER_TANK: Final = "water_tank"
 BINARY_SENSOR_AUTO_DRY: Final = "auto_dry"
@@ -64,6 +72,82 @@ FAN_SERVICES: Final = [
     SERVICE_PLASMAWAVE_TOGGLE,
 ]
 
+# Fleet-wide services, handled by the bulk executor
+SERVICE_BULK_SET_POWER: Final = "bulk_set_power"
+SERVICE_BULK_SET_PRESET_MODE: Final = "bulk_set_preset_mode"
+SERVICE_BULK_SET_SPEED: Final = "bulk_set_speed"
+SERVICE_BULK_SET_BRIGHTNESS_LEVEL: Final = "bulk_set_brightness_level"
+SERVICE_BULK_SET_CHILD_LOCK: Final = "bulk_set_child_lock"
+BULK_SERVICES: Final = [
+    SERVICE_BULK_SET_POWER,
+    SERVICE_BULK_SET_PRESET_MODE,
+    SERVICE_BULK_SET_SPEED,
+    SERVICE_BULK_SET_BRIGHTNESS_LEVEL,
+    SERVICE_BULK_SET_CHILD_LOCK,
+]
+
+SERVICE_SNAPSHOT: Final = "snapshot"
+SERVICE_RESTORE: Final = "restore"
+SNAPSHOT_SERVICES: Final = [SERVICE_SNAPSHOT, SERVICE_RESTORE]
+DEFAULT_SNAPSHOT_NAME: Final = "default"
+
+SERVICE_START_TRACE: Final = "start_trace"
+SERVICE_STOP_TRACE: Final = "stop_trace"
+TRACE_SERVICES: Final = [SERVICE_START_TRACE, SERVICE_STOP_TRACE]
+
+# Maximum number of events kept by a device tracer
+TRACE_CAPACITY: Final = 200
+
+# Number of recent polls used for the latency and success rate of a device
+POLL_METRICS_WINDOW: Final = 100
+# Number of recent requests summarized in the diagnostics
+TRANSPORT_RECENT_REQUESTS: Final = 20
+
+SERVICE_PROFILE: Final = "profile"
+DEFAULT_PROFILE_DURATION: Final = 60  # seconds
+PROFILE_REPORT_FILE: Final = "winix_profile.txt"
+# Number of slowest measurements listed in the profile report
+PROFILE_TOP_OFFENDERS: Final = 10
+
+PHASE_HTTP: Final = "http"
+PHASE_DECODE: Final = "decode"
+PHASE_PARSE: Final = "parse"
+PHASE_FLAGS: Final = "flags"
+PHASE_HISTORY: Final = "history"
+PHASE_ENTITIES: Final = "entities"
+PHASE_COMMAND: Final = "command"
+
+# Profiled phases in the order of the refresh cycle
+PROFILE_PHASES: Final = (
+    PHASE_HTTP,
+    PHASE_DECODE,
+    PHASE_PARSE,
+    PHASE_FLAGS,
+    PHASE_HISTORY,
+    PHASE_ENTITIES,
+    PHASE_COMMAND,
+)
+
+# State attributes saved by the snapshot service, in the order they are restored
+RESTORABLE_ATTRIBUTES: Final = [
+    ATTR_POWER,
+    ATTR_MODE,
+    ATTR_AIRFLOW,
+    ATTR_PLASMA,
+    ATTR_BRIGHTNESS_LEVEL,
+    ATTR_TARGET_HUMIDITY,
+    ATTR_TIMER,
+]
+
+# Maximum number of devices commanded at the same time by a bulk service
+BULK_MAX_CONCURRENCY: Final = 4
+
+BULK_RESULT_UPDATED: Final = "updated"
+BULK_RESULT_SKIPPED: Final = "skipped"
+BULK_RESULT_UNSUPPORTED: Final = "unsupported"
+BULK_RESULT_OFF: Final = "off"
+BULK_RESULT_FAILED: Final = "failed"
+
 # airflow can contain the special preset values of manual and sleep
 # but we are not using those as fan speed.
 AIRFLOW_LOW: Final = "low"
@@ -98,8 +182,48 @@ DEHUMIDIFIER_HUMIDITY_STEP: Final = 5
 
 DEFAULT_FILTER_MAX_LIFE_HOURS: Final = 9 * 24 * 30  # 9 months
 
+# Air quality history, 24 hours at the default 30 seconds polling
+HISTORY_CAPACITY: Final = 2880
+# Rolling statistics windows in seconds (5 minutes and 1 hour), the samples are
+# kept in a window by their timestamp whatever the scan interval
+HISTORY_WINDOWS: Final = (5 * 60, 60 * 60)
+HISTORY_EMA_ALPHA: Final = 0.2
+
+# Filter usage is averaged over the last 30 days and only forecast after a day
+FORECAST_WINDOW_DAYS: Final = 30
+FORECAST_MIN_OBSERVATION_HOURS: Final = 24
+FORECAST_SAVE_DELAY: Final = 600  # seconds
+FEATURES_SAVE_DELAY: Final = 10  # seconds
+
 DEFAULT_POST_TIMEOUT: Final = 5
 
+DEFAULT_SCAN_INTERVAL: Final = 30
+DEVICE_DISCOVERY_INTERVAL: Final = timedelta(hours=1)
+MIN_SCAN_INTERVAL: Final = 10
+MAX_SCAN_INTERVAL: Final = 3600
+
+# Options, the intervals are in seconds and 0 falls back to the next level
+CONF_PURIFIER_SCAN_INTERVAL: Final = "purifier_scan_interval"
+CONF_DEHUMIDIFIER_SCAN_INTERVAL: Final = "dehumidifier_scan_interval"
+CONF_DEVICE_SCAN_INTERVALS: Final = "device_scan_intervals"
+# Set up the entities without waiting for the first poll of the devices
+CONF_FAST_STARTUP: Final = "fast_startup"
+# Rolling statistics windows of the air quality history, in minutes
+CONF_HISTORY_WINDOWS: Final = "history_windows"
+
+# Sent when the data of a single device has changed, formatted with the mac
+SIGNAL_DEVICE_UPDATED: Final = "winix_device_updated_{}"
+# Sent when a poll of a single device failed or returned unchanged data,
+# formatted with the mac
+SIGNAL_DEVICE_POLLED: Final = "winix_device_polled_{}"
+# Sent when entities may have to be added, formatted with the config entry id
+SIGNAL_ENTITIES_CHANGED: Final = "winix_entities_changed_{}"
+
+# Requests to the Winix cloud across all the config entries
+TRANSPORT_RATE_LIMIT: Final = 5  # requests per second
+TRANSPORT_BURST: Final = 10
+TRANSPORT_MAX_CONCURRENCY: Final = 4
+
 # mode can contain the special preset value of manual.
 MODE_AUTO: Final = "auto"
 MODE_MANUAL: Final = "manual"
@@ -154,6 +278,34 @@ class Features:
     supports_uv_sanitize = False
 
 
+@dataclass(frozen=True, kw_only=True)
+class ModelCapabilities:
+    """Capabilities declared for a model.
+
+    Features found in the polled state are added to the declared ones.
+    """
+
+    features: frozenset[str] = frozenset()
+    """Names of the supported Features attributes"""
+    fan_speeds: list[str] | None = None
+    """Fan speeds, None to use those of the product group"""
+
+
+_T800_CAPABILITIES = ModelCapabilities(features=frozenset({"supports_pm25"}))
+
+# Keyed by the casefolded modelId, like DEFAUT_MODEL_FILTER_MAX_LIFE
+MODEL_CAPABILITIES: Final[dict[str, ModelCapabilities]] = {
+    "c545": ModelCapabilities(),
+    "t800_au": _T800_CAPABILITIES,
+    "t800_eu": _T800_CAPABILITIES,
+    "t800_gb": _T800_CAPABILITIES,
+    "t800_id": _T800_CAPABILITIES,
+    "t800_jp": _T800_CAPABILITIES,
+    "t800_tw": _T800_CAPABILITIES,
+    "t800_us": _T800_CAPABILITIES,
+}
+
+
 DEFAUT_MODEL_FILTER_MAX_LIFE = {
     "t500_au": 6480,
     "c610_au": 6480,
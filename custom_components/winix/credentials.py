@@ -0,0 +1,114 @@
+"""Credentials shared by the Winix manager, drivers and helpers."""
+
+from winix import WinixAccount, auth
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import WINIX_DOMAIN
+from .helpers import Helpers
+
+CREDENTIALS_DATA: HassKey[dict[str, WinixCredentials]] = HassKey(
+    f"{WINIX_DOMAIN}.credentials"
+)
+
+
+class WinixCredentials:
+    """Swappable credentials of a Winix account.
+
+    The manager, the drivers and the helpers keep a reference to this object and
+    read the tokens and the identity id on each request, so new credentials take
+    effect on the next request without recreating them.
+
+    The uuid and the identity id derived from the tokens are memoized, they are
+    only derived again once the token they came from is replaced.
+    """
+
+    def __init__(
+        self, auth_response: auth.WinixAuthResponse, identity_id: str | None = None
+    ) -> None:
+        """Initialize the credentials."""
+        self._auth_response = auth_response
+        # Cognito identity id used by the control requests. The previous value is
+        # kept while the one of new tokens is looked up since it is stable for a user.
+        self.identity_id = identity_id
+        self._identity_id_token = auth_response.id_token if identity_id else None
+        self._uuid: str | None = None
+        self._uuid_token: str | None = None
+
+    @property
+    def auth_response(self) -> auth.WinixAuthResponse:
+        """Return the tokens of the account."""
+        return self._auth_response
+
+    @property
+    def access_token(self) -> str:
+        """Return the access token."""
+        return self._auth_response.access_token
+
+    @property
+    def id_token(self) -> str:
+        """Return the id token."""
+        return self._auth_response.id_token
+
+    @property
+    def refresh_token(self) -> str:
+        """Return the refresh token."""
+        return self._auth_response.refresh_token
+
+    @property
+    def uuid(self) -> str:
+        """Return the uuid derived from the access token."""
+        access_token = self.access_token
+        if self._uuid_token != access_token:
+            self._uuid = WinixAccount(access_token).get_uuid()
+            self._uuid_token = access_token
+        return self._uuid
+
+    async def async_get_identity_id(self, hass: HomeAssistant) -> str:
+        """Return the identity id, it is only looked up for a new id token.
+
+        Raises WinixException.
+        """
+        id_token = self.id_token
+        if self._identity_id_token != id_token:
+            self.identity_id = await Helpers.async_get_identity_id(hass, id_token)
+            self._identity_id_token = id_token
+        return self.identity_id
+
+    def update(
+        self,
+        auth_response: auth.WinixAuthResponse,
+        identity_id: str | None = None,
+        uuid: str | None = None,
+    ) -> None:
+        """Replace the tokens along with the ids already derived from them."""
+        self._auth_response = auth_response
+        if identity_id is not None:
+            self.identity_id = identity_id
+            self._identity_id_token = auth_response.id_token
+        if uuid is not None:
+            self._uuid = uuid
+            self._uuid_token = auth_response.access_token
+
+
+@callback
+def async_get_credentials(
+    hass: HomeAssistant, entry_id: str, auth_response: auth.WinixAuthResponse
+) -> WinixCredentials:
+    """Return the credentials of a config entry updated with the stored tokens.
+
+    They are kept across reloads so that the derived ids are not looked up again.
+    """
+    entries = hass.data.setdefault(CREDENTIALS_DATA, {})
+    if (credentials := entries.get(entry_id)) is None:
+        credentials = entries[entry_id] = WinixCredentials(auth_response)
+    else:
+        credentials.update(auth_response)
+    return credentials
+
+
+@callback
+def async_remove_credentials(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget the credentials of a removed config entry."""
+    hass.data.get(CREDENTIALS_DATA, {}).pop(entry_id, None)
@@ -1,5 +1,9 @@
 """Winix device wrapper."""
 
+import asyncio
+from collections.abc import Iterable
+import time
+
 import aiohttp
 
 from .const import (
@@ -8,6 +12,7 @@ from .const import (
     ATTR_AIRFLOW,
     ATTR_BRIGHTNESS_LEVEL,
     ATTR_CHILD_LOCK,
+    ATTR_FILTER_HOUR,
     ATTR_MODE,
     ATTR_PLASMA,
     ATTR_PM25,
@@ -22,39 +27,42 @@ from .const import (
     MODE_MANUAL,
     OFF_VALUE,
     ON_VALUE,
-    ORDERED_NAMED_FAN_SPEEDS,
-    ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS,
+    PHASE_FLAGS,
+    PHASE_HISTORY,
     PRESET_MODE_AUTO,
     PRESET_MODE_AUTO_PLASMA_OFF,
     PRESET_MODE_MANUAL,
     PRESET_MODE_MANUAL_PLASMA_OFF,
     PRESET_MODE_SLEEP,
     PRESET_MODES,
-    TOWER_PRIME_MODEL,
+    RESTORABLE_ATTRIBUTES,
     Features,
     NumericPresetModes,
 )
+from .credentials import WinixCredentials
 from .driver import AirPurifierDriver, DehumidifierDriver
+from .features import FEATURE_NAMES
+from .forecast import FilterUsage
+from .history import AirQualityHistory
+from .metrics import PollMetrics
+from .profile import DeviceProfile, build_profile
 from .stub import MyWinixDeviceStub
+from .trace import DeviceTracer
+from .transport import WinixTransport
 
 
 def _select_driver(
+    profile: DeviceProfile,
     device_stub: MyWinixDeviceStub,
-    client: aiohttp.ClientSession,
-    identity_id: str,
+    client: aiohttp.ClientSession | WinixTransport,
+    credentials: WinixCredentials,
+    tracer: DeviceTracer,
 ) -> AirPurifierDriver | DehumidifierDriver:
     """Return the driver that matches the device's product group."""
 
-    product_group = (device_stub.product_group or "").casefold()
-    if product_group.startswith("air"):
-        return AirPurifierDriver(device_stub.id, client, identity_id)
-
-    if product_group.startswith("deh"):
-        return DehumidifierDriver(device_stub.id, client, identity_id)
-
-    raise ValueError(
-        f"Unsupported product_group '{device_stub.product_group}' for device {device_stub.alias}"
-    )
+    if profile.is_air_purifier:
+        return AirPurifierDriver(device_stub.id, client, credentials, tracer)
+    return DehumidifierDriver(device_stub.id, client, credentials, tracer)
 
 
 class WinixDeviceWrapper:
@@ -64,18 +72,29 @@ class WinixDeviceWrapper:
 
     def __init__(
         self,
-        client: aiohttp.ClientSession,
+        client: aiohttp.ClientSession | WinixTransport,
         device_stub: MyWinixDeviceStub,
         logger,
-        identity_id: str,
+        credentials: WinixCredentials,
     ) -> None:
         """Initialize the wrapper."""
 
         self._client = client
-        self._driver = _select_driver(device_stub, client, identity_id)
+
+        # Raises ValueError for unsupported devices
+        self.profile = build_profile(device_stub)
+        # Disabled until tracing is started for the device
+        self.tracer = DeviceTracer(device_stub.alias)
+        self._driver = _select_driver(
+            self.profile, device_stub, client, credentials, self.tracer
+        )
 
         # Start as empty object in case fan was operated before it got updated
         self._state = {}
+        # Incremented whenever _state changes so entities can cache derived data
+        self._state_version = 0
+        # Set once the device has been polled successfully
+        self.polled = False
 
         self._on = False
         self._auto = False
@@ -96,6 +115,21 @@ class WinixDeviceWrapper:
         self.device_stub = device_stub
         self._alias = device_stub.alias
         self._features = Features()
+        self._add_features(self.profile.features)
+        # Set once the features have been derived from a polled state, in this run
+        # or a previous one whose features were stored
+        self.features_discovered = False
+
+        self.poll_metrics = PollMetrics()
+
+        # Only air purifiers report air quality
+        self.history: AirQualityHistory | None = (
+            AirQualityHistory() if self.profile.supports_air_quality else None
+        )
+        # Replaced by the persisted usage when the manager prepares the devices
+        self.filter_usage: FilterUsage | None = (
+            FilterUsage() if self.is_air_purifier else None
+        )
 
     async def async_initialize(
         self, token: str, uuid: str, models_max_filter_life: dict[str, int]
@@ -113,43 +147,107 @@ class WinixDeviceWrapper:
         else:
             self._logger.debug("%s: initialized device", self._alias)
 
-    def update_features(self) -> None:
-        """Update the supported features based on the current state."""
-        self._features.supports_brightness_level = self.brightness_level is not None
-        self._features.supports_child_lock = self.is_child_lock_on is not None
-        self._features.supports_pm25 = ATTR_PM25 in self._state
-        self._features.supports_uv_sanitize = self.is_uv_sanitize_on is not None
+    def update_device_stub(self, device_stub: MyWinixDeviceStub) -> None:
+        """Apply the changed metadata of the device, like its alias or firmware."""
+        self.device_stub = device_stub
+        self._alias = device_stub.alias
+        self.tracer.name = device_stub.alias
+        # The metadata is part of the entity attributes
+        self._state_version += 1
+
+    def update_features(self) -> bool:
+        """Add the features found in the current state.
+
+        Features are never removed so that a partial state does not drop entities.
+        Returns True if a feature was added.
+        """
+        discovered = {
+            "supports_brightness_level": self.brightness_level is not None,
+            "supports_child_lock": self.is_child_lock_on is not None,
+            "supports_pm25": ATTR_PM25 in self._state,
+            "supports_uv_sanitize": self.is_uv_sanitize_on is not None,
+        }
+        self.features_discovered = True
+        return self._add_features(
+            name for name, supported in discovered.items() if supported
+        )
+
+    def restore_features(self, features: Features) -> None:
+        """Add the features stored from a previous run."""
+        self._add_features(name for name in FEATURE_NAMES if getattr(features, name))
+        self.features_discovered = True
+
+    def _add_features(self, names: Iterable[str]) -> bool:
+        """Enable the named features, returns True if one was not enabled."""
+        added = False
+        for name in names:
+            if not getattr(self._features, name):
+                setattr(self._features, name, True)
+                added = True
+        return added
+
+    async def update(self) -> bool:
+        """Update the device data.
+
+        Returns False if the device has not reported new data since the last update.
+        """
+        start = time.monotonic()
+        try:
+            state = await self._driver.get_state()
+        except Exception as err:
+            self.poll_metrics.add_failure(err)
+            raise
+        self.poll_metrics.add_success(time.monotonic() - start)
+
+        if state is None:
+            return False
+
+        self._state = state
+        self._state_version += 1
+        self.polled = True
+        with self.tracer.measure(PHASE_FLAGS):
+            self._update_flags()
+
+        with self.tracer.measure(PHASE_HISTORY):
+            now = int(time.time())
+            if self.history is not None and self._state:
+                self.history.add(now, self._state)
+            if self.filter_usage is not None and ATTR_FILTER_HOUR in self._state:
+                self.filter_usage.add(now, self._state[ATTR_FILTER_HOUR])
+
+        if self.tracer.enabled and self.tracer.sample("update"):
+            self.tracer.record("update", self._get_flags())
+
+        return True
 
-    async def update(self) -> None:
-        """Update the device data."""
-        self._state = await self._driver.get_state()
+    def _get_flags(self) -> dict[str, bool | str | None]:
+        """Return the flags derived from the latest state."""
+        if self.is_air_purifier:
+            return {
+                "on": self._on,
+                "auto": self._auto,
+                "manual": self._manual,
+                "sleep": self._sleep,
+                "airflow": self._state.get(ATTR_AIRFLOW),
+                "plasma": self._plasma_on,
+            }
+
+        return {
+            "on": self._on,
+            "auto_dry": self._auto_dry,
+            "mode": self._state.get(ATTR_MODE),
+            "airflow": self._state.get(ATTR_AIRFLOW),
+            "uv_sanitize": self._uv_sanitize,
+            "water_tank": self._water_tank,
+        }
+
+    def _update_flags(self) -> None:
+        """Refresh all the flags from the latest state."""
         self._update_common_flags()
         if self.is_air_purifier:
             self._update_air_purifier_flags()
-            self._logger.debug(
-                "%s: updated on=%s, auto=%s, manual=%s, sleep=%s, "
-                "airflow=%s, plasma=%s",
-                self._alias,
-                self._on,
-                self._auto,
-                self._manual,
-                self._sleep,
-                self._state.get(ATTR_AIRFLOW),
-                self._plasma_on,
-            )
         elif self.is_dehumidifier:
             self._update_dehumidifier_flags()
-            self._logger.debug(
-                "%s: updated on=%s, auto_dry=%s, mode=%s, airflow=%s, "
-                "uv_sanitize=%s, water_tank=%s",
-                self._alias,
-                self._on,
-                self._auto_dry,
-                self._state.get(ATTR_MODE),
-                self._state.get(ATTR_AIRFLOW),
-                self._uv_sanitize,
-                self._water_tank,
-            )
 
     def _update_common_flags(self) -> None:
         """Refresh device-common flags from the latest state."""
@@ -188,27 +286,111 @@ class WinixDeviceWrapper:
         """Return the device data."""
         return self._state
 
+    @property
+    def state_version(self) -> int:
+        """Return a counter which changes whenever the device data changes."""
+        return self._state_version
+
+    def _set_state(self, key: str, value: str | int) -> None:
+        """Update one attribute of the device data."""
+        self._state[key] = value
+        self._state_version += 1
+
+    def snapshot(self) -> dict[str, str | int]:
+        """Return the restorable part of the current state."""
+        snapshot = {
+            key: self._state[key]
+            for key in RESTORABLE_ATTRIBUTES
+            if key in self._state and key in self._driver.category_keys
+        }
+
+        # Auto-dry is a power off state which cannot be requested
+        if snapshot.get(ATTR_POWER) == AUTO_DRY_VALUE:
+            snapshot[ATTR_POWER] = OFF_VALUE
+        return snapshot
+
+    async def async_restore(self, snapshot: dict[str, str | int]) -> tuple[int, int]:
+        """Restore a snapshot by only writing the attributes which differ.
+
+        Power is written first, then mode, then airflow and then the remaining
+        attributes concurrently. Nothing else is written if the snapshot was
+        powered off, and a purifier's airflow is not written in auto mode.
+
+        Returns the number of commands sent and skipped.
+        """
+        current = self.snapshot()
+        changes = {
+            key: value
+            for key, value in snapshot.items()
+            if key in self._driver.category_keys and current.get(key) != value
+        }
+
+        if snapshot.get(ATTR_POWER) == OFF_VALUE:
+            changes = {
+                key: value for key, value in changes.items() if key == ATTR_POWER
+            }
+
+        # A purifier picks the airflow in auto mode and writing one switches it
+        # to manual, sleep is the sleep airflow in manual mode. A dehumidifier
+        # keeps its fan speed in every mode.
+        if (
+            self.is_air_purifier
+            and snapshot.get(ATTR_MODE, current.get(ATTR_MODE)) == MODE_AUTO
+        ):
+            changes.pop(ATTR_AIRFLOW, None)
+
+        if not changes:
+            return 0, len(snapshot)
+
+        self._logger.debug("%s => restoring %s", self._alias, changes)
+
+        for key in (ATTR_POWER, ATTR_MODE, ATTR_AIRFLOW):
+            if key in changes:
+                await self._driver.set_attr(key, changes[key])
+
+        await asyncio.gather(
+            *(
+                self._driver.set_attr(key, value)
+                for key, value in changes.items()
+                if key not in (ATTR_POWER, ATTR_MODE, ATTR_AIRFLOW)
+            )
+        )
+
+        self._state.update(changes)
+        self._state_version += 1
+        self._update_flags()
+        return len(changes), len(snapshot) - len(changes)
+
     @property
     def features(self) -> Features:
         """Return device features."""
         return self._features
 
+    @property
+    def rssi(self) -> int | None:
+        """Return the Wi-Fi signal strength reported in the last poll."""
+        return self._driver.rssi
+
+    @property
+    def data_age(self) -> int | None:
+        """Return the number of seconds since the device reported the data."""
+        timestamp = self._driver.device_timestamp
+        return None if timestamp is None else max(0, int(time.time()) - timestamp)
+
     @property
     def fan_speeds(self) -> list[str]:
-        """Return fan speeds supported by this purifier model."""
-        if (self.device_stub.model or "").casefold() == TOWER_PRIME_MODEL.casefold():
-            return ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS
-        return ORDERED_NAMED_FAN_SPEEDS
+        """Return fan speeds supported by this device model."""
+        return self.profile.fan_speeds
 
     @property
     def is_air_purifier(self) -> bool:
         """Return True if this device is an air purifier."""
-        return isinstance(self._driver, AirPurifierDriver)
+        return self.profile.is_air_purifier
 
     @property
     def is_dehumidifier(self) -> bool:
         """Return True if this device is a dehumidifier."""
-        return isinstance(self._driver, DehumidifierDriver)
+        return self.profile.is_dehumidifier
 
     @property
     def is_on(self) -> bool:
@@ -244,7 +426,7 @@ class WinixDeviceWrapper:
         """Ensure the device is powered on."""
         if not self._on:
             self._on = True
-            self._state[ATTR_POWER] = ON_VALUE
+            self._set_state(ATTR_POWER, ON_VALUE)
 
             self._logger.debug("%s => turned on", self._alias)
             await self._driver.turn_on()
@@ -261,7 +443,7 @@ class WinixDeviceWrapper:
             self._on = False
             # Dehumidifiers may transition to AUTO_DRY_VALUE instead;
             # next refresh reconciles.
-            self._state[ATTR_POWER] = OFF_VALUE
+            self._set_state(ATTR_POWER, OFF_VALUE)
 
             self._logger.debug("%s => turned off", self._alias)
             await self._driver.turn_off()
@@ -273,7 +455,7 @@ class WinixDeviceWrapper:
         turns it on for Auto mode.
         """
 
-        if mode not in self._driver.state_keys[ATTR_MODE]:
+        if mode not in self.profile.modes:
             self._logger.error("%s => unsupported mode=%s", self._alias, mode)
             return
 
@@ -284,10 +466,9 @@ class WinixDeviceWrapper:
                 self._auto = True
                 self._manual = False
                 self._sleep = False
-                self._state[ATTR_MODE] = MODE_AUTO
-                self._state[ATTR_AIRFLOW] = (
-                    AIRFLOW_LOW  # Something other than AIRFLOW_SLEEP
-                )
+                self._set_state(ATTR_MODE, MODE_AUTO)
+                # Something other than AIRFLOW_SLEEP
+                self._set_state(ATTR_AIRFLOW, AIRFLOW_LOW)
 
                 self._logger.debug("%s => set mode=auto", self._alias)
                 await self._driver.auto()
@@ -297,10 +478,9 @@ class WinixDeviceWrapper:
                 self._manual = True
                 self._auto = False
                 self._sleep = False
-                self._state[ATTR_MODE] = MODE_MANUAL
-                self._state[ATTR_AIRFLOW] = (
-                    AIRFLOW_LOW  # Something other than AIRFLOW_SLEEP
-                )
+                self._set_state(ATTR_MODE, MODE_MANUAL)
+                # Something other than AIRFLOW_SLEEP
+                self._set_state(ATTR_AIRFLOW, AIRFLOW_LOW)
 
                 self._logger.debug("%s => set mode=manual", self._alias)
                 await self._driver.manual()
@@ -308,14 +488,14 @@ class WinixDeviceWrapper:
             if self._state.get(ATTR_MODE) == mode:
                 return
             await self._driver.set_mode(mode)
-            self._state[ATTR_MODE] = mode
+            self._set_state(ATTR_MODE, mode)
 
     async def async_plasmawave_on(self, force: bool = False) -> None:
         """Turn on plasma wave."""
 
         if force or not self._plasma_on:
             self._plasma_on = True
-            self._state[ATTR_PLASMA] = ON_VALUE
+            self._set_state(ATTR_PLASMA, ON_VALUE)
 
             self._logger.debug("%s => set plasmawave=on", self._alias)
             await self._driver.plasmawave_on()
@@ -325,7 +505,7 @@ class WinixDeviceWrapper:
 
         if force or self._plasma_on:
             self._plasma_on = False
-            self._state[ATTR_PLASMA] = OFF_VALUE
+            self._set_state(ATTR_PLASMA, OFF_VALUE)
 
             self._logger.debug("%s => set plasmawave=off", self._alias)
             await self._driver.plasmawave_off()
@@ -343,7 +523,7 @@ class WinixDeviceWrapper:
 
         await self._driver.child_lock_on()
         self._child_lock_on = True
-        self._state[ATTR_CHILD_LOCK] = ON_VALUE
+        self._set_state(ATTR_CHILD_LOCK, ON_VALUE)
         return True
 
     async def async_child_lock_off(self) -> bool:
@@ -354,7 +534,7 @@ class WinixDeviceWrapper:
 
         await self._driver.child_lock_off()
         self._child_lock_on = False
-        self._state[ATTR_CHILD_LOCK] = OFF_VALUE
+        self._set_state(ATTR_CHILD_LOCK, OFF_VALUE)
         return True
 
     @property
@@ -372,7 +552,7 @@ class WinixDeviceWrapper:
 
         await self._driver.set_brightness_level(value)
         self._brightness_level = value
-        self._state[ATTR_BRIGHTNESS_LEVEL] = value
+        self._set_state(ATTR_BRIGHTNESS_LEVEL, value)
         return True
 
     async def async_sleep(self) -> None:
@@ -382,8 +562,8 @@ class WinixDeviceWrapper:
             self._sleep = True
             self._auto = False
             self._manual = False
-            self._state[ATTR_AIRFLOW] = AIRFLOW_SLEEP
-            self._state[ATTR_MODE] = MODE_MANUAL
+            self._set_state(ATTR_AIRFLOW, AIRFLOW_SLEEP)
+            self._set_state(ATTR_MODE, MODE_MANUAL)
 
             self._logger.debug("%s => set mode=sleep", self._alias)
             await self._driver.sleep()
@@ -392,7 +572,7 @@ class WinixDeviceWrapper:
         """Set the device fan speed."""
 
         if self.is_air_purifier:
-            self._state[ATTR_AIRFLOW] = speed
+            self._set_state(ATTR_AIRFLOW, speed)
 
             # Setting speed requires the fan to be in manual mode
             await self.async_ensure_on()
@@ -404,7 +584,7 @@ class WinixDeviceWrapper:
             if self._state.get(ATTR_AIRFLOW) == speed:
                 return
             await self._driver.set_fan_speed(speed)
-            self._state[ATTR_AIRFLOW] = speed
+            self._set_state(ATTR_AIRFLOW, speed)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Turn the purifier on and put it in the new preset mode."""
@@ -450,7 +630,7 @@ class WinixDeviceWrapper:
             return False
         await self._driver.uv_sanitize_on()
         self._uv_sanitize = True
-        self._state[ATTR_UV_SANITIZE] = ON_VALUE
+        self._set_state(ATTR_UV_SANITIZE, ON_VALUE)
         return True
 
     async def async_uv_sanitize_off(self) -> bool:
@@ -459,7 +639,7 @@ class WinixDeviceWrapper:
             return False
         await self._driver.uv_sanitize_off()
         self._uv_sanitize = False
-        self._state[ATTR_UV_SANITIZE] = OFF_VALUE
+        self._set_state(ATTR_UV_SANITIZE, OFF_VALUE)
         return True
 
     @property
@@ -472,7 +652,7 @@ class WinixDeviceWrapper:
         if self._state.get(ATTR_TARGET_HUMIDITY) == humidity:
             return False
         await self._driver.set_humidity(humidity)
-        self._state[ATTR_TARGET_HUMIDITY] = humidity
+        self._set_state(ATTR_TARGET_HUMIDITY, humidity)
         return True
 
     async def async_set_timer(self, hours: int) -> bool:
@@ -480,5 +660,23 @@ class WinixDeviceWrapper:
         if self._state.get(ATTR_TIMER) == hours:
             return False
         await self._driver.set_timer(hours)
-        self._state[ATTR_TIMER] = hours
+        self._set_state(ATTR_TIMER, hours)
         return True
+
+
+def get_preset_mode(wrapper: WinixDeviceWrapper) -> str | None:
+    """Return the preset mode matching the purifier's current state."""
+    if wrapper.get_state() is None:
+        return None
+    if wrapper.is_sleep:
+        return PRESET_MODE_SLEEP
+    if wrapper.is_auto:
+        return PRESET_MODE_AUTO if wrapper.is_plasma_on else PRESET_MODE_AUTO_PLASMA_OFF
+    if wrapper.is_manual:
+        return (
+            PRESET_MODE_MANUAL
+            if wrapper.is_plasma_on
+            else PRESET_MODE_MANUAL_PLASMA_OFF
+        )
+
+    return None
@@ -0,0 +1,115 @@
+"""Diagnostics support for Winix."""
+
+import base64
+from dataclasses import asdict
+from datetime import datetime
+import json
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from . import WinixConfigEntry
+from .const import WINIX_AUTH_RESPONSE, WINIX_DOMAIN
+from .device_wrapper import WinixDeviceWrapper
+from .metrics import ATTRIBUTE_CACHE_METRICS
+from .profile import get_speed_tables_metrics
+from .transport import async_get_transport
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    WINIX_AUTH_RESPONSE,
+    "access_token",
+    "id_token",
+    "refresh_token",
+    "user_id",
+    "mac",
+    # Device ids embed the mac, the raw responses captured by a trace contain them
+    "deviceId",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: WinixConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    manager = entry.runtime_data
+    transport = async_get_transport(hass)
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "auth": {
+            **async_redact_data(asdict(manager.auth_response), TO_REDACT),
+            "access_token_expires": _get_token_expiry(
+                manager.auth_response.access_token
+            ),
+        },
+        "setup": manager.get_setup_timings(),
+        "scheduler": manager.get_scheduler_state(),
+        "caches": {
+            "attributes": ATTRIBUTE_CACHE_METRICS.as_dict(),
+            "speed_tables": get_speed_tables_metrics().as_dict(),
+        },
+        "recent_requests": list(transport.recent_requests),
+        "devices": [
+            _get_device_diagnostics(wrapper)
+            for wrapper in manager.get_device_wrappers()
+        ],
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: WinixConfigEntry, device: dr.DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a device."""
+    macs = {
+        identifier
+        for domain, identifier in device.identifiers
+        if domain == WINIX_DOMAIN
+    }
+
+    return next(
+        (
+            _get_device_diagnostics(wrapper)
+            for wrapper in entry.runtime_data.get_device_wrappers()
+            if wrapper.device_stub.mac.lower() in macs
+        ),
+        {},
+    )
+
+
+def _get_device_diagnostics(wrapper: WinixDeviceWrapper) -> dict[str, Any]:
+    """Return the diagnostics of a device."""
+    device_stub = wrapper.device_stub
+
+    return {
+        "alias": device_stub.alias,
+        "model": device_stub.model,
+        "model_id": device_stub.model_id,
+        "product_group": device_stub.product_group,
+        "sw_version": device_stub.sw_version,
+        "state": wrapper.get_state(),
+        "state_version": wrapper.state_version,
+        "poll": wrapper.poll_metrics.as_dict(),
+        "trace": async_redact_data(wrapper.tracer.events(), TO_REDACT),
+    }
+
+
+def _get_token_expiry(token: str | None) -> datetime | None:
+    """Return the expiry of a JWT, the signature is not verified."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return dt_util.utc_from_timestamp(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
@@ -7,6 +7,7 @@ import aiohttp
 
 from homeassistant.exceptions import HomeAssistantError
 
+from .codec import JSON_DECODE_ERRORS, json_loads
 from .const import (
     AIR_QUALITY_FAIR,
     AIR_QUALITY_GOOD,
@@ -45,7 +46,14 @@ from .const import (
     MODE_SHOES,
     OFF_VALUE,
     ON_VALUE,
+    PHASE_COMMAND,
+    PHASE_DECODE,
+    PHASE_HTTP,
+    PHASE_PARSE,
 )
+from .credentials import WinixCredentials
+from .trace import DeviceTracer
+from .transport import WinixTransport
 
 # Modified from https://github.com/hfern/winix to support async operations
 
@@ -77,12 +85,23 @@ class WinixDriver:
     state_keys: dict[str, dict[str, str]] | None = None
 
     def __init__(
-        self, device_id: str, client: aiohttp.ClientSession, identity_id: str
+        self,
+        device_id: str,
+        client: aiohttp.ClientSession | WinixTransport,
+        credentials: WinixCredentials,
+        tracer: DeviceTracer | None = None,
     ) -> None:
         """Create an instance of WinixDriver."""
         self.device_id = device_id
         self._client = client
-        self._identity_id = identity_id
+        # Read on each request so that rotated credentials are used right away
+        self._credentials = credentials
+        self.tracer = tracer if tracer is not None else DeviceTracer(device_id)
+
+        # Metadata of the last state response
+        self.rssi: int | None = None
+        self.device_timestamp: int | None = None  # Seconds since epoch
+        self._report_time: int | None = None  # creationTime in milliseconds
 
     async def _rpc_attr(self, attr: str, value: str) -> None:
         """Make a raw API call with the given attribute code and value.
@@ -94,16 +113,17 @@ class WinixDriver:
 
         for _ in range(2):
             try:
-                response = await self._client.get(
-                    self.CTRL_URL.format(
-                        deviceid=self.device_id,
-                        identityid=self._identity_id,
-                        attribute=attr,
-                        value=value,
+                with self.tracer.measure(PHASE_COMMAND):
+                    response = await self._client.get(
+                        self.CTRL_URL.format(
+                            deviceid=self.device_id,
+                            identityid=self._credentials.identity_id,
+                            attribute=attr,
+                            value=value,
+                        )
                     )
-                )
-                response.raise_for_status()
-                raw_resp = await response.text()
+                    response.raise_for_status()
+                    raw_resp = await response.text()
                 LOGGER.debug("_rpc_attr response=%s", raw_resp)
             except aiohttp.ClientResponseError as err:
                 # These responses are transient and may resolve on retry
@@ -131,19 +151,34 @@ class WinixDriver:
             self.state_keys[category][state_key],
         )
 
-    async def get_state(self) -> dict[str, str | int]:
+    async def set_attr(self, category: str, value: str | int) -> None:
+        """Set a state attribute using its semantic category name.
+
+        Enumerated attributes take the semantic value e.g. ON_VALUE, others are sent
+        as is.
+        """
+        if category in self.state_keys:
+            await self.control(category, value)
+        else:
+            await self._rpc_attr(self.category_keys[category], str(value))
+
+    async def get_state(self) -> dict[str, str | int] | None:
         """Get device state.
 
         This raises HomeAssistantError on communication errors, but returns an empty dict if the response is successfully received but doesn't contain expected data.
         This allows callers to handle missing data without crashing.
+
+        Returns None if the device has not reported since the previous call.
         """
 
         try:
-            response = await self._client.get(
-                self.STATE_URL.format(deviceid=self.device_id)
-            )
-            response.raise_for_status()
-            json = await response.json()
+            with self.tracer.measure(PHASE_HTTP):
+                response = await self._client.get(
+                    self.STATE_URL.format(deviceid=self.device_id)
+                )
+                response.raise_for_status()
+            with self.tracer.measure(PHASE_DECODE):
+                json = json_loads(await response.read())
         except aiohttp.ClientResponseError as err:
             raise WinixTransientError(
                 f"Failed to download data: HTTP {err.status}"
@@ -152,6 +187,8 @@ class WinixDriver:
             raise WinixTransientError(f"Error communicating with Winix: {err}") from err
         except TimeoutError as err:
             raise WinixTransientError("Timeout communicating with Winix") from err
+        except JSON_DECODE_ERRORS as err:
+            raise WinixTransientError(f"Invalid response from Winix: {err}") from err
 
         # pylint: disable=pointless-string-statement
         """
@@ -181,32 +218,53 @@ class WinixDriver:
 
         output = {}
 
+        if self.tracer.enabled and self.tracer.sample("response"):
+            self.tracer.record("response", json)
+
         try:
-            LOGGER.debug(json)
-            payload = json["body"]["data"][0]["attributes"]
+            data = json["body"]["data"][0]
+            payload = data["attributes"]
         except Exception as err:  # pylint: disable=broad-except # noqa: BLE001
             LOGGER.error("Error parsing response json, received %s", json, exc_info=err)
 
             # Return empty object so that callers don't crash (#37)
             return output
 
-        for payload_key, attribute in payload.items():
-            for category, local_key in self.category_keys.items():
-                if payload_key == local_key:
-                    # pylint: disable=consider-iterating-dictionary
-                    if category in self.state_keys:
-                        for value_key, value in self.state_keys[category].items():
-                            if attribute == value:
-                                output[category] = value_key
-                    elif attribute:
-                        try:
-                            output[category] = int(attribute)
-                        except ValueError:
-                            continue
+        self.rssi = _parse_int(data.get("rssi"))
+        self.device_timestamp = _parse_int(data.get("utcTimestamp"))
+
+        # The cloud returns the same snapshot until the device reports again
+        report_time = _parse_int(data.get("creationTime"))
+        if report_time is not None and report_time == self._report_time:
+            return None
+        self._report_time = report_time
+
+        with self.tracer.measure(PHASE_PARSE):
+            for payload_key, attribute in payload.items():
+                for category, local_key in self.category_keys.items():
+                    if payload_key == local_key:
+                        # pylint: disable=consider-iterating-dictionary
+                        if category in self.state_keys:
+                            for value_key, value in self.state_keys[category].items():
+                                if attribute == value:
+                                    output[category] = value_key
+                        elif attribute:
+                            try:
+                                output[category] = int(attribute)
+                            except ValueError:
+                                continue
 
         return output
 
 
+def _parse_int(value: str | int | None) -> int | None:
+    """Return the value as an integer, None if it is missing or invalid."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class AirPurifierDriver(WinixDriver):
     """Winix Air Purifier driver."""
 
@@ -326,7 +384,7 @@ class AirPurifierDriver(WinixDriver):
                 self.PARAM_URL.format(deviceid=self.device_id)
             )
             response.raise_for_status()
-            json = await response.json()
+            json = json_loads(await response.read())
         except aiohttp.ClientResponseError as err:
             raise HomeAssistantError(
                 f"Failed to download data: HTTP {err.status}"
@@ -335,6 +393,8 @@ class AirPurifierDriver(WinixDriver):
             raise HomeAssistantError(f"Error communicating with Winix: {err}") from err
         except TimeoutError as err:
             raise HomeAssistantError("Timeout communicating with Winix") from err
+        except JSON_DECODE_ERRORS as err:
+            raise HomeAssistantError(f"Invalid response from Winix: {err}") from err
 
         # pylint: disable=pointless-string-statement
         """
@@ -1,7 +1,8 @@
 """Winix Air Purifier fan entity."""
 
 import asyncio
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
@@ -11,12 +12,9 @@ from homeassistant.components.fan import ENTITY_ID_FORMAT, FanEntity, FanEntityF
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HassJob, HomeAssistant
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_call_later
-from homeassistant.util.percentage import (
-    ordered_list_item_to_percentage,
-    percentage_to_ordered_list_item,
-)
 
 from . import WinixConfigEntry
 from .const import (
@@ -27,20 +25,27 @@ from .const import (
     ATTR_POWER,
     FAN_SERVICES,
     LOGGER,
-    PRESET_MODE_AUTO,
-    PRESET_MODE_AUTO_PLASMA_OFF,
-    PRESET_MODE_MANUAL,
-    PRESET_MODE_MANUAL_PLASMA_OFF,
-    PRESET_MODE_SLEEP,
     PRESET_MODES,
     WINIX_DOMAIN,
 )
-from .device_wrapper import WinixDeviceWrapper
-from .manager import WinixEntity, WinixManager
+from .device_wrapper import WinixDeviceWrapper, get_preset_mode
+from .manager import WinixEntity, WinixManager, async_add_device_entities
 
 FAN_ON_OFF_REFRESH_DELAY = 4
 
 
+@dataclass(frozen=True, kw_only=True)
+class WinixFanEntityDescription(EntityDescription):
+    """Describes the Winix fan entity."""
+
+    exists_fn: Callable[[WinixDeviceWrapper], bool]
+
+
+PURIFIER_DESCRIPTION = WinixFanEntityDescription(
+    key="purifier", exists_fn=lambda device: device.is_air_purifier
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: WinixConfigEntry,
@@ -48,12 +53,20 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Winix air purifiers."""
     manager = entry.runtime_data
-    entities = [
-        WinixPurifier(wrapper, manager)
-        for wrapper in manager.get_device_wrappers()
-        if wrapper.is_air_purifier
-    ]
-    async_add_entities(entities)
+    # Keyed by unique id so that the entity of a device which returns replaces
+    # the one of its previous incarnation
+    entities: dict[str, WinixPurifier] = {}
+
+    def _create_entity(
+        wrapper: WinixDeviceWrapper, _: EntityDescription
+    ) -> WinixPurifier:
+        entity = WinixPurifier(wrapper, manager)
+        entities[entity.unique_id] = entity
+        return entity
+
+    count = async_add_device_entities(
+        manager, [PURIFIER_DESCRIPTION], _create_entity, async_add_entities
+    )
 
     async def async_service_handler(service_call):
         """Service handler."""
@@ -64,10 +77,13 @@ async def async_setup_entry(
         params = {}
 
         entity_ids = service_call.data.get(ATTR_ENTITY_ID)
-        if entity_ids:
-            devices = [entity for entity in entities if entity.entity_id in entity_ids]
-        else:
-            devices = entities
+        # Entities of removed devices are no longer attached to hass
+        devices = [
+            entity
+            for entity in entities.values()
+            if entity.hass is not None
+            and (not entity_ids or entity.entity_id in entity_ids)
+        ]
 
         state_update_tasks = []
         for device in devices:
@@ -91,7 +107,7 @@ async def async_setup_entry(
             schema=vol.Schema({ATTR_ENTITY_ID: cv.entity_ids}),
         )
 
-    LOGGER.info("Added %s Winix fans", len(entities))
+    LOGGER.info("Added %s Winix fans", count)
 
 
 class WinixPurifier(WinixEntity, FanEntity):
@@ -125,6 +141,10 @@ class WinixPurifier(WinixEntity, FanEntity):
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes."""
+        return self._get_cached_attributes(self._build_extra_state_attributes)
+
+    def _build_extra_state_attributes(self) -> dict[str, Any]:
+        """Build the state attributes from the device data."""
         attributes = {}
         state = self.device_wrapper.get_state()
 
@@ -149,11 +169,6 @@ class WinixPurifier(WinixEntity, FanEntity):
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        LOGGER.debug(
-            "Checking if device %s is on => %s",
-            self.device_wrapper.device_stub.alias,
-            self.device_wrapper.is_on,
-        )
         return self.device_wrapper.is_on
 
     @property
@@ -164,34 +179,12 @@ class WinixPurifier(WinixEntity, FanEntity):
             return None
         if self.device_wrapper.is_sleep or self.device_wrapper.is_auto:
             return None
-        if state.get(ATTR_AIRFLOW) is None:
-            return None
-
-        fan_speeds = self.device_wrapper.fan_speeds
-        return ordered_list_item_to_percentage(fan_speeds, state.get(ATTR_AIRFLOW))
+        return self.device_wrapper.profile.speed_to_percentage(state.get(ATTR_AIRFLOW))
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset mode, e.g., auto, smart, interval, favorite."""
-        state = self.device_wrapper.get_state()
-        if state is None:
-            return None
-        if self.device_wrapper.is_sleep:
-            return PRESET_MODE_SLEEP
-        if self.device_wrapper.is_auto:
-            return (
-                PRESET_MODE_AUTO
-                if self.device_wrapper.is_plasma_on
-                else PRESET_MODE_AUTO_PLASMA_OFF
-            )
-        if self.device_wrapper.is_manual:
-            return (
-                PRESET_MODE_MANUAL
-                if self.device_wrapper.is_plasma_on
-                else PRESET_MODE_MANUAL_PLASMA_OFF
-            )
-
-        return None
+        return get_preset_mode(self.device_wrapper)
 
     @property
     def preset_modes(self) -> list[str] | None:
@@ -201,12 +194,12 @@ class WinixPurifier(WinixEntity, FanEntity):
     @property
     def speed_list(self) -> list:
         """Get the list of available speeds."""
-        return self.device_wrapper.fan_speeds
+        return self.device_wrapper.profile.fan_speeds
 
     @property
     def speed_count(self) -> int:
         """Return the number of speeds the fan supports."""
-        return len(self.device_wrapper.fan_speeds)
+        return self.device_wrapper.profile.speed_count
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
@@ -214,9 +207,7 @@ class WinixPurifier(WinixEntity, FanEntity):
             await self.async_turn_off()
         else:
             await self.device_wrapper.async_set_speed(
-                percentage_to_ordered_list_item(
-                    self.device_wrapper.fan_speeds, percentage
-                )
+                self.device_wrapper.profile.percentage_to_speed(percentage)
             )
 
         self.async_write_ha_state()
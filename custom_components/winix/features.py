@@ -0,0 +1,71 @@
+"""Persisted features of the Winix devices."""
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import FEATURES_SAVE_DELAY, WINIX_DOMAIN, Features
+
+STORAGE_KEY = f"{WINIX_DOMAIN}.features"
+STORAGE_VERSION = 1
+
+FEATURES_DATA: HassKey[FeatureStore] = HassKey(STORAGE_KEY)
+
+FEATURE_NAMES = [name for name in vars(Features) if name.startswith("supports_")]
+
+
+def features_to_dict(features: Features) -> dict[str, bool]:
+    """Return the features by name."""
+    return {name: getattr(features, name) for name in FEATURE_NAMES}
+
+
+def features_from_dict(data: dict[str, Any]) -> Features:
+    """Return the features, unknown names are ignored."""
+    features = Features()
+    for name in FEATURE_NAMES:
+        if name in data:
+            setattr(features, name, bool(data[name]))
+    return features
+
+
+class FeatureStore:
+    """Persist the features discovered from the devices.
+
+    They are used to set up the entities before the devices have been polled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, bool]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._data: dict[str, dict[str, bool]] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored features."""
+        self._data = await self._store.async_load() or {}
+
+    def get_features(self, mac: str) -> Features | None:
+        """Return the stored features of the device, None if it was never polled."""
+        if (data := self._data.get(mac)) is None:
+            return None
+        return features_from_dict(data)
+
+    def async_set_features(self, mac: str, features: Features) -> None:
+        """Store the features of the device."""
+        data = features_to_dict(features)
+        if self._data.get(mac) != data:
+            self._data[mac] = data
+            self._store.async_delay_save(lambda: self._data, FEATURES_SAVE_DELAY)
+
+
+async def async_get_feature_store(hass: HomeAssistant) -> FeatureStore:
+    """Return the store shared by all the config entries."""
+    if FEATURES_DATA not in hass.data:
+        store = FeatureStore(hass)
+        await store.async_load()
+        hass.data[FEATURES_DATA] = store
+
+    return hass.data[FEATURES_DATA]
@@ -0,0 +1,162 @@
+"""Filter life forecasting for Winix air purifiers."""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    FORECAST_MIN_OBSERVATION_HOURS,
+    FORECAST_SAVE_DELAY,
+    FORECAST_WINDOW_DAYS,
+    WINIX_DOMAIN,
+)
+
+STORAGE_KEY = f"{WINIX_DOMAIN}.filter_usage"
+STORAGE_VERSION = 1
+
+SECONDS_PER_DAY = 24 * 3600
+
+FILTER_USAGE_DATA: HassKey[FilterUsageStore] = HassKey(STORAGE_KEY)
+
+
+class FilterUsage:
+    """Recent filter usage of an air purifier.
+
+    The filter_hour deltas are accumulated in daily buckets covering the last
+    window_days days, the buckets form a ring indexed by the day number.
+    """
+
+    def __init__(self, window_days: int = FORECAST_WINDOW_DAYS) -> None:
+        """Initialize the filter usage."""
+        self.window_days = window_days
+        self._hours: int | None = None  # Last filter_hour reading
+        self._start = 0  # Timestamp when the observation started
+        self._day = 0  # Day number of the last reading
+        self._buckets = [0] * window_days
+
+    @property
+    def hours(self) -> int | None:
+        """Return the last filter_hour reading."""
+        return self._hours
+
+    def add(self, timestamp: int, hours: int) -> None:
+        """Record a filter_hour reading."""
+        day = timestamp // SECONDS_PER_DAY
+
+        if self._hours is None or hours < self._hours:
+            # First reading or the filter was replaced
+            self._hours = hours
+            self._start = timestamp
+            self._day = day
+            self._buckets = [0] * self.window_days
+            return
+
+        if day > self._day:
+            # Clear the days without readings
+            for skipped in range(
+                self._day + 1, min(day, self._day + self.window_days) + 1
+            ):
+                self._buckets[skipped % self.window_days] = 0
+            self._day = day
+
+        self._buckets[self._day % self.window_days] += hours - self._hours
+        self._hours = hours
+
+    def daily_rate(self, now: int) -> float | None:
+        """Return the average filter hours used per day."""
+        if self._hours is None:
+            return None
+
+        # The window spans the full past days and the elapsed part of today
+        observed = min(
+            now - self._start,
+            (self.window_days - 1) * SECONDS_PER_DAY + now % SECONDS_PER_DAY,
+        )
+        if observed < FORECAST_MIN_OBSERVATION_HOURS * 3600:
+            return None
+
+        first_day = now // SECONDS_PER_DAY - self.window_days + 1
+        used = sum(
+            self._buckets[day % self.window_days]
+            for day in range(
+                max(first_day, self._day - self.window_days + 1), self._day + 1
+            )
+        )
+        return round(used * SECONDS_PER_DAY / observed, 2)
+
+    def projected_replacement(self, now: int, max_life_hours: int) -> datetime | None:
+        """Return when the filter is expected to reach its max life."""
+        rate = self.daily_rate(now)
+        if not rate:
+            return None
+
+        remaining_days = max(0, max_life_hours - self._hours) / rate
+        return dt_util.utc_from_timestamp(now) + timedelta(days=remaining_days)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the usage for storage."""
+        return {
+            "hours": self._hours,
+            "start": self._start,
+            "day": self._day,
+            "buckets": self._buckets,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], window_days: int = FORECAST_WINDOW_DAYS
+    ) -> FilterUsage:
+        """Restore the usage from storage, ignoring incompatible data."""
+        usage = cls(window_days)
+        buckets = data.get("buckets")
+        if isinstance(buckets, list) and len(buckets) == window_days:
+            usage._hours = data.get("hours")
+            usage._start = data.get("start", 0)
+            usage._day = data.get("day", 0)
+            usage._buckets = buckets
+        return usage
+
+
+class FilterUsageStore:
+    """Persist the filter usage of all the air purifiers."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._data: dict[str, dict[str, Any]] = {}
+        self._usages: dict[str, FilterUsage] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored usage."""
+        self._data = await self._store.async_load() or {}
+
+    def get_usage(self, mac: str) -> FilterUsage:
+        """Return the usage of the device, restoring it on first use."""
+        if mac not in self._usages:
+            self._usages[mac] = FilterUsage.from_dict(self._data.get(mac, {}))
+        return self._usages[mac]
+
+    def async_schedule_save(self) -> None:
+        """Save the usage after a delay, batching the updates from polls."""
+        self._store.async_delay_save(self._data_to_save, FORECAST_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to store."""
+        self._data.update({mac: usage.as_dict() for mac, usage in self._usages.items()})
+        return self._data
+
+
+async def async_get_filter_usage_store(hass: HomeAssistant) -> FilterUsageStore:
+    """Return the store shared by all the config entries."""
+    if FILTER_USAGE_DATA not in hass.data:
+        store = FilterUsageStore(hass)
+        await store.async_load()
+        hass.data[FILTER_USAGE_DATA] = store
+
+    return hass.data[FILTER_USAGE_DATA]
@@ -3,12 +3,9 @@
 from collections.abc import Mapping
 from http import HTTPStatus
 import json
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
-import boto3
-from botocore import UNSIGNED
-from botocore.client import Config
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
 import requests
@@ -16,7 +13,10 @@ from winix import WinixAccount, auth
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .codec import JSON_DECODE_ERRORS, json_loads
+from .cognito import COGNITO_REGION, CognitoClient, CognitoError
 from .const import (
     DEFAULT_FILTER_MAX_LIFE_HOURS,
     DEFAULT_POST_TIMEOUT,
@@ -25,6 +25,10 @@ from .const import (
     WINIX_DOMAIN,
 )
 from .stub import MyWinixDeviceStub
+from .transport import WinixTransport
+
+if TYPE_CHECKING:
+    from .credentials import WinixCredentials
 
 # Winix rotated their Cognito app client on 2026-04-16. The old client ID
 # (14og512b9u20b8vrdm55d8empi) is dead. Patch the pip package constants before
@@ -32,18 +36,10 @@ from .stub import MyWinixDeviceStub
 auth.COGNITO_APP_CLIENT_ID = "5rjk59c5tt7k9g8gpj0vd2qfg9"
 auth.COGNITO_CLIENT_SECRET_KEY = None
 
+# Both Cognito services are public endpoints — no AWS credentials required.
 _COGNITO_IDENTITY_POOL_ID = "us-east-1:84008e15-d6af-4698-8646-66d05c1abe8b"
 _COGNITO_USER_POOL_ID = "us-east-1_Ofd50EosD"
 
-# Both Cognito services are public endpoints — no AWS credentials required.
-_UNSIGNED_CONFIG = Config(signature_version=UNSIGNED)
-_COGNITO_IDP_CLIENT = boto3.client(
-    "cognito-idp", config=_UNSIGNED_CONFIG, region_name="us-east-1"
-)
-_COGNITO_IDENTITY_CLIENT = boto3.client(
-    "cognito-identity", config=_UNSIGNED_CONFIG, region_name="us-east-1"
-)
-
 HEADERS = {
     "Content-Type": "application/octet-stream",
     "Accept": "application/octet-stream",
@@ -69,11 +65,11 @@ class Helpers:
     }
 
     @staticmethod
-    def json_loads(text: str) -> dict[str, Any]:
-        """Safely load JSON from a string and return a dictionary."""
+    def json_loads(data: bytes | str) -> dict[str, Any]:
+        """Safely load JSON from bytes or a string and return a dictionary."""
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return json_loads(data)
+        except JSON_DECODE_ERRORS:
             return {}
 
     @staticmethod
@@ -88,8 +84,8 @@ class Helpers:
         return cipher.encrypt(padded_plaintext)
 
     @staticmethod
-    def decrypt(ciphertext: bytes) -> str:
-        """AES-256-CBC decrypt the ciphertext and return the plaintext as a string."""
+    def decrypt(ciphertext: bytes) -> bytes:
+        """AES-256-CBC decrypt the ciphertext and return the plaintext bytes."""
 
         cipher = AES.new(Helpers._AES_KEY, AES.MODE_CBC, Helpers._AES_IV)
         decrypted_padded_plaintext = cipher.decrypt(ciphertext)
@@ -118,85 +114,102 @@ class Helpers:
     async def async_login(
         hass: HomeAssistant, username: str, password: str
     ) -> auth.WinixAuthResponse:
-        """Log in asynchronously."""
+        """Log in asynchronously.
 
-        return await hass.async_add_executor_job(Helpers.login, username, password)
+        Raises WinixException.
+        """
+
+        # Avoid blocking the event loop (https://developers.home-assistant.io/docs/asyncio_blocking_operations)
+        response = await hass.async_add_executor_job(Helpers._login, username, password)
+
+        access_token = response.access_token
+        uuid = WinixAccount(access_token).get_uuid()
+        identity_id = await Helpers.async_get_identity_id(hass, response.id_token)
+
+        await hass.async_add_executor_job(
+            Helpers._establish_session, access_token, uuid, username, identity_id
+        )
+        return response
 
     @staticmethod
-    def login(username: str, password: str) -> auth.WinixAuthResponse:
-        """Log in synchronously."""
+    def _login(username: str, password: str) -> auth.WinixAuthResponse:
+        """Log in to Cognito synchronously.
+
+        Raises WinixException.
+        """
 
         try:
-            response = auth.login(username, password)
+            return auth.login(username, password)
         except Exception as err:  # pylint: disable=broad-except
             raise WinixException.from_aws_exception(err) from err
 
-        access_token = response.access_token
-        uuid = WinixAccount(access_token).get_uuid()
-        identity_id = Helpers.get_identity_id_sync(response.id_token)
+    @staticmethod
+    def _establish_session(
+        access_token: str, uuid: str, email: str, identity_id: str
+    ) -> None:
+        """Establish the Winix session of new tokens synchronously.
+
+        Raises WinixException.
+        """
 
         try:
             # v1.5.7 session establishment order:
             # registerUser (needs identityId) → init → checkAccessToken (needs identityId)
-            Helpers._register_user(access_token, uuid, username, identity_id)
+            Helpers._register_user(access_token, uuid, email, identity_id)
             Helpers._init(access_token, uuid)
             Helpers._check_access_token(access_token, uuid, identity_id)
         except Exception as err:  # pylint: disable=broad-except
             raise WinixException.from_winix_exception(err) from err
 
-        return response
-
     @staticmethod
     async def async_refresh_auth(
-        hass: HomeAssistant, response: auth.WinixAuthResponse
+        hass: HomeAssistant, credentials: "WinixCredentials"
     ) -> auth.WinixAuthResponse:
         """Refresh authentication.
 
-        Raises WinixException.
+        The credentials are updated in place so that the drivers use the new tokens
+        from their next request on. Raises WinixException.
         """
 
-        def _refresh(response: auth.WinixAuthResponse) -> auth.WinixAuthResponse:
-            LOGGER.debug("Attempting re-authentication")
+        LOGGER.debug("Attempting re-authentication")
+        response = credentials.auth_response
 
-            # Use boto3 directly — auth.refresh() calls WarrantLite.get_secret_hash()
-            # which breaks with client_secret=None (new public client has no secret).
-            # New public client has no secret — no SECRET_HASH in refresh params.
-            try:
-                resp = _COGNITO_IDP_CLIENT.initiate_auth(
-                    ClientId=auth.COGNITO_APP_CLIENT_ID,
-                    AuthFlow="REFRESH_TOKEN",
-                    AuthParameters={"REFRESH_TOKEN": response.refresh_token},
-                )
-            except Exception as err:  # pylint: disable=broad-except
-                raise WinixException.from_aws_exception(err) from err
-
-            result = resp["AuthenticationResult"]
-            new_response = auth.WinixAuthResponse(
-                user_id=response.user_id,
-                access_token=result["AccessToken"],
-                refresh_token=response.refresh_token,
-                id_token=result["IdToken"],
+        # Call InitiateAuth directly — auth.refresh() calls WarrantLite.get_secret_hash()
+        # which breaks with client_secret=None (new public client has no secret).
+        # New public client has no secret — no SECRET_HASH in refresh params.
+        try:
+            result = await Helpers._cognito_client(hass).async_refresh_tokens(
+                auth.COGNITO_APP_CLIENT_ID, response.refresh_token
             )
+        except CognitoError as err:
+            raise WinixException.from_cognito_error(err) from err
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise WinixException(
+                {"message": f"Failed to refresh the tokens: {err}"}
+            ) from err
 
-            uuid = WinixAccount(new_response.access_token).get_uuid()
-            identity_id = Helpers.get_identity_id_sync(new_response.id_token)
-            LOGGER.debug("Re-establishing session after token refresh")
+        new_response = auth.WinixAuthResponse(
+            user_id=response.user_id,
+            access_token=result["AccessToken"],
+            refresh_token=response.refresh_token,
+            id_token=result["IdToken"],
+        )
 
-            try:
-                Helpers._register_user(
-                    new_response.access_token, uuid, response.user_id, identity_id
-                )
-                Helpers._init(new_response.access_token, uuid)
-                Helpers._check_access_token(
-                    new_response.access_token, uuid, identity_id
-                )
-            except Exception as err:  # pylint: disable=broad-except
-                raise WinixException.from_winix_exception(err) from err
+        uuid = WinixAccount(new_response.access_token).get_uuid()
+        identity_id = await Helpers.async_get_identity_id(hass, new_response.id_token)
+        LOGGER.debug("Re-establishing session after token refresh")
 
-            LOGGER.debug("Re-authentication successful")
-            return new_response
+        await hass.async_add_executor_job(
+            Helpers._establish_session,
+            new_response.access_token,
+            uuid,
+            response.user_id,
+            identity_id,
+        )
 
-        return await hass.async_add_executor_job(_refresh, response)
+        LOGGER.debug("Re-authentication successful")
+        credentials.update(new_response, identity_id, uuid)
+        return new_response
 
     @staticmethod
     def _build_mobile_app_payload(
@@ -212,36 +225,37 @@ class Helpers:
         }
 
     @staticmethod
-    def get_identity_id_sync(id_token: str) -> str:
-        """Get the Cognito Identity ID synchronously (for use in executor threads).
+    def _cognito_client(hass: HomeAssistant) -> CognitoClient:
+        """Return a Cognito client on the shared session."""
+        return CognitoClient(async_get_clientsession(hass), COGNITO_REGION)
+
+    @staticmethod
+    async def async_get_identity_id(hass: HomeAssistant, id_token: str) -> str:
+        """Get the Cognito Identity ID.
 
         The CTRL_URL requires the user's identityId from the Cognito Identity Pool
-        instead of the old hardcoded 'A211' path segment. Uses boto3 so the AWS
-        JSON protocol headers are handled correctly.
+        instead of the old hardcoded 'A211' path segment.
 
         Raises WinixException.
         """
-        login_key = f"cognito-idp.us-east-1.amazonaws.com/{_COGNITO_USER_POOL_ID}"
+        login_key = (
+            f"cognito-idp.{COGNITO_REGION}.amazonaws.com/{_COGNITO_USER_POOL_ID}"
+        )
 
         try:
-            response = _COGNITO_IDENTITY_CLIENT.get_id(
-                IdentityPoolId=_COGNITO_IDENTITY_POOL_ID,
-                Logins={login_key: id_token},
+            identity_id = await Helpers._cognito_client(hass).async_get_id(
+                _COGNITO_IDENTITY_POOL_ID, {login_key: id_token}
             )
-        except Exception as err:  # pylint: disable=broad-except
-            # Map NotAuthorizedException (expired id_token) to result_code so
+        except (CognitoError, aiohttp.ClientError, TimeoutError) as err:
+            # NotAuthorizedException (expired id_token) is kept in result_code so
             # callers can trigger re-auth rather than failing permanently.
-            code = (
-                "NotAuthorizedException" if "NotAuthorizedException" in str(err) else ""
-            )
             raise WinixException(
                 {
                     "message": f"Failed to get Cognito Identity ID: {err}",
-                    "result_code": code,
+                    "result_code": getattr(err, "code", ""),
                 }
             ) from err
 
-        identity_id = response.get("IdentityId")
         if not identity_id:
             raise WinixException(
                 {"message": "Cognito Identity ID missing from response."}
@@ -340,7 +354,7 @@ class Helpers:
 
     @staticmethod
     async def get_device_stubs(
-        client: aiohttp.ClientSession, access_token: str, uuid: str
+        client: aiohttp.ClientSession | WinixTransport, access_token: str, uuid: str
     ) -> list[MyWinixDeviceStub]:
         """Get device list.
 
@@ -409,7 +423,7 @@ class Helpers:
 
     @staticmethod
     async def get_models_filter_max_life(
-        client: aiohttp.ClientSession, access_token: str, uuid: str
+        client: aiohttp.ClientSession | WinixTransport, access_token: str, uuid: str
     ) -> dict[str, int]:
         """Get filter max life for all the models."""
 
@@ -487,6 +501,11 @@ class WinixException(HomeAssistantError):
         """Build exception for Winix library operation."""
         return WinixException(WinixException.parse_winix_exception(err))
 
+    @staticmethod
+    def from_cognito_error(err: CognitoError) -> WinixException:
+        """Build exception for Cognito client operation."""
+        return WinixException({"message": str(err), "result_code": err.code})
+
     @staticmethod
     def from_aws_exception(err: Exception) -> WinixException:
         """Build exception for AWS operation."""
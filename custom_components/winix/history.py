@@ -0,0 +1,226 @@
+"""Air quality history for Winix air purifiers."""
+
+from array import array
+from collections import deque
+
+from .const import (
+    ATTR_AIR_AQI,
+    ATTR_AIR_QVALUE,
+    ATTR_PM25,
+    HISTORY_CAPACITY,
+    HISTORY_EMA_ALPHA,
+    HISTORY_WINDOWS,
+)
+
+# Values which don't fit the array item are recorded as missing
+_MISSING = {"B": 0xFF, "H": 0xFFFF}
+
+HISTORY_METRICS: dict[str, str] = {
+    ATTR_AIR_QVALUE: "H",
+    ATTR_AIR_AQI: "B",
+    ATTR_PM25: "H",
+}
+"""Metrics recorded in the history with their array typecode."""
+
+
+class RollingStatistics:
+    """Min/max/mean of the samples of a metric in the last window seconds.
+
+    The history evicts the samples in the order they were added once they are
+    older than the window, so the statistics are updated in amortized O(1) per
+    sample. The min/max use monotonic queues of (sample index, value).
+    """
+
+    def __init__(self, window: int) -> None:
+        """Initialize the statistics."""
+        self.window = window
+        self._sum = 0
+        self._count = 0
+        self._min: deque[tuple[int, int]] = deque()
+        self._max: deque[tuple[int, int]] = deque()
+
+    def add(self, index: int, value: int | None) -> None:
+        """Add the sample at index."""
+        if value is None:
+            return
+
+        self._sum += value
+        self._count += 1
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((index, value))
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((index, value))
+
+    def evict(self, index: int, value: int | None) -> None:
+        """Remove the sample at index, the oldest one in the window."""
+        if value is not None:
+            self._sum -= value
+            self._count -= 1
+
+        while self._min and self._min[0][0] <= index:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= index:
+            self._max.popleft()
+
+    @property
+    def min(self) -> int | None:
+        """Return the minimum value in the window."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> int | None:
+        """Return the maximum value in the window."""
+        return self._max[0][1] if self._max else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean value in the window."""
+        return round(self._sum / self._count, 2) if self._count else None
+
+
+class AirQualityHistory:
+    """Fixed size ring buffer of timestamped air quality readings.
+
+    Samples are kept in compact arrays, 4 bytes for the timestamp and 1-2 bytes
+    per metric. The statistics windows are in seconds, a window longer than the
+    time covered by the buffer is limited to the samples it holds.
+    """
+
+    def __init__(
+        self,
+        capacity: int = HISTORY_CAPACITY,
+        windows: tuple[int, ...] = HISTORY_WINDOWS,
+        ema_alpha: float = HISTORY_EMA_ALPHA,
+    ) -> None:
+        """Initialize the history."""
+        self.capacity = capacity
+        self._ema_alpha = ema_alpha
+        self._timestamps = array("I", [0]) * capacity
+        self._values = {
+            metric: array(typecode, [_MISSING[typecode]]) * capacity
+            for metric, typecode in HISTORY_METRICS.items()
+        }
+        self._ema: dict[str, float | None] = dict.fromkeys(HISTORY_METRICS)
+        self._next = 0  # Total number of samples added
+        self.set_windows(windows)
+
+    def __len__(self) -> int:
+        """Return the number of samples available."""
+        return min(self._next, self.capacity)
+
+    @property
+    def windows(self) -> tuple[int, ...]:
+        """Return the statistics windows in seconds."""
+        return self._windows
+
+    def set_windows(self, windows: tuple[int, ...]) -> None:
+        """Replace the statistics windows, the recorded samples are added to them."""
+        if any(window <= 0 for window in windows):
+            raise ValueError("Statistics windows must be positive")
+
+        self._windows = tuple(windows)
+        self._statistics = {
+            metric: [RollingStatistics(window) for window in self._windows]
+            for metric in HISTORY_METRICS
+        }
+        start = max(0, self._next - self.capacity)
+        # Index of the oldest sample in each window
+        self._tails = [start] * len(self._windows)
+
+        for index in range(start, self._next):
+            self._evict(index, self._timestamps[index % self.capacity])
+            self._add_statistics(index)
+
+    def add(self, timestamp: int, state: dict[str, int | str]) -> None:
+        """Record the metrics found in the device state."""
+        index = self._next
+        # The samples leaving the windows are read before their slot is overwritten
+        self._evict(index, timestamp)
+
+        position = index % self.capacity
+        self._timestamps[position] = timestamp
+
+        for metric, values in self._values.items():
+            missing = _MISSING[values.typecode]
+            value = state.get(metric)
+            if not isinstance(value, int) or not 0 <= value < missing:
+                value = None
+
+            values[position] = missing if value is None else value
+
+            if value is not None:
+                ema = self._ema[metric]
+                self._ema[metric] = (
+                    value if ema is None else ema + self._ema_alpha * (value - ema)
+                )
+
+        self._next += 1
+        self._add_statistics(index)
+
+    def _evict(self, index: int, timestamp: int) -> None:
+        """Evict the samples which are too old for the sample at index and timestamp.
+
+        Samples about to be overwritten by the sample at index are evicted as well.
+        """
+        for slot, window in enumerate(self._windows):
+            tail = self._tails[slot]
+            while tail < index and (
+                tail <= index - self.capacity
+                or self._timestamps[tail % self.capacity] <= timestamp - window
+            ):
+                for metric, values in self._values.items():
+                    self._statistics[metric][slot].evict(
+                        tail, self._get_value(values, tail)
+                    )
+                tail += 1
+            self._tails[slot] = tail
+
+    def _add_statistics(self, index: int) -> None:
+        """Add the recorded sample at index to the statistics."""
+        for metric, values in self._values.items():
+            value = self._get_value(values, index)
+            for statistics in self._statistics[metric]:
+                statistics.add(index, value)
+
+    def _get_value(self, values: array, index: int) -> int | None:
+        """Return the recorded value of the sample at index, None if missing."""
+        value = values[index % self.capacity]
+        return None if value == _MISSING[values.typecode] else value
+
+    def samples(self, metric: str) -> list[tuple[int, int]]:
+        """Return the recorded (timestamp, value) samples, oldest first."""
+        values = self._values[metric]
+        missing = _MISSING[values.typecode]
+        start = max(0, self._next - self.capacity)
+
+        return [
+            (self._timestamps[index % self.capacity], values[index % self.capacity])
+            for index in range(start, self._next)
+            if values[index % self.capacity] != missing
+        ]
+
+    def statistics(self, metric: str) -> dict[str, float | int | None]:
+        """Return the rolling statistics of a metric."""
+        result: dict[str, float | int | None] = {}
+        for statistics in self._statistics[metric]:
+            label = format_window(statistics.window)
+            result[f"min_last_{label}"] = statistics.min
+            result[f"max_last_{label}"] = statistics.max
+            result[f"mean_last_{label}"] = statistics.mean
+
+        ema = self._ema[metric]
+        result["ema"] = None if ema is None else round(ema, 2)
+        return result
+
+
+def format_window(seconds: int) -> str:
+    """Return the window in the largest whole unit, e.g. 5m or 1h."""
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600}h"
+    if seconds % 60 == 0:
+        return f"{seconds // 60}m"
+    return f"{seconds}s"
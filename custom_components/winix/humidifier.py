@@ -1,5 +1,7 @@
 """Winix Dehumidifier entity."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.humidifier import (
@@ -9,6 +11,7 @@ from homeassistant.components.humidifier import (
     HumidifierEntityFeature,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import WinixConfigEntry
@@ -19,11 +22,22 @@ from .const import (
     DEHUMIDIFIER_HUMIDITY_STEP,
     DEHUMIDIFIER_MAX_HUMIDITY,
     DEHUMIDIFIER_MIN_HUMIDITY,
-    DEHUMIDIFIER_MODES,
     LOGGER,
 )
 from .device_wrapper import WinixDeviceWrapper
-from .manager import WinixEntity, WinixManager
+from .manager import WinixEntity, WinixManager, async_add_device_entities
+
+
+@dataclass(frozen=True, kw_only=True)
+class WinixHumidifierEntityDescription(EntityDescription):
+    """Describes the Winix dehumidifier entity."""
+
+    exists_fn: Callable[[WinixDeviceWrapper], bool]
+
+
+DEHUMIDIFIER_DESCRIPTION = WinixHumidifierEntityDescription(
+    key="dehumidifier", exists_fn=lambda device: device.is_dehumidifier
+)
 
 
 async def async_setup_entry(
@@ -33,13 +47,13 @@ async def async_setup_entry(
 ) -> None:
     """Set up Winix dehumidifier entities."""
     manager = entry.runtime_data
-    entities = [
-        WinixDehumidifier(wrapper, manager)
-        for wrapper in manager.get_device_wrappers()
-        if wrapper.is_dehumidifier
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s dehumidifiers", len(entities))
+    count = async_add_device_entities(
+        manager,
+        [DEHUMIDIFIER_DESCRIPTION],
+        lambda wrapper, _: WinixDehumidifier(wrapper, manager),
+        async_add_entities,
+    )
+    LOGGER.info("Added %s dehumidifiers", count)
 
 
 class WinixDehumidifier(WinixEntity, HumidifierEntity):
@@ -68,7 +82,7 @@ class WinixDehumidifier(WinixEntity, HumidifierEntity):
     @property
     def available_modes(self) -> list[str]:
         """Return the list of available modes."""
-        return DEHUMIDIFIER_MODES
+        return self.device_wrapper.profile.modes
 
     @property
     def mode(self) -> str | None:
@@ -1,32 +1,106 @@
 """The Winix component."""
 
-from datetime import timedelta
-
-from winix import WinixAccount, auth
-
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime, timedelta
+from functools import partial
+import time
+from typing import Any
+import zlib
+
+import aiohttp
+from winix import auth
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import CONF_SCAN_INTERVAL, Platform
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
     UpdateFailed,
 )
-
-from .const import LOGGER, WINIX_DOMAIN
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_DEHUMIDIFIER_SCAN_INTERVAL,
+    CONF_DEVICE_SCAN_INTERVALS,
+    CONF_HISTORY_WINDOWS,
+    CONF_PURIFIER_SCAN_INTERVAL,
+    DEVICE_DISCOVERY_INTERVAL,
+    HISTORY_WINDOWS,
+    LOGGER,
+    PHASE_ENTITIES,
+    SIGNAL_DEVICE_POLLED,
+    SIGNAL_DEVICE_UPDATED,
+    SIGNAL_ENTITIES_CHANGED,
+    WINIX_DOMAIN,
+)
+from .credentials import WinixCredentials
 from .device_wrapper import WinixDeviceWrapper
 from .driver import WinixTransientError
-from .helpers import Helpers
+from .features import FeatureStore, async_get_feature_store
+from .forecast import FilterUsageStore, async_get_filter_usage_store
+from .helpers import Helpers, WinixException
+from .metrics import ATTRIBUTE_CACHE_METRICS
+from .pipeline import SetupPipeline
+from .stub import MyWinixDeviceStub
 
 RETRY_INTERVAL_SECONDS = 15
 
 
+def get_device_phase(device_id: str) -> float:
+    """Return the poll phase of a device as a fraction of the interval.
+
+    Derived from a checksum of the id so that it is stable across restarts.
+    """
+    return zlib.crc32(device_id.encode()) / 2**32
+
+
+def get_device_platforms(wrapper: WinixDeviceWrapper) -> set[Platform]:
+    """Return the platforms with entities for the device.
+
+    Matches the exists_fn of the entity descriptions without importing the platforms,
+    test_device_platforms checks that they agree.
+    """
+    features = wrapper.features
+    platforms = {Platform.SENSOR}
+
+    if wrapper.is_air_purifier:
+        platforms.add(Platform.FAN)
+    if wrapper.is_dehumidifier:
+        platforms.update(
+            (
+                Platform.BINARY_SENSOR,
+                Platform.HUMIDIFIER,
+                Platform.NUMBER,
+                Platform.SELECT,
+            )
+        )
+    if features.supports_brightness_level:
+        platforms.add(Platform.SELECT)
+    if features.supports_child_lock or features.supports_uv_sanitize:
+        platforms.add(Platform.SWITCH)
+    return platforms
+
+
 class WinixEntity(CoordinatorEntity):
     """Represents a Winix entity."""
 
     _attr_has_entity_name = True
     _attr_attribution = "Data provided by Winix"
 
+    _attributes: Mapping[str, Any] | None = None
+    _attributes_version: int | None = None
+
     def __init__(self, wrapper: WinixDeviceWrapper, coordinator: WinixManager) -> None:
         """Initialize the Winix entity."""
         super().__init__(coordinator)
@@ -45,11 +119,82 @@ class WinixEntity(CoordinatorEntity):
             sw_version=device_stub.sw_version,
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the updates of the device."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DEVICE_UPDATED.format(self._mac),
+                self._handle_coordinator_update,
+            )
+        )
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
         state = self.device_wrapper.get_state()
-        return state is not None
+        return self.device_wrapper.polled and state is not None
+
+    def _get_cached_attributes(
+        self, build_fn: Callable[[], Mapping[str, Any] | None]
+    ) -> Mapping[str, Any] | None:
+        """Return the state attributes, only rebuilding them when the device data changed."""
+        version = self.device_wrapper.state_version
+        if version != self._attributes_version:
+            ATTRIBUTE_CACHE_METRICS.misses += 1
+            self._attributes = build_fn()
+            self._attributes_version = version
+        else:
+            ATTRIBUTE_CACHE_METRICS.hits += 1
+        return self._attributes
+
+
+@callback
+def async_add_device_entities[DescriptionT: EntityDescription](
+    manager: WinixManager,
+    descriptions: Iterable[DescriptionT],
+    entity_fn: Callable[[WinixDeviceWrapper, DescriptionT], Entity],
+    async_add_entities: AddEntitiesCallback,
+) -> int:
+    """Add the entities of the devices and return their number.
+
+    The descriptions provide an exists_fn. Entities are added later when it becomes
+    true, as features or devices are discovered, without reloading the config entry.
+    """
+    descriptions = tuple(descriptions)
+    added: set[tuple[str, str]] = set()
+
+    @callback
+    def _async_add_entities() -> int:
+        wrappers = manager.get_device_wrappers()
+
+        # Forget the removed devices so that their entities are added if they return
+        macs = {wrapper.device_stub.mac.lower() for wrapper in wrappers}
+        added.difference_update({key for key in added if key[0] not in macs})
+
+        entities: list[Entity] = []
+        for wrapper in wrappers:
+            mac = wrapper.device_stub.mac.lower()
+            for description in descriptions:
+                if (mac, description.key) in added or not description.exists_fn(
+                    wrapper
+                ):
+                    continue
+                added.add((mac, description.key))
+                entities.append(entity_fn(wrapper, description))
+
+        async_add_entities(entities)
+        return len(entities)
+
+    manager.config_entry.async_on_unload(
+        async_dispatcher_connect(
+            manager.hass,
+            SIGNAL_ENTITIES_CHANGED.format(manager.config_entry.entry_id),
+            _async_add_entities,
+        )
+    )
+    return _async_add_entities()
 
 
 class WinixManager(DataUpdateCoordinator):
@@ -59,7 +204,7 @@ class WinixManager(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
-        auth_response: auth.WinixAuthResponse,
+        credentials: WinixCredentials,
         scan_interval: int,
         client,
     ) -> None:
@@ -68,98 +213,556 @@ class WinixManager(DataUpdateCoordinator):
         # Always initialize _device_wrappers in case async_prepare_devices_wrappers
         # was not invoked.
         self._device_wrappers: list[WinixDeviceWrapper] = []
-        self._auth_response = auth_response
+        self._credentials = credentials
         self._client = client
-        self._retry_on_error = False
         self._models_max_filter_life: dict[str, int] = None
-
+        self._filter_usage_store: FilterUsageStore | None = None
+        self._feature_store: FeatureStore | None = None
+        self._setup_pipeline: SetupPipeline | None = None
+        self._platforms: set[Platform] = set()  # Forwarded platforms
+        self._scan_interval = scan_interval  # Used when not configured in options
+        self._phase = 0.0
+        self._unsub_polling: list[CALLBACK_TYPE] = []
+        self._unsub_retry: dict[str, CALLBACK_TYPE] = {}
+
+        # Polling is scheduled by async_start_polling so that it follows the phase
+        # assigned to the entry.
         super().__init__(
             hass,
             LOGGER,
             name="WinixManager",
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=None,
             config_entry=entry,
         )
 
     async def _async_update_data(self) -> None:
-        """Fetch the latest data from the source. This overrides the method in DataUpdateCoordinator."""
+        """Fetch the latest data from the source. This overrides the method in DataUpdateCoordinator.
+
+        Only used for the first refresh and refresh requests, the devices are
+        otherwise polled individually.
+        """
 
         LOGGER.info("Updating devices")
         try:
             for device_wrapper in self._device_wrappers:
                 await device_wrapper.update()
-            self._retry_on_error = False
         except WinixTransientError as err:
-            if not self._retry_on_error:
-                self._retry_on_error = True
-                raise UpdateFailed(
-                    f"Transient error during update ({err}), will retry in {RETRY_INTERVAL_SECONDS} seconds",
-                    retry_after=RETRY_INTERVAL_SECONDS,
-                ) from err
+            raise UpdateFailed(f"Transient error during update ({err})") from err
 
-            self._retry_on_error = False
-            raise UpdateFailed(
-                f"Retry failed ({err}), resuming normal polling"
-            ) from err
+        self._async_save_filter_usage()
+
+    @callback
+    def async_start_polling(self, phase: float) -> None:
+        """Poll each device every scan interval at its own phase.
+
+        The phase of the entry is a fraction of the interval, the devices are spread
+        from it by a phase derived from their id. Polls are aligned to the wall clock
+        so that the phases are kept across entries and restarts.
+        """
+        self.async_stop_polling()
+        self._phase = phase
+        if self.config_entry.pref_disable_polling:
+            return
 
-    def update_features(self) -> None:
-        """Update the supported features based on the current state."""
         for wrapper in self._device_wrappers:
-            wrapper.update_features()
+            self._async_schedule_device(
+                wrapper, (phase + get_device_phase(wrapper.device_stub.id)) % 1
+            )
+
+    @callback
+    def _async_schedule_device(self, wrapper: WinixDeviceWrapper, phase: float) -> None:
+        """Schedule the polling of a device."""
+        scan_interval = self.get_scan_interval(wrapper)
+        interval = scan_interval.total_seconds()
+        delay = (phase * interval - time.time()) % interval
+        poll = partial(self._async_poll_device, wrapper)
+
+        @callback
+        def _start(now: datetime) -> None:
+            self._unsub_polling.append(
+                async_track_time_interval(
+                    self.hass,
+                    poll,
+                    scan_interval,
+                    name=f"Winix poll {wrapper.device_stub.alias}",
+                    cancel_on_shutdown=True,
+                )
+            )
+            self.config_entry.async_create_background_task(
+                self.hass, poll(now), name=f"Winix poll {wrapper.device_stub.alias}"
+            )
+
+        self._unsub_polling.append(
+            async_call_later(self.hass, delay, HassJob(_start, cancel_on_shutdown=True))
+        )
 
-    async def prepare_devices_wrappers(
-        self, access_token: str = "", id_token: str = ""
+    @callback
+    def async_apply_options(self) -> None:
+        """Reschedule the polling and apply the history windows from the options."""
+        windows = self.get_history_windows()
+        for wrapper in self._device_wrappers:
+            if wrapper.history is not None and wrapper.history.windows != windows:
+                wrapper.history.set_windows(windows)
+
+        self.async_start_polling(self._phase)
+
+    def get_history_windows(self) -> tuple[int, ...]:
+        """Return the statistics windows of the air quality history in seconds."""
+        minutes = self.config_entry.options.get(CONF_HISTORY_WINDOWS)
+        return tuple(value * 60 for value in minutes) if minutes else HISTORY_WINDOWS
+
+    def get_scan_interval(self, wrapper: WinixDeviceWrapper) -> timedelta:
+        """Return the scan interval of the device.
+
+        A device override takes precedence over the product group default, which
+        takes precedence over the global interval. Unset values are stored as 0.
+        """
+        options = self.config_entry.options
+        group_key = (
+            CONF_PURIFIER_SCAN_INTERVAL
+            if wrapper.is_air_purifier
+            else CONF_DEHUMIDIFIER_SCAN_INTERVAL
+        )
+
+        seconds = (
+            options.get(CONF_DEVICE_SCAN_INTERVALS, {}).get(
+                wrapper.device_stub.mac.lower()
+            )
+            or options.get(group_key)
+            or options.get(CONF_SCAN_INTERVAL)
+            or self._scan_interval
+        )
+        return timedelta(seconds=seconds)
+
+    @property
+    def auth_response(self) -> auth.WinixAuthResponse:
+        """Return the tokens of the account."""
+        return self._credentials.auth_response
+
+    @property
+    def credentials(self) -> WinixCredentials:
+        """Return the credentials shared with the drivers."""
+        return self._credentials
+
+    async def async_update_credentials(
+        self, auth_response: auth.WinixAuthResponse
     ) -> None:
-        """Prepare device wrappers.
+        """Use new tokens from the next request on, without reloading the entry.
 
         Raises WinixException.
         """
-        self._device_wrappers = []  # Reset device_stubs
+        self._credentials.update(auth_response)
+        await self._credentials.async_get_identity_id(self.hass)
+        LOGGER.debug("Credentials updated")
+
+    def get_scheduler_state(self) -> dict[str, Any]:
+        """Return the polling schedule of the devices."""
+        return {
+            "phase": self._phase,
+            "polling_disabled": self.config_entry.pref_disable_polling,
+            "scheduled_jobs": len(self._unsub_polling),
+            "devices": [
+                {
+                    "alias": wrapper.device_stub.alias,
+                    "scan_interval": self.get_scan_interval(wrapper).total_seconds(),
+                    "phase": (self._phase + get_device_phase(wrapper.device_stub.id))
+                    % 1,
+                    "retry_pending": wrapper.device_stub.mac.lower()
+                    in self._unsub_retry,
+                }
+                for wrapper in self._device_wrappers
+            ],
+        }
+
+    @callback
+    def async_stop_polling(self) -> None:
+        """Stop polling the devices."""
+        for unsub in (*self._unsub_polling, *self._unsub_retry.values()):
+            unsub()
+        self._unsub_polling.clear()
+        self._unsub_retry.clear()
+
+    async def _async_poll_device(
+        self, wrapper: WinixDeviceWrapper, _: datetime
+    ) -> None:
+        """Poll a device and update its entities."""
+        alias = wrapper.device_stub.alias
+        mac = wrapper.device_stub.mac.lower()
 
-        token = access_token or self._auth_response.access_token
-        id_tok = id_token or self._auth_response.id_token
-        uuid = WinixAccount(token).get_uuid()
+        # A regular poll replaces a pending retry
+        retrying = mac in self._unsub_retry
+        if retrying:
+            self._unsub_retry.pop(mac)()
 
-        # Don't log the failure exceptions here, they are logged in the caller. Just raise them up.
-        device_stubs = await Helpers.get_device_stubs(self._client, token, uuid)
+        try:
+            updated = await wrapper.update()
+        except WinixTransientError as err:
+            updated = False
+            if retrying:
+                LOGGER.warning(
+                    "Retry failed for %s (%s), resuming normal polling", alias, err
+                )
+            else:
+                LOGGER.warning(
+                    "Transient error updating %s (%s), will retry in %d seconds",
+                    alias,
+                    err,
+                    RETRY_INTERVAL_SECONDS,
+                )
+                self._unsub_retry[mac] = async_call_later(
+                    self.hass,
+                    RETRY_INTERVAL_SECONDS,
+                    HassJob(
+                        partial(self._async_poll_device, wrapper),
+                        cancel_on_shutdown=True,
+                    ),
+                )
+        except Exception as err:  # pylint: disable=broad-except # noqa: BLE001
+            LOGGER.error("Failed to update %s: %s", alias, err)
+            updated = False
+
+        if not updated:
+            # Nothing changed or the poll failed, only the diagnostics of the poll
+            # itself like the data age and the success rate have to be refreshed
+            async_dispatcher_send(self.hass, SIGNAL_DEVICE_POLLED.format(mac))
+            return
+
+        if self._update_device_features(wrapper):
+            # New attributes were reported, add the entities of the features
+            self._async_entities_changed()
+
+        with wrapper.tracer.measure(PHASE_ENTITIES):
+            async_dispatcher_send(self.hass, SIGNAL_DEVICE_UPDATED.format(mac))
+        self._async_save_filter_usage()
 
-        # boto3 call must run in an executor thread (synchronous I/O).
-        identity_id = await self.hass.async_add_executor_job(
-            Helpers.get_identity_id_sync, id_tok
+    @property
+    def platforms(self) -> set[Platform]:
+        """Return the platforms which were set up."""
+        return self._platforms
+
+    def get_platforms(self) -> set[Platform]:
+        """Return the platforms needed by the devices."""
+        return set().union(*map(get_device_platforms, self._device_wrappers))
+
+    async def async_setup_platforms(self) -> None:
+        """Set up the platforms needed by the devices which are not set up yet."""
+        while platforms := self.get_platforms() - self._platforms:
+            LOGGER.debug("Setting up platforms %s", sorted(platforms))
+            self._platforms.update(platforms)
+            await self.hass.config_entries.async_forward_entry_setups(
+                self.config_entry, platforms
+            )
+
+    @callback
+    def _async_entities_changed(self) -> None:
+        """Add the entities of the new devices and features.
+
+        The platforms which were not needed so far are set up first.
+        """
+        async_dispatcher_send(
+            self.hass, SIGNAL_ENTITIES_CHANGED.format(self.config_entry.entry_id)
         )
 
-        if device_stubs:
-            # Get model list once and cache it for all devices.
-            if not self._models_max_filter_life:
-                self._models_max_filter_life = await Helpers.get_models_filter_max_life(
-                    self._client, token, uuid
+        # The platforms needed while the entry is set up are set up by async_setup_entry
+        if self.config_entry.state is ConfigEntryState.LOADED and (
+            self.get_platforms() - self._platforms
+        ):
+            self.config_entry.async_create_background_task(
+                self.hass, self.async_setup_platforms(), name="Winix platform setup"
+            )
+
+    @callback
+    def _async_save_filter_usage(self) -> None:
+        """Schedule saving the filter usage."""
+        if self._filter_usage_store is not None:
+            self._filter_usage_store.async_schedule_save()
+
+    def update_features(self) -> None:
+        """Update the supported features based on the current state."""
+        for wrapper in self._device_wrappers:
+            self._update_device_features(wrapper)
+
+    def _update_device_features(self, wrapper: WinixDeviceWrapper) -> bool:
+        """Update the supported features of a device and store them.
+
+        Returns True if a feature was added.
+        """
+        added = wrapper.update_features()
+        if self._feature_store is not None:
+            self._feature_store.async_set_features(
+                wrapper.device_stub.mac.lower(), wrapper.features
+            )
+        return added
+
+    async def async_fast_first_refresh(self) -> None:
+        """Poll the devices in the background instead of waiting for them.
+
+        The entities are set up with the features of the model and those stored from
+        the previous run, each device becomes available when its first poll
+        completes. Devices of unknown models with no stored features are still
+        polled before the entities are set up.
+
+        Raises ConfigEntryNotReady if one of these devices cannot be polled.
+        """
+        unknown = [
+            wrapper
+            for wrapper in self._device_wrappers
+            if not wrapper.profile.known_model and not wrapper.features_discovered
+        ]
+        if unknown:
+            try:
+                await asyncio.gather(*(wrapper.update() for wrapper in unknown))
+            except WinixTransientError as err:
+                raise ConfigEntryNotReady(
+                    f"Transient error during update ({err})"
+                ) from err
+            for wrapper in unknown:
+                self._update_device_features(wrapper)
+
+        self.async_set_updated_data(None)
+
+        now = dt_util.utcnow()
+        for wrapper in self._device_wrappers:
+            if wrapper not in unknown:
+                self.config_entry.async_create_background_task(
+                    self.hass,
+                    self._async_poll_device(wrapper, now),
+                    name=f"Winix first poll {wrapper.device_stub.alias}",
                 )
 
-            for device_stub in device_stubs:
-                try:
-                    wrapper = WinixDeviceWrapper(
-                        self._client, device_stub, LOGGER, identity_id
-                    )
-                except ValueError as err:
-                    LOGGER.warning("Skipping device: %s", err)
-                    continue
+    async def prepare_devices_wrappers(self) -> None:
+        """Prepare device wrappers with the current credentials.
 
-                try:
-                    await wrapper.async_initialize(
-                        token, uuid, self._models_max_filter_life
-                    )
-                except Exception as err:
-                    LOGGER.warning(
-                        "Failed to initialize device %s: %s", device_stub.alias, err
-                    )
-                    raise
+        Raises WinixException.
+        """
+        self._device_wrappers = []  # Reset device_stubs
 
-                self._device_wrappers.append(wrapper)
+        token = self._credentials.access_token
+        uuid = self._credentials.uuid
 
+        # The device list, identity and model list only need the tokens so they are
+        # fetched concurrently.
+        pipeline = SetupPipeline(f"{WINIX_DOMAIN} setup")
+        self._setup_pipeline = pipeline
+
+        # Don't log the failure exceptions here, they are logged in the caller. Just raise them up.
+        pipeline.add(
+            "device_stubs", partial(Helpers.get_device_stubs, self._client, token, uuid)
+        )
+        # The drivers read the identity id when sending commands, so the devices
+        # do not wait for it.
+        pipeline.add(
+            "identity_id", partial(self._credentials.async_get_identity_id, self.hass)
+        )
+        pipeline.add(
+            "models", partial(self._async_get_models_filter_max_life, token, uuid)
+        )
+        pipeline.add("filter_usage_store", self._async_get_filter_usage_store)
+        pipeline.add("feature_store", self._async_get_feature_store)
+        pipeline.add(
+            "devices",
+            partial(self._async_create_device_wrappers, token, uuid),
+            requires=(
+                "device_stubs",
+                "models",
+                "filter_usage_store",
+                "feature_store",
+            ),
+        )
+
+        results = await pipeline.async_run()
+        self._device_wrappers = results["devices"]
+
+        if self._device_wrappers:
             LOGGER.info("%d devices found", len(self._device_wrappers))
         else:
             LOGGER.info("No devices found")
 
+    async def _async_get_models_filter_max_life(
+        self, token: str, uuid: str
+    ) -> dict[str, int]:
+        """Return the filter max life of the models, the list is fetched once."""
+        if not self._models_max_filter_life:
+            self._models_max_filter_life = await Helpers.get_models_filter_max_life(
+                self._client, token, uuid
+            )
+        return self._models_max_filter_life
+
+    async def _async_get_filter_usage_store(self) -> FilterUsageStore:
+        """Return the persisted filter usage."""
+        if self._filter_usage_store is None:
+            self._filter_usage_store = await async_get_filter_usage_store(self.hass)
+        return self._filter_usage_store
+
+    async def _async_get_feature_store(self) -> FeatureStore:
+        """Return the features stored from the previous runs."""
+        if self._feature_store is None:
+            self._feature_store = await async_get_feature_store(self.hass)
+        return self._feature_store
+
+    async def _async_create_device_wrappers(
+        self,
+        token: str,
+        uuid: str,
+        device_stubs: list[MyWinixDeviceStub],
+        models_max_filter_life: dict[str, int],
+        filter_usage_store: FilterUsageStore,
+        feature_store: FeatureStore,
+    ) -> list[WinixDeviceWrapper]:
+        """Create and initialize the wrappers of the supported devices."""
+        history_windows = self.get_history_windows()
+        wrappers: list[WinixDeviceWrapper] = []
+        for device_stub in device_stubs:
+            try:
+                wrappers.append(
+                    WinixDeviceWrapper(
+                        self._client, device_stub, LOGGER, self._credentials
+                    )
+                )
+            except ValueError as err:
+                LOGGER.warning("Skipping device: %s", err)
+
+        async def _async_initialize(wrapper: WinixDeviceWrapper) -> None:
+            try:
+                await wrapper.async_initialize(token, uuid, models_max_filter_life)
+            except Exception as err:
+                LOGGER.warning(
+                    "Failed to initialize device %s: %s", wrapper.device_stub.alias, err
+                )
+                raise
+
+            mac = wrapper.device_stub.mac.lower()
+            if wrapper.is_air_purifier:
+                wrapper.filter_usage = filter_usage_store.get_usage(mac)
+            if wrapper.history is not None:
+                wrapper.history.set_windows(history_windows)
+            if (features := feature_store.get_features(mac)) is not None:
+                wrapper.restore_features(features)
+
+        await asyncio.gather(*(_async_initialize(wrapper) for wrapper in wrappers))
+        return wrappers
+
+    @callback
+    def async_start_discovery(self) -> None:
+        """Refresh the device list periodically until the entry is unloaded."""
+        self.config_entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self.async_discover_devices,
+                DEVICE_DISCOVERY_INTERVAL,
+                name="Winix device discovery",
+                cancel_on_shutdown=True,
+            )
+        )
+
+    async def async_discover_devices(self, _: datetime | None = None) -> None:
+        """Add the new devices, retire the removed ones and update the changed ones.
+
+        The other devices and their entities are left untouched.
+        """
+        current = {
+            wrapper.device_stub.mac.lower(): wrapper
+            for wrapper in self._device_wrappers
+        }
+
+        # Nothing is changed unless the list and the new devices could be fetched
+        try:
+            token = self._credentials.access_token
+            uuid = self._credentials.uuid
+            device_stubs = await Helpers.get_device_stubs(self._client, token, uuid)
+            stubs = {
+                device_stub.mac.lower(): device_stub for device_stub in device_stubs
+            }
+            added = await self._async_create_device_wrappers(
+                token,
+                uuid,
+                [
+                    device_stub
+                    for mac, device_stub in stubs.items()
+                    if mac not in current
+                ],
+                await self._async_get_models_filter_max_life(token, uuid),
+                await self._async_get_filter_usage_store(),
+                await self._async_get_feature_store(),
+            )
+        except (WinixException, aiohttp.ClientError, TimeoutError) as err:
+            LOGGER.warning("Failed to refresh the device list: %s", err)
+            return
+
+        for mac, device_stub in stubs.items():
+            wrapper = current.get(mac)
+            if wrapper is not None and wrapper.device_stub != device_stub:
+                self._async_update_device(wrapper, device_stub)
+
+        removed = [wrapper for mac, wrapper in current.items() if mac not in stubs]
+        for wrapper in removed:
+            self._async_remove_device(wrapper)
+
+        self._device_wrappers.extend(added)
+
+        if not added and not removed:
+            return
+
+        LOGGER.info("%d devices added, %d devices removed", len(added), len(removed))
+        self._async_entities_changed()
+        self.async_start_polling(self._phase)
+
+        # The entities of the new devices are available after their first poll
+        now = dt_util.utcnow()
+        for wrapper in added:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_poll_device(wrapper, now),
+                name=f"Winix first poll {wrapper.device_stub.alias}",
+            )
+
+    @callback
+    def _async_update_device(
+        self, wrapper: WinixDeviceWrapper, device_stub: MyWinixDeviceStub
+    ) -> None:
+        """Apply the changed metadata of a device to its wrapper and registry entry."""
+        mac = device_stub.mac.lower()
+        LOGGER.info("Device %s changed", device_stub.alias)
+        wrapper.update_device_stub(device_stub)
+
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(
+            identifiers={(WINIX_DOMAIN, mac)}
+        ):
+            device_registry.async_update_device(
+                device.id,
+                name=f"Winix {device_stub.alias}",
+                model=device_stub.model,
+                sw_version=device_stub.sw_version,
+            )
+        async_dispatcher_send(self.hass, SIGNAL_DEVICE_UPDATED.format(mac))
+
+    @callback
+    def _async_remove_device(self, wrapper: WinixDeviceWrapper) -> None:
+        """Stop polling a device which was removed from the account.
+
+        Removing it from the device registry also removes its entities.
+        """
+        mac = wrapper.device_stub.mac.lower()
+        LOGGER.info("Device %s was removed", wrapper.device_stub.alias)
+        self._device_wrappers.remove(wrapper)
+        if (unsub := self._unsub_retry.pop(mac, None)) is not None:
+            unsub()
+
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(
+            identifiers={(WINIX_DOMAIN, mac)}
+        ):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=self.config_entry.entry_id
+            )
+
+    def get_setup_timings(self) -> dict[str, Any] | None:
+        """Return the step timings of the last device preparation."""
+        if self._setup_pipeline is None:
+            return None
+        return self._setup_pipeline.as_dict()
+
     def get_device_wrappers(self) -> list[WinixDeviceWrapper]:
         """Return the device wrapper objects."""
         return self._device_wrappers
@@ -0,0 +1,89 @@
+"""Runtime counters of the Winix integration."""
+
+from collections import Counter, deque
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from .const import POLL_METRICS_WINDOW
+
+
+class PollMetrics:
+    """Latency and outcome of the recent polls of a device."""
+
+    def __init__(self, window: int = POLL_METRICS_WINDOW) -> None:
+        """Initialize the metrics."""
+        self.polls = 0
+        self.failures = 0
+        self.errors: Counter[str] = Counter()  # Failures by exception type
+        self.last_latency: float | None = None
+        self.last_success: float | None = None  # Timestamp of the last success
+        self.last_error: str | None = None
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+
+    def add_success(self, latency: float) -> None:
+        """Record a successful poll which took latency seconds."""
+        self.polls += 1
+        self.last_latency = latency
+        self.last_success = time.time()
+        self._latencies.append(latency)
+        self._outcomes.append(True)
+
+    def add_failure(self, err: Exception) -> None:
+        """Record a failed poll."""
+        self.polls += 1
+        self.failures += 1
+        self.errors[type(err).__name__] += 1
+        self.last_error = str(err)
+        self._outcomes.append(False)
+
+    @property
+    def success_rate(self) -> float | None:
+        """Return the percentage of the recent polls which succeeded."""
+        if not self._outcomes:
+            return None
+        return round(100 * sum(self._outcomes) / len(self._outcomes), 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics, latencies are in milliseconds."""
+        latencies = self._latencies
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "errors": dict(self.errors),
+            "success_rate": self.success_rate,
+            "last_error": self.last_error,
+            "last_success": self.last_success,
+            "latency_last_ms": to_ms(self.last_latency),
+            "latency_mean_ms": to_ms(
+                sum(latencies) / len(latencies) if latencies else None
+            ),
+            "latency_max_ms": to_ms(max(latencies, default=None)),
+        }
+
+
+@dataclass
+class CacheMetrics:
+    """Hit and miss counters of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters with the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+ATTRIBUTE_CACHE_METRICS = CacheMetrics()
+"""Shared by the state attribute caches of all the entities."""
+
+
+def to_ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
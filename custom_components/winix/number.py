@@ -17,7 +17,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import WinixConfigEntry
 from .const import ATTR_TIMER, LOGGER
 from .device_wrapper import WinixDeviceWrapper
-from .manager import WinixEntity, WinixManager
+from .manager import WinixEntity, WinixManager, async_add_device_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -55,14 +55,13 @@ async def async_setup_entry(
     """Set up Winix number entities."""
     manager = entry.runtime_data
 
-    entities = [
-        WinixNumberEntity(wrapper, manager, description)
-        for description in NUMBER_DESCRIPTIONS
-        for wrapper in manager.get_device_wrappers()
-        if description.exists_fn(wrapper)
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s number entities", len(entities))
+    count = async_add_device_entities(
+        manager,
+        NUMBER_DESCRIPTIONS,
+        lambda wrapper, description: WinixNumberEntity(wrapper, manager, description),
+        async_add_entities,
+    )
+    LOGGER.info("Added %s number entities", count)
 
 
 class WinixNumberEntity(WinixEntity, NumberEntity):
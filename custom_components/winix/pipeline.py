@@ -0,0 +1,118 @@
+"""Dependency ordered setup steps of the Winix integration."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from .const import LOGGER
+from .metrics import to_ms
+
+
+@dataclass(frozen=True, kw_only=True)
+class StepTiming:
+    """Timing of a setup step, in seconds from the start of the pipeline."""
+
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        """Return the time spent in the step."""
+        return self.end - self.start
+
+
+class SetupPipeline:
+    """Run setup steps concurrently as soon as the steps they require complete.
+
+    Each step is called with the results of its required steps, in the order they
+    were listed. The elapsed time is that of the critical path rather than the sum
+    of the steps.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the pipeline."""
+        self.name = name
+        self.timings: dict[str, StepTiming] = {}
+        self.elapsed: float | None = None
+        self._steps: dict[
+            str, tuple[Callable[..., Awaitable[Any]], tuple[str, ...]]
+        ] = {}
+
+    def add(
+        self,
+        name: str,
+        step: Callable[..., Awaitable[Any]],
+        requires: Iterable[str] = (),
+    ) -> None:
+        """Add a step, the required steps must have been added before.
+
+        Raises ValueError for duplicate or unknown steps.
+        """
+        requires = tuple(requires)
+        if name in self._steps:
+            raise ValueError(f"Duplicate step {name}")
+        if unknown := [
+            required for required in requires if required not in self._steps
+        ]:
+            raise ValueError(f"Step {name} requires unknown steps {unknown}")
+        self._steps[name] = (step, requires)
+
+    async def async_run(self) -> dict[str, Any]:
+        """Run the steps and return their results by name.
+
+        The first failure cancels the pending steps and is raised.
+        """
+        self.timings.clear()
+        origin = time.monotonic()
+        tasks: dict[str, asyncio.Task[Any]] = {}
+
+        async def _run_step(
+            name: str, step: Callable[..., Awaitable[Any]], requires: tuple[str, ...]
+        ) -> Any:
+            args = [await tasks[required] for required in requires]
+            start = time.monotonic() - origin
+            try:
+                return await step(*args)
+            finally:
+                self.timings[name] = StepTiming(
+                    start=start, end=time.monotonic() - origin
+                )
+
+        for name, (step, requires) in self._steps.items():
+            tasks[name] = asyncio.create_task(
+                _run_step(name, step, requires), name=f"{self.name} {name}"
+            )
+
+        try:
+            return {name: await task for name, task in tasks.items()}
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            # Let the cancelled steps finish before returning
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+            self.elapsed = time.monotonic() - origin
+            LOGGER.debug(
+                "%s: completed in %.3fs, %s",
+                self.name,
+                self.elapsed,
+                ", ".join(
+                    f"{name}={timing.duration:.3f}s"
+                    for name, timing in self.timings.items()
+                ),
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timings in milliseconds."""
+        return {
+            "elapsed_ms": to_ms(self.elapsed),
+            "steps": {
+                name: {
+                    "start_ms": to_ms(timing.start),
+                    "duration_ms": to_ms(timing.duration),
+                }
+                for name, timing in self.timings.items()
+            },
+        }
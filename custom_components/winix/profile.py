@@ -0,0 +1,149 @@
+"""Capability profiles of Winix devices."""
+
+from dataclasses import dataclass
+from functools import cache
+
+from homeassistant.util.percentage import (
+    ordered_list_item_to_percentage,
+    percentage_to_ordered_list_item,
+)
+
+from .const import (
+    DEHUMIDIFIER_FAN_SPEEDS,
+    DEHUMIDIFIER_MODES,
+    MODEL_CAPABILITIES,
+    MODE_AUTO,
+    MODE_MANUAL,
+    ORDERED_NAMED_FAN_SPEEDS,
+    ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS,
+    TOWER_PRIME_MODEL,
+    ModelCapabilities,
+)
+from .metrics import CacheMetrics
+from .stub import MyWinixDeviceStub
+
+PRODUCT_GROUP_AIR_PURIFIER = "air"
+PRODUCT_GROUP_DEHUMIDIFIER = "deh"
+
+
+@dataclass(frozen=True, kw_only=True)
+class DeviceProfile:
+    """Capabilities of a device, computed once from its metadata."""
+
+    product_group: str
+    """Product group prefix, PRODUCT_GROUP_AIR_PURIFIER or PRODUCT_GROUP_DEHUMIDIFIER"""
+    is_air_purifier: bool
+    is_dehumidifier: bool
+    fan_speeds: list[str]
+    """Ordered fan speeds, slowest first"""
+    speed_percentages: dict[str, int]
+    """Percentage of each speed in fan_speeds"""
+    percentage_speeds: tuple[str, ...]
+    """Speed for each percentage from 0 to 100"""
+    modes: list[str]
+    """Operating modes accepted by the device"""
+    supports_air_quality: bool
+    known_model: bool
+    """True if the model is declared in MODEL_CAPABILITIES"""
+    features: frozenset[str]
+    """Names of the Features attributes declared for the model"""
+
+    @property
+    def speed_count(self) -> int:
+        """Return the number of fan speeds."""
+        return len(self.fan_speeds)
+
+    def speed_to_percentage(self, speed: str | None) -> int | None:
+        """Return the percentage of the speed, None if it is not a fan speed."""
+        return self.speed_percentages.get(speed)
+
+    def percentage_to_speed(self, percentage: int) -> str:
+        """Return the speed for the percentage."""
+        return self.percentage_speeds[min(max(percentage, 0), 100)]
+
+
+def build_profile(device_stub: MyWinixDeviceStub) -> DeviceProfile:
+    """Return the capability profile of the device.
+
+    Raises ValueError for unsupported product groups.
+    """
+
+    product_group = (device_stub.product_group or "").casefold()
+    capabilities = MODEL_CAPABILITIES.get((device_stub.model_id or "").casefold())
+
+    if product_group.startswith(PRODUCT_GROUP_AIR_PURIFIER):
+        fan_speeds = (
+            ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS
+            if (device_stub.model or "").casefold() == TOWER_PRIME_MODEL.casefold()
+            else ORDERED_NAMED_FAN_SPEEDS
+        )
+        return _build_profile(
+            PRODUCT_GROUP_AIR_PURIFIER,
+            fan_speeds,
+            [MODE_AUTO, MODE_MANUAL],
+            capabilities,
+        )
+
+    if product_group.startswith(PRODUCT_GROUP_DEHUMIDIFIER):
+        return _build_profile(
+            PRODUCT_GROUP_DEHUMIDIFIER,
+            DEHUMIDIFIER_FAN_SPEEDS,
+            DEHUMIDIFIER_MODES,
+            capabilities,
+        )
+
+    raise ValueError(
+        f"Unsupported product_group '{device_stub.product_group}' for device {device_stub.alias}"
+    )
+
+
+def _build_profile(
+    product_group: str,
+    fan_speeds: list[str],
+    modes: list[str],
+    capabilities: ModelCapabilities | None,
+) -> DeviceProfile:
+    """Build a profile for the product group, overridden by the model capabilities."""
+    is_air_purifier = product_group == PRODUCT_GROUP_AIR_PURIFIER
+    if capabilities is not None and capabilities.fan_speeds is not None:
+        fan_speeds = capabilities.fan_speeds
+    speed_percentages, percentage_speeds = _speed_tables(tuple(fan_speeds))
+
+    return DeviceProfile(
+        product_group=product_group,
+        is_air_purifier=is_air_purifier,
+        is_dehumidifier=not is_air_purifier,
+        fan_speeds=fan_speeds,
+        speed_percentages=speed_percentages,
+        percentage_speeds=percentage_speeds,
+        modes=modes,
+        supports_air_quality=is_air_purifier,
+        known_model=capabilities is not None,
+        features=capabilities.features if capabilities is not None else frozenset(),
+    )
+
+
+@cache
+def _speed_tables(
+    fan_speeds: tuple[str, ...],
+) -> tuple[dict[str, int], tuple[str, ...]]:
+    """Return the speed to percentage and percentage to speed lookup tables.
+
+    The tables are computed once per list of speeds using Home Assistant's mapping
+    so the results match ordered_list_item_to_percentage and
+    percentage_to_ordered_list_item.
+    """
+    speeds = list(fan_speeds)
+    return (
+        {speed: ordered_list_item_to_percentage(speeds, speed) for speed in speeds},
+        tuple(
+            percentage_to_ordered_list_item(speeds, percentage)
+            for percentage in range(101)
+        ),
+    )
+
+
+def get_speed_tables_metrics() -> CacheMetrics:
+    """Return the hit and miss counters of the speed lookup tables."""
+    info = _speed_tables.cache_info()
+    return CacheMetrics(info.hits, info.misses)
@@ -0,0 +1,193 @@
+"""Time-boxed profiling of the Winix refresh cycle and command paths."""
+
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import heapq
+import time
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    LOGGER,
+    PROFILE_PHASES,
+    PROFILE_REPORT_FILE,
+    PROFILE_TOP_OFFENDERS,
+    WINIX_DOMAIN,
+)
+from .device_wrapper import WinixDeviceWrapper
+
+PROFILER_DATA: HassKey[Callable[[], Awaitable[None]]] = HassKey(
+    f"{WINIX_DOMAIN}.profiler"
+)
+"""Finishes the running profile."""
+
+
+@dataclass
+class PhaseStatistics:
+    """Timings of one phase."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add a measured duration."""
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean duration."""
+        return self.total / self.count if self.count else 0.0
+
+
+class Profiler:
+    """Collect the time spent in each phase per device."""
+
+    def __init__(self, top_count: int = PROFILE_TOP_OFFENDERS) -> None:
+        """Initialize the profiler."""
+        self.started = dt_util.utcnow()
+        self._top_count = top_count
+        self._statistics: defaultdict[tuple[str, str], PhaseStatistics] = defaultdict(
+            PhaseStatistics
+        )
+        # Min heap of the slowest (duration, device, phase) measurements
+        self._slowest: list[tuple[float, str, str]] = []
+
+    @contextmanager
+    def measure(self, device: str, phase: str) -> Iterator[None]:
+        """Measure the time spent in the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(device, phase, time.perf_counter() - start)
+
+    def add(self, device: str, phase: str, duration: float) -> None:
+        """Record a measured duration in seconds."""
+        self._statistics[device, phase].add(duration)
+
+        item = (duration, device, phase)
+        if len(self._slowest) < self._top_count:
+            heapq.heappush(self._slowest, item)
+        elif item > self._slowest[0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def phase_totals(self) -> dict[str, PhaseStatistics]:
+        """Return the timings of each phase across all the devices."""
+        totals: dict[str, PhaseStatistics] = {}
+        for (_, phase), statistics in self._statistics.items():
+            total = totals.setdefault(phase, PhaseStatistics())
+            total.count += statistics.count
+            total.total += statistics.total
+            total.max = max(total.max, statistics.max)
+        return totals
+
+    def report(self) -> str:
+        """Return the summary report."""
+        ended = dt_util.utcnow()
+        lines = [
+            f"Winix profile from {self.started.isoformat()} to {ended.isoformat()}",
+            "",
+            "Phases (all devices)",
+            *_format_table(self.phase_totals()),
+        ]
+
+        for device in sorted({device for device, _ in self._statistics}):
+            lines.extend(
+                [
+                    "",
+                    f"Device {device}",
+                    *_format_table(
+                        {
+                            phase: statistics
+                            for (name, phase), statistics in self._statistics.items()
+                            if name == device
+                        }
+                    ),
+                ]
+            )
+
+        lines.extend(["", "Top offenders"])
+        lines.extend(
+            f"  {duration * 1000:10.1f} ms  {device}  {phase}"
+            for duration, device, phase in sorted(self._slowest, reverse=True)
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _format_table(statistics: dict[str, PhaseStatistics]) -> list[str]:
+    """Format the timings of the phases."""
+    lines = [
+        f"  {'phase':<10}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"
+    ]
+    lines.extend(
+        f"  {phase:<10}{statistics[phase].count:>8}"
+        f"{statistics[phase].total * 1000:>12.1f}"
+        f"{statistics[phase].mean * 1000:>10.1f}"
+        f"{statistics[phase].max * 1000:>10.1f}"
+        for phase in PROFILE_PHASES
+        if phase in statistics
+    )
+    return lines
+
+
+async def async_start_profile(
+    hass: HomeAssistant, wrappers: list[WinixDeviceWrapper], duration: int
+) -> dict[str, Any]:
+    """Profile the devices for duration seconds and then write the report.
+
+    The profile is finished early when Home Assistant stops or an entry is
+    unloaded, see async_stop_profile. Raises ServiceValidationError if a profile
+    is already running.
+    """
+    if PROFILER_DATA in hass.data:
+        raise ServiceValidationError("A profile is already running")
+
+    profiler = Profiler()
+    for wrapper in wrappers:
+        wrapper.tracer.profiler = profiler
+
+    path = hass.config.path(PROFILE_REPORT_FILE)
+
+    async def _async_finish(_: Any = None) -> None:
+        if hass.data.pop(PROFILER_DATA, None) is None:
+            return
+
+        cancel_timer()
+        remove_stop_listener()
+        for wrapper in wrappers:
+            wrapper.tracer.profiler = None
+
+        await hass.async_add_executor_job(_write_report, path, profiler.report())
+        LOGGER.info("Profile report written to %s", path)
+
+    hass.data[PROFILER_DATA] = _async_finish
+    cancel_timer = async_call_later(hass, duration, _async_finish)
+    remove_stop_listener = hass.bus.async_listen(
+        EVENT_HOMEASSISTANT_STOP, _async_finish
+    )
+
+    LOGGER.debug("Profiling %d devices for %d seconds", len(wrappers), duration)
+    return {"devices": len(wrappers), "duration": duration, "report": path}
+
+
+async def async_stop_profile(hass: HomeAssistant) -> None:
+    """Finish the running profile now and write its report."""
+    if (finish := hass.data.get(PROFILER_DATA)) is not None:
+        await finish()
+
+
+def _write_report(path: str, report: str) -> None:
+    """Write the report file."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report)
@@ -13,10 +13,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from . import WINIX_DOMAIN, WinixConfigEntry
-from .const import ATTR_AIRFLOW, DEHUMIDIFIER_FAN_SPEEDS, LOGGER
+from .const import ATTR_AIRFLOW, LOGGER
 from .device_wrapper import WinixDeviceWrapper
 from .driver import BrightnessLevel
-from .manager import WinixEntity, WinixManager
+from .manager import WinixEntity, WinixManager, async_add_device_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -27,6 +27,7 @@ class WinixSelectEntityDescription(SelectEntityDescription):
     current_option_fn: Callable[[WinixDeviceWrapper], str]
     select_option_fn: Callable[[WinixDeviceWrapper, str], Coroutine[Any, Any, Any]]
     available_fn: Callable[[WinixDeviceWrapper], bool] | None = None
+    options_fn: Callable[[WinixDeviceWrapper], list[str]] | None = None
 
 
 def format_brightness_level(value: int | None) -> str:
@@ -66,7 +67,7 @@ SELECT_DESCRIPTIONS: Final[tuple[WinixSelectEntityDescription, ...]] = (
         icon="mdi:fan",
         key="fan_speed",
         translation_key="fan_speed",
-        options=DEHUMIDIFIER_FAN_SPEEDS,
+        options_fn=lambda device: device.profile.fan_speeds,
         select_option_fn=lambda device, value: device.async_set_speed(value),
     ),
 )
@@ -81,14 +82,13 @@ async def async_setup_entry(
 
     manager = entry.runtime_data
 
-    entities = [
-        WinixSelectEntity(wrapper, manager, description)
-        for description in SELECT_DESCRIPTIONS
-        for wrapper in manager.get_device_wrappers()
-        if description.exists_fn(wrapper)
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s select entities", len(entities))
+    count = async_add_device_entities(
+        manager,
+        SELECT_DESCRIPTIONS,
+        lambda wrapper, description: WinixSelectEntity(wrapper, manager, description),
+        async_add_entities,
+    )
+    LOGGER.info("Added %s select entities", count)
 
 
 class WinixSelectEntity(WinixEntity, SelectEntity):
@@ -105,6 +105,8 @@ class WinixSelectEntity(WinixEntity, SelectEntity):
         """Initialize the select."""
         super().__init__(wrapper, coordinator)
         self.entity_description = description
+        if description.options_fn is not None:
+            self._attr_options = description.options_fn(wrapper)
 
         # Legacy format retained for existing installations; new entity types
         # should use f"<key>_{self._mac}" without the platform/winix prefix.
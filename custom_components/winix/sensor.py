@@ -2,6 +2,8 @@
 
 from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
+from datetime import date
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -11,10 +13,18 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfDensity, UnitOfTime
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfDensity,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
+from homeassistant.util import dt as dt_util
 
 from . import WINIX_DOMAIN, WinixConfigEntry
 from .const import (
@@ -27,12 +37,19 @@ from .const import (
     LOGGER,
     SENSOR_AIR_QVALUE,
     SENSOR_AQI,
+    SENSOR_DATA_AGE,
     SENSOR_FILTER_LIFE,
+    SENSOR_FILTER_REPLACEMENT,
+    SENSOR_FILTER_USAGE_RATE,
     SENSOR_MAX_FILTER_LIFE,
     SENSOR_PM25,
+    SENSOR_POLL_LATENCY,
+    SENSOR_POLL_SUCCESS_RATE,
+    SENSOR_RSSI,
+    SIGNAL_DEVICE_POLLED,
 )
 from .device_wrapper import WinixDeviceWrapper
-from .manager import WinixEntity, WinixManager
+from .manager import WinixEntity, WinixManager, async_add_device_entities
 
 
 def get_air_quality_attr(
@@ -40,7 +57,18 @@ def get_air_quality_attr(
 ) -> dict[str, Any]:
     """Get air quality attribute."""
 
-    return {ATTR_AIR_QUALITY: state.get(ATTR_AIR_QUALITY)}
+    return {
+        ATTR_AIR_QUALITY: state.get(ATTR_AIR_QUALITY),
+        **get_history_attr(ATTR_AIR_QVALUE, wrapper),
+    }
+
+
+def get_history_attr(metric: str, wrapper: WinixDeviceWrapper) -> dict[str, Any]:
+    """Get rolling statistics of the metric."""
+
+    if wrapper.history is None:
+        return {}
+    return wrapper.history.statistics(metric)
 
 
 def get_filter_life(state: dict[str, str], wrapper: WinixDeviceWrapper) -> int | None:
@@ -64,6 +92,17 @@ def get_filter_life_percentage(hours: str | None, max_life_hours: int) -> int |
     return round((max_life_hours - hours) * 100 / max_life_hours)
 
 
+def get_filter_replacement(
+    state: dict[str, str], wrapper: WinixDeviceWrapper
+) -> date | None:
+    """Get the projected filter replacement date."""
+
+    projected = wrapper.filter_usage.projected_replacement(
+        int(time.time()), wrapper.filter_max_life
+    )
+    return None if projected is None else dt_util.as_local(projected).date()
+
+
 def get_operating_time_attr(
     state: dict[str, str], wrapper: WinixDeviceWrapper
 ) -> int | None:
@@ -72,13 +111,24 @@ def get_operating_time_attr(
     return {ATTR_OPERATING_HOURS: state.get(ATTR_FILTER_HOUR)}
 
 
+def get_poll_latency(state: dict[str, str], wrapper: WinixDeviceWrapper) -> int | None:
+    """Get the duration of the last successful poll in milliseconds."""
+
+    latency = wrapper.poll_metrics.last_latency
+    return None if latency is None else round(latency * 1000)
+
+
 @dataclass(frozen=True, kw_only=True)
 class WinixSensorEntityDescription(SensorEntityDescription):
     """Describe Winix sensor entity."""
 
     value_fn: Callable[[dict[str, str], WinixDeviceWrapper], StateType]
-    extra_state_attributes_fn: Callable[[dict[str, str]], dict[str, Any]] | None = None
+    extra_state_attributes_fn: (
+        Callable[[dict[str, str], WinixDeviceWrapper], dict[str, Any]] | None
+    ) = None
     exists_fn: Callable[[WinixDeviceWrapper], bool] = field(default=lambda _: True)
+    # Describes the poll rather than the device data, so it changes on every poll
+    update_on_poll: bool = False
 
 
 SENSOR_DESCRIPTIONS: tuple[WinixSensorEntityDescription, ...] = (
@@ -90,7 +140,7 @@ SENSOR_DESCRIPTIONS: tuple[WinixSensorEntityDescription, ...] = (
         native_unit_of_measurement="qv",
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda state, wrapper: state.get(ATTR_AIR_QVALUE),
-        exists_fn=lambda device: device.is_air_purifier,
+        exists_fn=lambda device: device.profile.supports_air_quality,
     ),
     WinixSensorEntityDescription(
         icon="mdi:air-filter",
@@ -111,24 +161,91 @@ SENSOR_DESCRIPTIONS: tuple[WinixSensorEntityDescription, ...] = (
         value_fn=lambda state, wrapper: wrapper.filter_max_life,
         exists_fn=lambda device: device.is_air_purifier,
     ),
+    WinixSensorEntityDescription(
+        device_class=SensorDeviceClass.DATE,
+        icon="mdi:calendar-clock",
+        key=SENSOR_FILTER_REPLACEMENT,
+        translation_key="filter_replacement",
+        value_fn=get_filter_replacement,
+        exists_fn=lambda device: device.is_air_purifier,
+    ),
+    WinixSensorEntityDescription(
+        icon="mdi:chart-line",
+        key=SENSOR_FILTER_USAGE_RATE,
+        translation_key="filter_usage_rate",
+        native_unit_of_measurement="h/d",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state, wrapper: wrapper.filter_usage.daily_rate(
+            int(time.time())
+        ),
+        exists_fn=lambda device: device.is_air_purifier,
+    ),
     WinixSensorEntityDescription(
         icon="mdi:blur",
+        extra_state_attributes_fn=lambda state, wrapper: get_history_attr(
+            ATTR_AIR_AQI, wrapper
+        ),
         key=SENSOR_AQI,
         translation_key="aqi",
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda state, wrapper: state.get(ATTR_AIR_AQI),
-        exists_fn=lambda device: device.is_air_purifier,
+        exists_fn=lambda device: device.profile.supports_air_quality,
     ),
     WinixSensorEntityDescription(
         device_class=SensorDeviceClass.PM25,
+        extra_state_attributes_fn=lambda state, wrapper: get_history_attr(
+            ATTR_PM25, wrapper
+        ),
         key=SENSOR_PM25,
         translation_key="pm2_5",
         native_unit_of_measurement=UnitOfDensity.MICROGRAMS_PER_CUBIC_METER,
         value_fn=lambda state, wrapper: state.get(ATTR_PM25),
         exists_fn=lambda device: (
-            device.is_air_purifier and device.features.supports_pm25
+            device.profile.supports_air_quality and device.features.supports_pm25
         ),
     ),
+    WinixSensorEntityDescription(
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        key=SENSOR_RSSI,
+        translation_key="rssi",
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state, wrapper: wrapper.rssi,
+        update_on_poll=True,
+    ),
+    WinixSensorEntityDescription(
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:clock-outline",
+        key=SENSOR_DATA_AGE,
+        translation_key="data_age",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state, wrapper: wrapper.data_age,
+        update_on_poll=True,
+    ),
+    WinixSensorEntityDescription(
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+        key=SENSOR_POLL_LATENCY,
+        translation_key="poll_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=get_poll_latency,
+        update_on_poll=True,
+    ),
+    WinixSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:check-network-outline",
+        key=SENSOR_POLL_SUCCESS_RATE,
+        translation_key="poll_success_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state, wrapper: wrapper.poll_metrics.success_rate,
+        update_on_poll=True,
+    ),
 )
 
 
@@ -140,14 +257,13 @@ async def async_setup_entry(
     """Set up the Winix sensors."""
     manager = entry.runtime_data
 
-    entities = [
-        WinixSensor(wrapper, manager, description)
-        for description in SENSOR_DESCRIPTIONS
-        for wrapper in manager.get_device_wrappers()
-        if description.exists_fn(wrapper)
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s sensors", len(entities))
+    count = async_add_device_entities(
+        manager,
+        SENSOR_DESCRIPTIONS,
+        lambda wrapper, description: WinixSensor(wrapper, manager, description),
+        async_add_entities,
+    )
+    LOGGER.info("Added %s sensors", count)
 
 
 class WinixSensor(WinixEntity, SensorEntity):
@@ -171,6 +287,18 @@ class WinixSensor(WinixEntity, SensorEntity):
             f"{WINIX_DOMAIN}_{description.key.lower()}_{self._mac}"
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the polls of the device which do not change its data."""
+        await super().async_added_to_hass()
+        if self.entity_description.update_on_poll:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    SIGNAL_DEVICE_POLLED.format(self._mac),
+                    self.async_write_ha_state,
+                )
+            )
+
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes."""
@@ -178,6 +306,10 @@ class WinixSensor(WinixEntity, SensorEntity):
         if self.entity_description.extra_state_attributes_fn is None:
             return None
 
+        return self._get_cached_attributes(self._build_extra_state_attributes)
+
+    def _build_extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Build the state attributes from the device data."""
         state = self.device_wrapper.get_state()
         return (
             None
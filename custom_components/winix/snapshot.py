@@ -0,0 +1,90 @@
+"""Scene-like snapshot and restore of Winix device states."""
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .bulk import async_run_bulk
+from .const import BULK_RESULT_SKIPPED, BULK_RESULT_UPDATED, LOGGER, WINIX_DOMAIN
+from .device_wrapper import WinixDeviceWrapper
+
+STORAGE_KEY = f"{WINIX_DOMAIN}.snapshots"
+STORAGE_VERSION = 1
+
+# Snapshots are stored as {name: {mac: {attribute: value}}}
+SNAPSHOT_DATA: HassKey[dict[str, dict[str, dict[str, Any]]]] = HassKey(STORAGE_KEY)
+
+
+async def _async_load(
+    hass: HomeAssistant,
+) -> tuple[Store, dict[str, dict[str, dict[str, Any]]]]:
+    """Return the store and the snapshots, loading them on first use."""
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    if SNAPSHOT_DATA not in hass.data:
+        hass.data[SNAPSHOT_DATA] = await store.async_load() or {}
+
+    return store, hass.data[SNAPSHOT_DATA]
+
+
+async def async_snapshot(
+    hass: HomeAssistant, name: str, wrappers: list[WinixDeviceWrapper]
+) -> dict[str, Any]:
+    """Save the state of the devices under the given name."""
+    store, snapshots = await _async_load(hass)
+
+    devices = {
+        wrapper.device_stub.mac.lower(): wrapper.snapshot()
+        for wrapper in wrappers
+        if wrapper.get_state()
+    }
+    snapshots[name] = devices
+    await store.async_save(snapshots)
+
+    LOGGER.debug("Saved snapshot '%s' with %d devices", name, len(devices))
+    return {"name": name, "devices": len(devices)}
+
+
+async def async_restore(
+    hass: HomeAssistant, name: str, wrappers: list[WinixDeviceWrapper]
+) -> dict[str, Any]:
+    """Restore the state of the devices saved under the given name.
+
+    Raises ServiceValidationError.
+    """
+    _, snapshots = await _async_load(hass)
+
+    devices = snapshots.get(name)
+    if devices is None:
+        raise ServiceValidationError(f"Snapshot '{name}' does not exist")
+
+    commands_sent = 0
+    commands_skipped = 0
+
+    async def _operation(wrapper: WinixDeviceWrapper) -> str:
+        nonlocal commands_sent, commands_skipped
+
+        sent, skipped = await wrapper.async_restore(
+            devices[wrapper.device_stub.mac.lower()]
+        )
+        commands_sent += sent
+        commands_skipped += skipped
+        return BULK_RESULT_UPDATED if sent else BULK_RESULT_SKIPPED
+
+    summary = await async_run_bulk(
+        [wrapper for wrapper in wrappers if wrapper.device_stub.mac.lower() in devices],
+        _operation,
+    )
+    summary["commands_sent"] = commands_sent
+    summary["commands_skipped"] = commands_skipped
+
+    LOGGER.debug(
+        "Restored snapshot '%s', %d commands sent, %d skipped",
+        name,
+        commands_sent,
+        commands_skipped,
+    )
+    return summary
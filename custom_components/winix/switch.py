@@ -15,7 +15,7 @@ from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from . import WINIX_DOMAIN, WinixConfigEntry
 from .const import LOGGER
 from .device_wrapper import WinixDeviceWrapper
-from .manager import WinixEntity, WinixManager
+from .manager import WinixEntity, WinixManager, async_add_device_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -57,14 +57,13 @@ async def async_setup_entry(
 
     manager = entry.runtime_data
 
-    entities = [
-        WinixSwitchEntity(wrapper, manager, description)
-        for description in SWITCH_DESCRIPTIONS
-        for wrapper in manager.get_device_wrappers()
-        if description.exists_fn(wrapper)
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s switches", len(entities))
+    count = async_add_device_entities(
+        manager,
+        SWITCH_DESCRIPTIONS,
+        lambda wrapper, description: WinixSwitchEntity(wrapper, manager, description),
+        async_add_entities,
+    )
+    LOGGER.info("Added %s switches", count)
 
 
 class WinixSwitchEntity(WinixEntity, SwitchEntity):
@@ -0,0 +1,75 @@
+"""Runtime tracing of Winix devices."""
+
+from collections import Counter, deque
+from contextlib import AbstractContextManager, nullcontext
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .const import LOGGER, TRACE_CAPACITY
+
+if TYPE_CHECKING:
+    from .profiler import Profiler
+
+_NOT_PROFILED = nullcontext()
+
+
+class TraceEvent(NamedTuple):
+    """Captured trace event."""
+
+    timestamp: float
+    event: str
+    data: Any
+
+
+class DeviceTracer:
+    """Sampled capture of the internal events of a device.
+
+    Tracers start disabled. Call sites guard the capture with
+    `if tracer.enabled and tracer.sample(event)` so a disabled tracer costs a
+    single attribute check and the event data is never built.
+    """
+
+    def __init__(self, name: str, capacity: int = TRACE_CAPACITY) -> None:
+        """Initialize the tracer."""
+        self.name = name
+        self.enabled = False
+        self._sample_rate = 1
+        self._counts: Counter[str] = Counter()
+        self._events: deque[TraceEvent] = deque(maxlen=capacity)
+        # Set while the device is being profiled
+        self.profiler: Profiler | None = None
+
+    def start(self, sample_rate: int = 1) -> None:
+        """Start capturing one in sample_rate occurrences of each event."""
+        self._sample_rate = max(1, sample_rate)
+        self._counts.clear()
+        self._events.clear()
+        self.enabled = True
+        LOGGER.debug("%s: tracing started, sample_rate=%d", self.name, sample_rate)
+
+    def stop(self) -> list[dict[str, Any]]:
+        """Stop capturing and return the captured events."""
+        self.enabled = False
+        LOGGER.debug("%s: tracing stopped", self.name)
+        return self.events()
+
+    def sample(self, event: str) -> bool:
+        """Return True if this occurrence of the event should be captured."""
+        count = self._counts[event]
+        self._counts[event] = count + 1
+        return count % self._sample_rate == 0
+
+    def record(self, event: str, data: Any) -> None:
+        """Capture an event, it is also written to the debug log."""
+        self._events.append(TraceEvent(time.time(), event, data))
+        LOGGER.debug("%s: %s %s", self.name, event, data)
+
+    def events(self) -> list[dict[str, Any]]:
+        """Return the captured events, oldest first."""
+        return [event._asdict() for event in self._events]
+
+    def measure(self, phase: str) -> AbstractContextManager[None]:
+        """Return a context manager which times the phase while profiling."""
+        if self.profiler is None:
+            return _NOT_PROFILED
+        return self.profiler.measure(self.name, phase)
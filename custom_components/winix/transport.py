@@ -0,0 +1,158 @@
+"""Winix cloud transport shared by all the config entries."""
+
+import asyncio
+from collections import deque
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import aiohttp_client
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    LOGGER,
+    TRANSPORT_BURST,
+    TRANSPORT_MAX_CONCURRENCY,
+    TRANSPORT_RATE_LIMIT,
+    TRANSPORT_RECENT_REQUESTS,
+    WINIX_DOMAIN,
+)
+
+TRANSPORT_DATA: HassKey[WinixTransport] = HassKey(f"{WINIX_DOMAIN}.transport")
+
+# Fractional part of the golden ratio, successive multiples are evenly spread
+_GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+
+class TokenBucket:
+    """Token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize the bucket, rate is the number of tokens added per second."""
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class WinixTransport:
+    """Rate limited access to the Winix cloud.
+
+    Exposes get/post like aiohttp.ClientSession. The body is read while the
+    concurrency slot is held so the connection is returned to the pool before the
+    next request is let through.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        rate: float = TRANSPORT_RATE_LIMIT,
+        burst: int = TRANSPORT_BURST,
+        max_concurrency: int = TRANSPORT_MAX_CONCURRENCY,
+    ) -> None:
+        """Initialize the transport."""
+        self._session = session
+        self._bucket = TokenBucket(rate, burst)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._entry_slots: dict[str, int] = {}
+        self.recent_requests: deque[dict[str, Any]] = deque(
+            maxlen=TRANSPORT_RECENT_REQUESTS
+        )
+
+    async def get(self, url: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        """Perform a GET request."""
+        return await self._request(aiohttp.hdrs.METH_GET, url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        """Perform a POST request."""
+        return await self._request(aiohttp.hdrs.METH_POST, url, **kwargs)
+
+    async def _request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> aiohttp.ClientResponse:
+        """Perform the request once a token and a concurrency slot are available."""
+        async with self._semaphore:
+            await self._bucket.async_acquire()
+            start = time.monotonic()
+            status: int | None = None
+            try:
+                response = await self._session.request(method, url, **kwargs)
+                status = response.status
+                await response.read()
+            finally:
+                self.recent_requests.append(
+                    {
+                        "timestamp": time.time(),
+                        "method": method,
+                        "endpoint": _get_endpoint(url),
+                        "status": status,
+                        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+                    }
+                )
+            return response
+
+    @callback
+    def async_register_entry(self, entry_id: str) -> float:
+        """Register a config entry and return its poll phase as a fraction of the interval.
+
+        Entries take the lowest free slot, the phases of the slots follow the golden
+        ratio sequence so that any number of entries stays spread out.
+        """
+        if entry_id not in self._entry_slots:
+            used = set(self._entry_slots.values())
+            self._entry_slots[entry_id] = next(
+                slot for slot in range(len(used) + 1) if slot not in used
+            )
+
+        slot = self._entry_slots[entry_id]
+        phase = (slot * _GOLDEN_RATIO_FRACTION) % 1
+        LOGGER.debug(
+            "Entry %s assigned poll slot %d (phase %.3f)", entry_id, slot, phase
+        )
+        return phase
+
+    @callback
+    def async_unregister_entry(self, entry_id: str) -> None:
+        """Release the slot of a config entry."""
+        self._entry_slots.pop(entry_id, None)
+
+
+def _get_endpoint(url: str) -> str:
+    """Return the url without the device and identity ids which follow /devices/."""
+    parts = urlsplit(url)
+    segments = parts.path.split("/")
+    if "devices" in segments:
+        index = segments.index("devices") + 1
+        segments[index:] = ["*"] * len(segments[index:])
+    return f"{parts.netloc}{'/'.join(segments)}"
+
+
+@callback
+def async_get_transport(hass: HomeAssistant) -> WinixTransport:
+    """Return the transport shared by all the config entries."""
+    if TRANSPORT_DATA not in hass.data:
+        hass.data[TRANSPORT_DATA] = WinixTransport(
+            aiohttp_client.async_get_clientsession(hass)
+        )
+
+    return hass.data[TRANSPORT_DATA]
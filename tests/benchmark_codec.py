@@ -0,0 +1,117 @@
+"""Benchmark of the JSON codec on Winix cloud payloads.
+
+Run with `python -m tests.benchmark_codec`.
+"""
+
+from functools import partial
+import json
+import timeit
+from typing import Any
+
+from custom_components.winix.codec import CODEC_NAME, json_dumps, json_loads
+
+
+def state_payload() -> dict[str, Any]:
+    """Return a device state response."""
+    return {
+        "statusCode": 200,
+        "headers": {"resultCode": "S100", "resultMessage": ""},
+        "body": {
+            "deviceId": "847207352CE0_364yr8i989",
+            "totalCnt": 1,
+            "data": [
+                {
+                    "apiNo": "A210",
+                    "apiGroup": "001",
+                    "deviceGroup": "Air01",
+                    "modelId": "C545",
+                    "attributes": {
+                        "A02": "0",
+                        "A03": "01",
+                        "A04": "01",
+                        "A05": "01",
+                        "A07": "0",
+                        "A21": "1257",
+                        "S07": "01",
+                        "S08": "74",
+                        "S14": "121",
+                    },
+                    "rssi": "-55",
+                    "creationTime": 1673449200634,
+                    "utcDatetime": "2023-01-11 15:00:00",
+                    "utcTimestamp": 1673449200,
+                }
+            ],
+        },
+    }
+
+
+def device_list_payload(count: int = 10) -> dict[str, Any]:
+    """Return a decrypted getDeviceInfoList response."""
+    return {
+        "resultCode": "200",
+        "resultMessage": "",
+        "deviceInfoList": [
+            {
+                "deviceId": f"847207352CE{index}_364yr8i989",
+                "mac": f"847207352CE{index}",
+                "deviceAlias": f"Purifier {index}",
+                "deviceLocCode": "US",
+                "filterReplaceDate": "2023-01-11 15:00:00",
+                "modelName": "C545",
+                "modelId": "C545",
+                "mcuVer": "0.0.0",
+                "productGroup": "Air01",
+            }
+            for index in range(count)
+        ],
+    }
+
+
+def model_list_payload(groups: int = 10, models: int = 10) -> dict[str, Any]:
+    """Return a decrypted getAllModelGroupInfoList response."""
+    return {
+        "resultCode": "200",
+        "resultMessage": "",
+        "modelGroupInfoList": [
+            {
+                "modelGroupName": f"Group {group}",
+                "modelInfoList": [
+                    {
+                        "modelId": f"M{group}{model}",
+                        "modelName": f"Model {group}{model}",
+                        "filterInfoList": [
+                            {"filterName": "Filter", "filterMaxLife": 6480},
+                            {"filterName": "Pre-filter", "filterMaxLife": 2160},
+                        ],
+                    }
+                    for model in range(models)
+                ],
+            }
+            for group in range(groups)
+        ],
+    }
+
+
+PAYLOADS = {
+    "state": state_payload,
+    "device_list": device_list_payload,
+    "model_list": model_list_payload,
+}
+
+
+def run(number: int = 10000) -> list[tuple[str, float, float]]:
+    """Return the mean decode time in microseconds of json and the codec per payload."""
+    results = []
+    for name, build in PAYLOADS.items():
+        data = json_dumps(build())
+        stdlib = timeit.timeit(partial(json.loads, data), number=number)
+        codec = timeit.timeit(partial(json_loads, data), number=number)
+        results.append((name, stdlib * 1e6 / number, codec * 1e6 / number))
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'payload':<14}{'json us':>10}{CODEC_NAME + ' us':>12}{'speedup':>10}")
+    for name, stdlib, codec in run():
+        print(f"{name:<14}{stdlib:>10.2f}{codec:>12.2f}{stdlib / codec:>9.1f}x")
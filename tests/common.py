@@ -1,12 +1,15 @@
 """Tests for Winix component."""
 
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
 from voluptuous.validators import Number
+from winix import auth
 
 from custom_components.winix.const import WINIX_AUTH_RESPONSE, WINIX_DOMAIN
+from custom_components.winix.credentials import WinixCredentials
 from custom_components.winix.device_wrapper import WinixDeviceWrapper
 from custom_components.winix.fan import WinixPurifier
 from custom_components.winix.manager import WinixManager
@@ -15,9 +18,12 @@ from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 
 TEST_DEVICE_ID = "847207352CE0_364yr8i989"
+TEST_IDENTITY_ID = "test_identity_id"
 
 
-def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+def config_entry(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
     """Create a mock config entry."""
     user_input = {
         WINIX_AUTH_RESPONSE: {
@@ -33,6 +39,7 @@ def config_entry(hass: HomeAssistant) -> MockConfigEntry:
     entry = MockConfigEntry(
         domain=WINIX_DOMAIN,
         data=user_input,
+        options=options or {},
     )
     entry.add_to_hass(hass)
     return entry
@@ -43,10 +50,11 @@ async def init_integration(
     test_device_stub: MyWinixDeviceStub,
     test_device_json: any,
     aioclient_mock: AiohttpClientMocker,
+    options: dict[str, Any] | None = None,
 ) -> MockConfigEntry:
     """Prepare the integration."""
 
-    entry = config_entry(hass)
+    entry = config_entry(hass, options)
 
     aioclient_mock.get(
         f"https://us.api.winix-iot.com/common/event/sttus/devices/{TEST_DEVICE_ID}",
@@ -61,8 +69,8 @@ async def init_integration(
         ),
         patch("winix.WinixAccount.get_uuid"),
         patch(
-            "custom_components.winix.manager.Helpers.get_identity_id_sync",
-            return_value="test_identity_id",
+            "custom_components.winix.manager.Helpers.async_get_identity_id",
+            return_value=TEST_IDENTITY_ID,
         ),
         patch(
             "custom_components.winix.Helpers.get_models_filter_max_life",
@@ -75,6 +83,19 @@ async def init_integration(
     return entry
 
 
+def build_credentials(identity_id: str = TEST_IDENTITY_ID) -> WinixCredentials:
+    """Return the credentials of a test account."""
+    return WinixCredentials(
+        auth.WinixAuthResponse(
+            user_id="user_id",
+            access_token="access_token",
+            refresh_token="refresh_token",
+            id_token="id_token",
+        ),
+        identity_id,
+    )
+
+
 def build_mock_wrapper(index: Number = 0) -> WinixDeviceWrapper:
     """Return a mocked WinixDeviceWrapper instance."""
     client = Mock()
@@ -88,7 +109,7 @@ def build_mock_wrapper(index: Number = 0) -> WinixDeviceWrapper:
     logger.debug = Mock()
     logger.warning = Mock()
 
-    return WinixDeviceWrapper(client, device_stub, logger, "test_identity_id")
+    return WinixDeviceWrapper(client, device_stub, logger, build_credentials())
 
 
 def build_mock_dehumidifier_wrapper(index: Number = 0) -> WinixDeviceWrapper:
@@ -104,7 +125,7 @@ def build_mock_dehumidifier_wrapper(index: Number = 0) -> WinixDeviceWrapper:
     logger.debug = Mock()
     logger.warning = Mock()
 
-    return WinixDeviceWrapper(client, device_stub, logger, "test_identity_id")
+    return WinixDeviceWrapper(client, device_stub, logger, build_credentials())
 
 
 def build_fake_manager(wrapper_count: Number) -> WinixManager:
@@ -4,12 +4,14 @@ from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
 
+from custom_components.winix.codec import json_dumps
 from custom_components.winix.const import ORDERED_NAMED_FAN_SPEEDS
 from custom_components.winix.device_wrapper import WinixDeviceWrapper
 from custom_components.winix.driver import AirPurifierDriver, DehumidifierDriver
+from custom_components.winix.profile import build_profile
 from custom_components.winix.stub import MyWinixDeviceStub
 
-from .common import TEST_DEVICE_ID  # noqa: TID251
+from .common import TEST_DEVICE_ID, build_credentials  # noqa: TID251
 
 
 @pytest.fixture
@@ -79,7 +81,10 @@ def mock_device_wrapper() -> WinixDeviceWrapper:
     device_wrapper = MagicMock()
     device_wrapper.device_stub.mac = "f190d35456d0"
     device_wrapper.device_stub.alias = "Purifier1"
+    device_wrapper.device_stub.model = "C545"
+    device_wrapper.device_stub.product_group = "Air01"
     device_wrapper.fan_speeds = ORDERED_NAMED_FAN_SPEEDS
+    device_wrapper.profile = build_profile(device_wrapper.device_stub)
 
     device_wrapper.async_plasmawave_off = AsyncMock()
     device_wrapper.async_plasmawave_on = AsyncMock()
@@ -96,8 +101,7 @@ def mock_airpurifier_driver() -> AirPurifierDriver:
     """Return a mocked AirPurifierDriver instance."""
     client = Mock()
     device_id = "device_1"
-    identity_id = "test_identity_id"
-    return AirPurifierDriver(device_id, client, identity_id)
+    return AirPurifierDriver(device_id, client, build_credentials())
 
 
 @pytest.fixture
@@ -109,15 +113,14 @@ def mock_airpurifier_driver_with_payload(
     json_value = {"body": {"data": [{"attributes": request.param}]}}
 
     response = Mock()
-    response.json = AsyncMock(return_value=json_value)
+    response.read = AsyncMock(return_value=json_dumps(json_value))
     response.status = 200
 
     client = Mock()  # aiohttp.ClientSession
     client.get = AsyncMock(return_value=response)
 
     device_id = "device_1"
-    identity_id = "test_identity_id"
-    return AirPurifierDriver(device_id, client, identity_id)
+    return AirPurifierDriver(device_id, client, build_credentials())
 
 
 @pytest.fixture
@@ -125,8 +128,7 @@ def mock_dehumidifier_driver() -> DehumidifierDriver:
     """Return a mocked DehumidifierDriver instance."""
     client = Mock()
     device_id = "device_1"
-    identity_id = "test_identity_id"
-    return DehumidifierDriver(device_id, client, identity_id)
+    return DehumidifierDriver(device_id, client, build_credentials())
 
 
 @pytest.fixture
@@ -138,12 +140,11 @@ def mock_dehumidifier_driver_with_payload(
     json_value = {"body": {"data": [{"attributes": request.param}]}}
 
     response = Mock()
-    response.json = AsyncMock(return_value=json_value)
+    response.read = AsyncMock(return_value=json_dumps(json_value))
     response.status = 200
 
     client = Mock()  # aiohttp.ClientSession
     client.get = AsyncMock(return_value=response)
 
     device_id = "device_1"
-    identity_id = "test_identity_id"
-    return DehumidifierDriver(device_id, client, identity_id)
+    return DehumidifierDriver(device_id, client, build_credentials())
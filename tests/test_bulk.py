@@ -0,0 +1,253 @@
+"""Test Winix bulk operations."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.bulk import (
+    async_run_bulk,
+    brightness_level_operation,
+    child_lock_operation,
+    power_operation,
+    preset_mode_operation,
+    speed_operation,
+)
+from custom_components.winix.const import (
+    AIRFLOW_HIGH,
+    ATTR_AIRFLOW,
+    ATTR_MODE,
+    ATTR_PLASMA,
+    ATTR_POWER,
+    BULK_RESULT_FAILED,
+    BULK_RESULT_OFF,
+    BULK_RESULT_SKIPPED,
+    BULK_RESULT_UNSUPPORTED,
+    BULK_RESULT_UPDATED,
+    MODE_AUTO,
+    MODE_MANUAL,
+    ON_VALUE,
+    PRESET_MODE_AUTO,
+    PRESET_MODE_MANUAL,
+    SERVICE_BULK_SET_POWER,
+    WINIX_DOMAIN,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .common import (  # noqa: TID251
+    build_mock_dehumidifier_wrapper,
+    build_mock_wrapper,
+    init_integration,
+)
+
+AirPurifierDriver_TypeName = "custom_components.winix.driver.AirPurifierDriver"
+
+
+async def _build_wrapper(index: int, state: dict):
+    """Return a purifier wrapper updated with the given state."""
+    wrapper = build_mock_wrapper(index)
+    with patch(
+        f"{AirPurifierDriver_TypeName}.get_state", AsyncMock(return_value=state)
+    ):
+        await wrapper.update()
+    wrapper.update_features()
+    return wrapper
+
+
+async def test_run_bulk_summary() -> None:
+    """Test the per-device summary."""
+
+    wrappers = [build_mock_wrapper(index) for index in range(4)]
+    outcomes = iter(
+        [BULK_RESULT_UPDATED, BULK_RESULT_SKIPPED, BULK_RESULT_UPDATED, None]
+    )
+
+    async def operation(wrapper) -> str:
+        outcome = next(outcomes)
+        if outcome is None:
+            raise ValueError("boom")
+        return outcome
+
+    summary = await async_run_bulk(wrappers, operation)
+
+    assert summary[BULK_RESULT_UPDATED] == 2
+    assert summary[BULK_RESULT_SKIPPED] == 1
+    assert summary[BULK_RESULT_UNSUPPORTED] == 0
+    assert summary[BULK_RESULT_OFF] == 0
+    assert summary[BULK_RESULT_FAILED] == 1
+    assert [item["device"] for item in summary["devices"]] == [
+        "Purifier0",
+        "Purifier1",
+        "Purifier2",
+        "Purifier3",
+    ]
+    assert summary["devices"][3]["error"] == "boom"
+
+
+async def test_run_bulk_concurrency_limit() -> None:
+    """Test that no more than max_concurrency devices are commanded together."""
+
+    running = 0
+    peak = 0
+
+    async def operation(wrapper) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return BULK_RESULT_UPDATED
+
+    wrappers = [build_mock_wrapper(index) for index in range(7)]
+    summary = await async_run_bulk(wrappers, operation, max_concurrency=2)
+
+    assert summary[BULK_RESULT_UPDATED] == 7
+    assert peak == 2
+
+
+async def test_power_operation() -> None:
+    """Test that devices already in the target power state are skipped."""
+
+    wrapper_on = await _build_wrapper(0, {ATTR_POWER: ON_VALUE})
+    wrapper_off = await _build_wrapper(1, {})
+
+    with patch(f"{AirPurifierDriver_TypeName}.turn_off") as turn_off:
+        summary = await async_run_bulk(
+            [wrapper_on, wrapper_off], power_operation(False)
+        )
+
+    assert turn_off.call_count == 1
+    assert summary[BULK_RESULT_UPDATED] == 1
+    assert summary[BULK_RESULT_SKIPPED] == 1
+    assert not wrapper_on.is_on
+
+
+async def test_preset_mode_operation() -> None:
+    """Test that purifiers already in the preset are skipped."""
+
+    wrapper_auto = await _build_wrapper(
+        0, {ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_AUTO, ATTR_PLASMA: ON_VALUE}
+    )
+    wrapper_manual = await _build_wrapper(
+        1, {ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_MANUAL, ATTR_PLASMA: ON_VALUE}
+    )
+    dehumidifier = build_mock_dehumidifier_wrapper(2)
+
+    with patch(f"{AirPurifierDriver_TypeName}.auto") as auto:
+        summary = await async_run_bulk(
+            [wrapper_auto, wrapper_manual, dehumidifier],
+            preset_mode_operation(PRESET_MODE_AUTO),
+        )
+
+    assert auto.call_count == 1
+    assert [item["result"] for item in summary["devices"]] == [
+        BULK_RESULT_SKIPPED,
+        BULK_RESULT_UPDATED,
+        BULK_RESULT_UNSUPPORTED,
+    ]
+
+    with patch(f"{AirPurifierDriver_TypeName}.manual") as manual:
+        summary = await async_run_bulk(
+            [wrapper_auto], preset_mode_operation(PRESET_MODE_MANUAL)
+        )
+    assert manual.call_count == 1
+    assert summary[BULK_RESULT_UPDATED] == 1
+
+
+async def test_speed_operation() -> None:
+    """Test that purifiers already running at the speed are skipped."""
+
+    wrapper_high = await _build_wrapper(
+        0, {ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_MANUAL, ATTR_AIRFLOW: AIRFLOW_HIGH}
+    )
+    wrapper_auto = await _build_wrapper(
+        1, {ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_AUTO, ATTR_AIRFLOW: AIRFLOW_HIGH}
+    )
+
+    with (
+        patch(f"{AirPurifierDriver_TypeName}.high") as high,
+        patch(f"{AirPurifierDriver_TypeName}.manual"),
+    ):
+        summary = await async_run_bulk(
+            [wrapper_high, wrapper_auto], speed_operation(75)
+        )
+
+    assert high.call_count == 1
+    assert [item["result"] for item in summary["devices"]] == [
+        BULK_RESULT_SKIPPED,
+        BULK_RESULT_UPDATED,
+    ]
+
+
+@pytest.mark.parametrize(
+    ("state", "expected"),
+    [
+        ({ATTR_POWER: ON_VALUE, "brightness_level": 30}, BULK_RESULT_SKIPPED),
+        ({ATTR_POWER: ON_VALUE, "brightness_level": 100}, BULK_RESULT_UPDATED),
+        ({"brightness_level": 100}, BULK_RESULT_OFF),
+        ({ATTR_POWER: "off", "brightness_level": 100}, BULK_RESULT_OFF),
+        ({ATTR_POWER: ON_VALUE}, BULK_RESULT_UNSUPPORTED),
+    ],
+)
+async def test_brightness_level_operation(state, expected) -> None:
+    """Test brightness level changes."""
+
+    wrapper = await _build_wrapper(0, state)
+    with patch(f"{AirPurifierDriver_TypeName}.set_brightness_level"):
+        summary = await async_run_bulk([wrapper], brightness_level_operation(30))
+
+    assert summary["devices"][0]["result"] == expected
+
+
+@pytest.mark.parametrize(
+    ("state", "expected"),
+    [
+        ({"child_lock": ON_VALUE}, BULK_RESULT_SKIPPED),
+        ({"child_lock": "off"}, BULK_RESULT_UPDATED),
+        ({}, BULK_RESULT_UNSUPPORTED),
+    ],
+)
+async def test_child_lock_operation(state, expected) -> None:
+    """Test child lock changes."""
+
+    wrapper = await _build_wrapper(0, state)
+    with patch(f"{AirPurifierDriver_TypeName}.child_lock_on"):
+        summary = await async_run_bulk([wrapper], child_lock_operation(True))
+
+    assert summary["devices"][0]["result"] == expected
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_bulk_service(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test the bulk service response."""
+
+    await init_integration(hass, device_stub, device_data, aioclient_mock)
+
+    response = await hass.services.async_call(
+        WINIX_DOMAIN,
+        SERVICE_BULK_SET_POWER,
+        {ATTR_POWER: False},
+        blocking=True,
+        return_response=True,
+    )
+    assert response[BULK_RESULT_SKIPPED] == 1
+    assert response["devices"][0]["mac"] == "mac"
+
+    with patch(f"{AirPurifierDriver_TypeName}.turn_on") as turn_on:
+        response = await hass.services.async_call(
+            WINIX_DOMAIN,
+            SERVICE_BULK_SET_POWER,
+            {ATTR_POWER: True, ATTR_ENTITY_ID: "fan.winix_devicealias"},
+            blocking=True,
+            return_response=True,
+        )
+    assert turn_on.call_count == 1
+    assert response[BULK_RESULT_UPDATED] == 1
+    assert hass.states.get("fan.winix_devicealias").state == "on"
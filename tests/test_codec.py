@@ -0,0 +1,48 @@
+"""Test the JSON codec."""
+
+import json
+
+import pytest
+
+from custom_components.winix.codec import (
+    JSON_DECODE_ERRORS,
+    _stdlib_dumps,
+    _stdlib_loads,
+    json_dumps,
+    json_loads,
+)
+from custom_components.winix.helpers import Helpers
+
+from .benchmark_codec import PAYLOADS, run
+
+
+@pytest.mark.parametrize("name", PAYLOADS)
+def test_codecs_match(name: str) -> None:
+    """Test that the codec decodes the payloads like the standard library."""
+    payload = PAYLOADS[name]()
+    data = json_dumps(payload)
+
+    assert isinstance(data, bytes)
+    assert json_loads(data) == json.loads(data) == payload
+    assert json_loads(data.decode()) == payload
+    assert _stdlib_loads(_stdlib_dumps(payload)) == payload
+    assert _stdlib_loads(memoryview(data)) == payload
+
+
+@pytest.mark.parametrize("loads", [json_loads, _stdlib_loads])
+def test_invalid_json(loads) -> None:
+    """Test that both decoders raise JSON_DECODE_ERRORS on invalid data."""
+    with pytest.raises(JSON_DECODE_ERRORS):
+        loads(b"{invalid")
+
+
+def test_helpers_json_loads() -> None:
+    """Test that Helpers.json_loads accepts bytes and ignores invalid data."""
+    assert Helpers.json_loads(b'{"a": 1}') == {"a": 1}
+    assert Helpers.json_loads('{"a": 1}') == {"a": 1}
+    assert Helpers.json_loads(b"\x00garbage") == {}
+
+
+def test_benchmark() -> None:
+    """Test that the benchmark covers all the payloads."""
+    assert [name for name, _, _ in run(number=1)] == list(PAYLOADS)
@@ -0,0 +1,133 @@
+"""Test the Cognito client."""
+
+from http import HTTPStatus
+import json
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.cognito import CognitoClient, CognitoError
+from custom_components.winix.helpers import Helpers, WinixException
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .common import build_credentials  # noqa: TID251
+
+IDP_URL = "https://cognito-idp.us-east-1.amazonaws.com/"
+IDENTITY_URL = "https://cognito-identity.us-east-1.amazonaws.com/"
+
+
+async def test_refresh_tokens(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the InitiateAuth request and response."""
+
+    aioclient_mock.post(
+        IDP_URL,
+        json={"AuthenticationResult": {"AccessToken": "access", "IdToken": "id"}},
+    )
+    client = CognitoClient(async_get_clientsession(hass))
+
+    result = await client.async_refresh_tokens("client_id", "refresh_token")
+
+    assert result == {"AccessToken": "access", "IdToken": "id"}
+    _, _, data, headers = aioclient_mock.mock_calls[0]
+    assert headers["X-Amz-Target"] == "AWSCognitoIdentityProviderService.InitiateAuth"
+    assert headers["Content-Type"] == "application/x-amz-json-1.1"
+    assert json.loads(data) == {
+        "ClientId": "client_id",
+        "AuthFlow": "REFRESH_TOKEN",
+        "AuthParameters": {"REFRESH_TOKEN": "refresh_token"},
+    }
+
+
+async def test_get_id(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """Test the GetId request and response."""
+
+    aioclient_mock.post(IDENTITY_URL, json={"IdentityId": "identity_id"})
+    client = CognitoClient(async_get_clientsession(hass))
+
+    assert await client.async_get_id("pool", {"login": "token"}) == "identity_id"
+    _, _, data, headers = aioclient_mock.mock_calls[0]
+    assert headers["X-Amz-Target"] == "AWSCognitoIdentityService.GetId"
+    assert json.loads(data) == {"IdentityPoolId": "pool", "Logins": {"login": "token"}}
+
+
+@pytest.mark.parametrize(
+    ("error_type", "expected"),
+    [
+        ("NotAuthorizedException", "NotAuthorizedException"),
+        (
+            "com.amazonaws.cognito.identity.model#NotAuthorizedException",
+            "NotAuthorizedException",
+        ),
+    ],
+)
+async def test_error(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    error_type: str,
+    expected: str,
+) -> None:
+    """Test that the type of an error response is reported as its code."""
+
+    aioclient_mock.post(
+        IDENTITY_URL,
+        status=HTTPStatus.BAD_REQUEST,
+        json={"__type": error_type, "message": "Token expired"},
+    )
+    client = CognitoClient(async_get_clientsession(hass))
+
+    with pytest.raises(CognitoError) as err:
+        await client.async_get_id("pool", {})
+
+    assert err.value.code == expected
+    assert str(err.value) == f"{expected}: Token expired"
+
+
+async def test_identity_id_not_authorized(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test that an expired id token is reported so that callers log in again."""
+
+    aioclient_mock.post(
+        IDENTITY_URL,
+        status=HTTPStatus.BAD_REQUEST,
+        json={"__type": "NotAuthorizedException", "message": "Token expired"},
+    )
+
+    with pytest.raises(WinixException) as err:
+        await Helpers.async_get_identity_id(hass, "id_token")
+
+    assert err.value.result_code == "NotAuthorizedException"
+
+
+async def test_refresh_auth(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test that the refreshed tokens and their ids replace the credentials."""
+
+    aioclient_mock.post(
+        IDP_URL,
+        json={"AuthenticationResult": {"AccessToken": "access", "IdToken": "id"}},
+    )
+    aioclient_mock.post(IDENTITY_URL, json={"IdentityId": "new_identity_id"})
+    credentials = build_credentials()
+
+    with (
+        patch("winix.WinixAccount.get_uuid", return_value="new_uuid"),
+        patch(
+            "custom_components.winix.helpers.Helpers._establish_session"
+        ) as establish_session,
+    ):
+        response = await Helpers.async_refresh_auth(hass, credentials)
+
+    assert response.access_token == "access"
+    assert response.refresh_token == "refresh_token"
+    assert credentials.auth_response is response
+    assert credentials.identity_id == "new_identity_id"
+    assert credentials.uuid == "new_uuid"
+    establish_session.assert_called_once_with(
+        "access", "new_uuid", "user_id", "new_identity_id"
+    )
@@ -3,14 +3,25 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
-
-from custom_components.winix.const import WINIX_DOMAIN
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+from winix import auth
+
+from custom_components.winix.const import (
+    CONF_DEHUMIDIFIER_SCAN_INTERVAL,
+    CONF_DEVICE_SCAN_INTERVALS,
+    CONF_FAST_STARTUP,
+    CONF_HISTORY_WINDOWS,
+    CONF_PURIFIER_SCAN_INTERVAL,
+    WINIX_DOMAIN,
+)
 from custom_components.winix.helpers import WinixException
 from homeassistant import data_entry_flow
-from homeassistant.config_entries import SOURCE_USER
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.config_entries import SOURCE_REAUTH, SOURCE_USER
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 
+from .common import config_entry, init_integration  # noqa: TID251
+
 TEST_USER_DATA = {
     CONF_USERNAME: "user_name",
     CONF_PASSWORD: "password",
@@ -85,3 +96,146 @@ async def test_create_entry(hass: HomeAssistant) -> None:
         )
 
         assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_options_flow(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test the polling options are applied without reloading."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+    assert manager.get_scan_interval(wrapper).total_seconds() == 30
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    # Overrides below the minimum and windows which are not minutes are rejected
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_SCAN_INTERVAL: 60,
+            CONF_PURIFIER_SCAN_INTERVAL: 5,
+            CONF_DEHUMIDIFIER_SCAN_INTERVAL: 0,
+            CONF_HISTORY_WINDOWS: "5, 0",
+        },
+    )
+    assert result["errors"] == {
+        CONF_PURIFIER_SCAN_INTERVAL: "interval_too_short",
+        CONF_HISTORY_WINDOWS: "invalid_history_windows",
+    }
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_SCAN_INTERVAL: 60,
+            CONF_PURIFIER_SCAN_INTERVAL: 45,
+            CONF_DEHUMIDIFIER_SCAN_INTERVAL: 0,
+            CONF_HISTORY_WINDOWS: "15, 240",
+        },
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "devices"
+
+    with patch.object(manager, "async_start_polling") as start_polling:
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {"deviceAlias": 10}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options == {
+        CONF_SCAN_INTERVAL: 60,
+        CONF_PURIFIER_SCAN_INTERVAL: 45,
+        CONF_DEHUMIDIFIER_SCAN_INTERVAL: 0,
+        CONF_DEVICE_SCAN_INTERVALS: {"mac": 10},
+        CONF_FAST_STARTUP: False,
+        CONF_HISTORY_WINDOWS: [15, 240],
+    }
+    assert start_polling.call_count == 1
+    assert entry.runtime_data is manager
+    assert manager.get_scan_interval(wrapper).total_seconds() == 10
+    assert wrapper.history.windows == (900, 14400)
+
+    # Removing the device override falls back to the product group
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_DEVICE_SCAN_INTERVALS: {}}
+    )
+    assert manager.get_scan_interval(wrapper).total_seconds() == 45
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_options_flow_not_loaded(hass: HomeAssistant) -> None:
+    """Test that the device step is skipped when the entry is not loaded."""
+
+    entry = config_entry(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_SCAN_INTERVAL: 20,
+            CONF_PURIFIER_SCAN_INTERVAL: 0,
+            CONF_DEHUMIDIFIER_SCAN_INTERVAL: 120,
+        },
+    )
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_DEHUMIDIFIER_SCAN_INTERVAL] == 120
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_reauth_loaded_entry(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that the new tokens are handed to a loaded entry without reloading."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    hass.config_entries.async_update_entry(entry, unique_id="username")
+    manager = entry.runtime_data
+    credentials = manager.credentials
+
+    result = await hass.config_entries.flow.async_init(
+        WINIX_DOMAIN,
+        context={
+            "source": SOURCE_REAUTH,
+            "unique_id": entry.unique_id,
+            "entry_id": entry.entry_id,
+        },
+        data=entry.data,
+    )
+    assert result["step_id"] == "reauth_confirm"
+
+    with (
+        patch(
+            "custom_components.winix.Helpers.async_login",
+            return_value=auth.WinixAuthResponse(**LOGIN_AUTH_RESPONSE),
+        ),
+        patch(
+            "custom_components.winix.manager.Helpers.async_get_identity_id",
+            return_value="new_identity_id",
+        ),
+        patch.object(hass.config_entries, "async_reload") as reload,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_PASSWORD: "new_password"}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert reload.call_count == 0
+    assert entry.runtime_data is manager
+    assert manager.credentials is credentials
+    assert credentials.access_token == "AccessToken"
+    assert credentials.identity_id == "new_identity_id"
+    assert entry.data[CONF_PASSWORD] == "new_password"
@@ -0,0 +1,97 @@
+"""Test the shared credentials."""
+
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.credentials import async_get_credentials
+from homeassistant.core import HomeAssistant
+
+from .common import build_credentials, init_integration  # noqa: TID251
+
+
+def test_uuid_memoized() -> None:
+    """Test that the uuid is only derived again for a new access token."""
+
+    credentials = build_credentials()
+    with patch(
+        "winix.WinixAccount.get_uuid", side_effect=["uuid_1", "uuid_2"]
+    ) as get_uuid:
+        assert credentials.uuid == "uuid_1"
+        assert credentials.uuid == "uuid_1"
+        assert get_uuid.call_count == 1
+
+        credentials.update(
+            replace(credentials.auth_response, access_token="new_access_token")
+        )
+        assert credentials.uuid == "uuid_2"
+        assert get_uuid.call_count == 2
+
+        # Derived ids which come with the tokens are used as is
+        credentials.update(
+            replace(credentials.auth_response, access_token="access_token_3"),
+            uuid="uuid_3",
+        )
+        assert credentials.uuid == "uuid_3"
+        assert get_uuid.call_count == 2
+
+
+async def test_identity_id_memoized(hass: HomeAssistant) -> None:
+    """Test that the identity id is only looked up for a new id token."""
+
+    credentials = build_credentials(identity_id=None)
+    with patch(
+        "custom_components.winix.credentials.Helpers.async_get_identity_id",
+        side_effect=["identity_1", "identity_2"],
+    ) as get_identity_id:
+        assert await credentials.async_get_identity_id(hass) == "identity_1"
+        assert await credentials.async_get_identity_id(hass) == "identity_1"
+        assert get_identity_id.call_count == 1
+
+        # The known identity id is kept until the one of the new token is looked up
+        credentials.update(replace(credentials.auth_response, id_token="new_token"))
+        assert credentials.identity_id == "identity_1"
+        assert await credentials.async_get_identity_id(hass) == "identity_2"
+        assert get_identity_id.call_count == 2
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_credentials_kept_across_reloads(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that a reload does not look up the identity id again."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    credentials = entry.runtime_data.credentials
+
+    with (
+        patch(
+            "custom_components.winix.Helpers.get_device_stubs",
+            return_value=[device_stub],
+        ),
+        patch(
+            "custom_components.winix.Helpers.get_models_filter_max_life",
+            return_value={},
+        ),
+        patch(
+            "custom_components.winix.credentials.Helpers.async_get_identity_id"
+        ) as get_identity_id,
+        patch("winix.WinixAccount.get_uuid") as get_uuid,
+    ):
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.runtime_data.credentials is credentials
+    assert get_identity_id.call_count == 0
+    assert get_uuid.call_count == 0
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    assert (
+        async_get_credentials(hass, entry.entry_id, credentials.auth_response)
+        is not credentials
+    )
@@ -10,6 +10,7 @@ from custom_components.winix.const import (
     AIRFLOW_SLEEP,
     AIRFLOW_TURBO,
     ATTR_AIRFLOW,
+    ATTR_CHILD_LOCK,
     ATTR_MODE,
     ATTR_PLASMA,
     ATTR_POWER,
@@ -32,7 +33,11 @@ from custom_components.winix.const import (
 )
 from custom_components.winix.device_wrapper import WinixDeviceWrapper
 
-from .common import build_mock_dehumidifier_wrapper, build_mock_wrapper  # noqa: TID251
+from .common import (  # noqa: TID251
+    build_credentials,
+    build_mock_dehumidifier_wrapper,
+    build_mock_wrapper,
+)
 
 AirPurifierDriver_TypeName = "custom_components.winix.driver.AirPurifierDriver"
 DehumidifierDriver_TypeName = "custom_components.winix.driver.DehumidifierDriver"
@@ -112,12 +117,39 @@ async def test_wrapper_update(
 )
 def test_model_fan_speeds(model, expected) -> None:
     """Expose Super Clean only for Tower Prime."""
-    wrapper = build_mock_wrapper()
-    wrapper.device_stub.model = model
+    device_stub = Mock()
+    device_stub.model = model
 
+    # The capabilities are computed from the model when the wrapper is built
+    wrapper = WinixDeviceWrapper(Mock(), device_stub, Mock(), build_credentials())
     assert wrapper.fan_speeds == expected
 
 
+async def test_update_features() -> None:
+    """Test that the features of the model are extended by the polled state."""
+    device_stub = Mock(product_group="Air01", model="T800", model_id="T800_US")
+    wrapper = WinixDeviceWrapper(Mock(), device_stub, Mock(), build_credentials())
+
+    # Declared for the model
+    assert wrapper.features.supports_pm25
+    assert not wrapper.features.supports_child_lock
+
+    with patch(
+        f"{AirPurifierDriver_TypeName}.get_state",
+        return_value={ATTR_POWER: ON_VALUE, ATTR_CHILD_LOCK: OFF_VALUE},
+    ):
+        await wrapper.update()
+    assert wrapper.update_features()
+    assert wrapper.features.supports_child_lock
+    assert wrapper.features.supports_pm25
+
+    # Features are kept when the state no longer reports them
+    with patch(f"{AirPurifierDriver_TypeName}.get_state", return_value={}):
+        await wrapper.update()
+    assert not wrapper.update_features()
+    assert wrapper.features.supports_child_lock
+
+
 async def test_async_ensure_on() -> None:
     """Test ensuring device is on."""
     with patch(f"{AirPurifierDriver_TypeName}.turn_on") as turn_on:
@@ -132,6 +164,27 @@ async def test_async_ensure_on() -> None:
         assert turn_on.call_count == 1  # Should not do anything
 
 
+async def test_state_version() -> None:
+    """Test that the state version changes with the device data."""
+    with (
+        patch(f"{AirPurifierDriver_TypeName}.get_state", AsyncMock(return_value={})),
+        patch(f"{AirPurifierDriver_TypeName}.turn_on"),
+    ):
+        wrapper = build_mock_wrapper()
+        version = wrapper.state_version
+
+        await wrapper.update()
+        assert wrapper.state_version > version
+        version = wrapper.state_version
+
+        await wrapper.async_ensure_on()
+        assert wrapper.state_version > version
+        version = wrapper.state_version
+
+        await wrapper.async_ensure_on()  # Nothing changed
+        assert wrapper.state_version == version
+
+
 async def test_async_turn_off() -> None:
     """Test turning off."""
     with (
@@ -375,7 +428,7 @@ async def test_async_set_preset_mode_invalid() -> None:
     logger.debug = Mock()
     logger.warning = Mock()
 
-    wrapper = WinixDeviceWrapper(client, device_stub, logger, "test_identity_id")
+    wrapper = WinixDeviceWrapper(client, device_stub, logger, build_credentials())
 
     with pytest.raises(ValueError):
         await wrapper.async_set_preset_mode("INVALID_PRESET")
@@ -496,3 +549,140 @@ async def test_dehumidifier_auto_dry_flag(power_value, is_on, is_auto_dry) -> No
 
         assert wrapper.is_on is is_on
         assert wrapper.is_auto_dry is is_auto_dry
+
+
+async def test_snapshot_restore() -> None:
+    """Restore only writes the attributes which differ."""
+
+    state = {
+        ATTR_POWER: ON_VALUE,
+        ATTR_MODE: MODE_MANUAL,
+        ATTR_AIRFLOW: AIRFLOW_HIGH,
+        ATTR_PLASMA: ON_VALUE,
+        "air_qvalue": 71,
+    }
+    with patch(
+        f"{AirPurifierDriver_TypeName}.get_state", AsyncMock(return_value=state)
+    ):
+        wrapper = build_mock_wrapper()
+        await wrapper.update()
+
+    snapshot = wrapper.snapshot()
+    assert snapshot == {
+        ATTR_POWER: ON_VALUE,
+        ATTR_MODE: MODE_MANUAL,
+        ATTR_AIRFLOW: AIRFLOW_HIGH,
+        ATTR_PLASMA: ON_VALUE,
+    }
+
+    with patch(f"{AirPurifierDriver_TypeName}.set_attr") as set_attr:
+        assert await wrapper.async_restore(snapshot) == (0, 4)
+        assert set_attr.call_count == 0
+
+        # Device was changed to auto mode with low airflow
+        wrapper.get_state().update({ATTR_MODE: MODE_AUTO, ATTR_AIRFLOW: AIRFLOW_LOW})
+        assert await wrapper.async_restore(snapshot) == (2, 2)
+        assert [call.args for call in set_attr.call_args_list] == [
+            (ATTR_MODE, MODE_MANUAL),
+            (ATTR_AIRFLOW, AIRFLOW_HIGH),
+        ]
+        assert wrapper.is_manual
+
+        # Nothing but power is written for a powered off snapshot
+        set_attr.reset_mock()
+        assert await wrapper.async_restore(
+            {ATTR_POWER: OFF_VALUE, ATTR_MODE: MODE_AUTO}
+        ) == (1, 1)
+        set_attr.assert_called_once_with(ATTR_POWER, OFF_VALUE)
+        assert not wrapper.is_on
+
+
+async def test_snapshot_restore_auto() -> None:
+    """Airflow is not restored for an auto mode snapshot."""
+
+    state = {
+        ATTR_POWER: ON_VALUE,
+        ATTR_MODE: MODE_AUTO,
+        ATTR_AIRFLOW: AIRFLOW_LOW,
+        ATTR_PLASMA: ON_VALUE,
+    }
+    with patch(
+        f"{AirPurifierDriver_TypeName}.get_state", AsyncMock(return_value=state)
+    ):
+        wrapper = build_mock_wrapper()
+        await wrapper.update()
+
+    snapshot = wrapper.snapshot()
+
+    with patch(f"{AirPurifierDriver_TypeName}.set_attr") as set_attr:
+        # Device was changed to sleep with plasma off
+        wrapper.get_state().update(
+            {
+                ATTR_MODE: MODE_MANUAL,
+                ATTR_AIRFLOW: AIRFLOW_SLEEP,
+                ATTR_PLASMA: OFF_VALUE,
+            }
+        )
+        assert await wrapper.async_restore(snapshot) == (2, 2)
+        assert [call.args for call in set_attr.call_args_list] == [
+            (ATTR_MODE, MODE_AUTO),
+            (ATTR_PLASMA, ON_VALUE),
+        ]
+        assert wrapper.is_auto
+
+        # Airflow of a sleep snapshot is written after the mode
+        wrapper.get_state()[ATTR_AIRFLOW] = AIRFLOW_LOW
+        set_attr.reset_mock()
+        assert await wrapper.async_restore(
+            {ATTR_MODE: MODE_MANUAL, ATTR_AIRFLOW: AIRFLOW_SLEEP}
+        ) == (2, 0)
+        assert [call.args for call in set_attr.call_args_list] == [
+            (ATTR_MODE, MODE_MANUAL),
+            (ATTR_AIRFLOW, AIRFLOW_SLEEP),
+        ]
+        assert wrapper.is_sleep
+
+
+async def test_snapshot_restore_dehumidifier_auto() -> None:
+    """The fan speed of a dehumidifier is restored in auto mode."""
+
+    state = {
+        ATTR_POWER: ON_VALUE,
+        ATTR_MODE: MODE_AUTO,
+        ATTR_AIRFLOW: AIRFLOW_HIGH,
+        ATTR_CHILD_LOCK: OFF_VALUE,
+    }
+    with patch(
+        f"{DehumidifierDriver_TypeName}.get_state", AsyncMock(return_value=state)
+    ):
+        wrapper = build_mock_dehumidifier_wrapper()
+        await wrapper.update()
+
+    snapshot = wrapper.snapshot()
+    assert snapshot[ATTR_MODE] == MODE_AUTO
+    assert snapshot[ATTR_AIRFLOW] == AIRFLOW_HIGH
+
+    with patch(f"{DehumidifierDriver_TypeName}.set_attr") as set_attr:
+        # Device was changed to continuous mode with turbo fan speed
+        wrapper.get_state().update(
+            {ATTR_MODE: MODE_CONTINUOUS, ATTR_AIRFLOW: AIRFLOW_TURBO}
+        )
+        assert await wrapper.async_restore(snapshot) == (2, len(snapshot) - 2)
+        assert [call.args for call in set_attr.call_args_list] == [
+            (ATTR_MODE, MODE_AUTO),
+            (ATTR_AIRFLOW, AIRFLOW_HIGH),
+        ]
+        assert wrapper.get_state()[ATTR_AIRFLOW] == AIRFLOW_HIGH
+
+
+async def test_snapshot_auto_dry() -> None:
+    """Auto-dry is saved as powered off."""
+
+    with patch(
+        f"{DehumidifierDriver_TypeName}.get_state",
+        AsyncMock(return_value={ATTR_POWER: AUTO_DRY_VALUE, ATTR_TIMER: 4}),
+    ):
+        wrapper = build_mock_dehumidifier_wrapper()
+        await wrapper.update()
+
+    assert wrapper.snapshot() == {ATTR_POWER: OFF_VALUE, ATTR_TIMER: 4}
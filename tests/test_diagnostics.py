@@ -0,0 +1,126 @@
+"""Test Winix diagnostics."""
+
+import json
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.const import WINIX_AUTH_RESPONSE, WINIX_DOMAIN
+from custom_components.winix.diagnostics import (
+    _get_token_expiry,
+    async_get_config_entry_diagnostics,
+    async_get_device_diagnostics,
+)
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .common import TEST_DEVICE_ID, init_integration  # noqa: TID251
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_entry_diagnostics(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test the config entry diagnostics."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"] == {
+        WINIX_AUTH_RESPONSE: REDACTED,
+        CONF_USERNAME: REDACTED,
+        CONF_PASSWORD: REDACTED,
+    }
+    assert diagnostics["auth"] == {
+        "user_id": REDACTED,
+        "access_token": REDACTED,
+        "refresh_token": REDACTED,
+        "id_token": REDACTED,
+        "access_token_expires": None,
+    }
+    assert set(diagnostics["setup"]["steps"]) == {
+        "device_stubs",
+        "identity_id",
+        "models",
+        "filter_usage_store",
+        "feature_store",
+        "devices",
+    }
+    assert diagnostics["scheduler"]["devices"][0]["alias"] == "deviceAlias"
+    assert "hit_rate" in diagnostics["caches"]["attributes"]
+    assert diagnostics["recent_requests"][-1]["status"] == 200
+
+    device = diagnostics["devices"][0]
+    assert device["poll"]["polls"] == 1
+    assert device["poll"]["success_rate"] == 100.0
+    assert device["state"]["filter_hour"] == 1257
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_device_diagnostics(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test the device diagnostics."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+
+    device = dr.async_get(hass).async_get_device(identifiers={(WINIX_DOMAIN, "mac")})
+    diagnostics = await async_get_device_diagnostics(hass, entry, device)
+
+    assert diagnostics["alias"] == "deviceAlias"
+    assert diagnostics["poll"]["polls"] == 1
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_diagnostics_without_device_id(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that the device id and its mac are not part of the diagnostics."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+    manager.async_stop_polling()
+
+    # Capture the raw response of a new report
+    wrapper.tracer.start()
+    device_data["body"]["data"][0]["creationTime"] += 1000
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        f"https://us.api.winix-iot.com/common/event/sttus/devices/{TEST_DEVICE_ID}",
+        json=device_data,
+    )
+    await manager._async_poll_device(wrapper, dt_util.utcnow())  # noqa: SLF001
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["devices"][0]["trace"][0]["data"]["body"]["deviceId"] == (
+        REDACTED
+    )
+    mac = TEST_DEVICE_ID.partition("_")[0]
+    output = json.dumps(diagnostics, default=str)
+    assert TEST_DEVICE_ID not in output
+    assert mac.lower() not in output.lower()
+
+
+def test_token_expiry() -> None:
+    """Test reading the expiry of the access token."""
+
+    # {"exp": 1700000000} without a signature
+    token = "eyJhbGciOiJub25lIn0.eyJleHAiOjE3MDAwMDAwMDB9."
+    assert _get_token_expiry(token).timestamp() == 1700000000
+    assert _get_token_expiry("access_token") is None
+    assert _get_token_expiry(None) is None
@@ -5,10 +5,17 @@ from unittest.mock import AsyncMock, Mock, patch
 import aiohttp
 import pytest
 
+from custom_components.winix.codec import json_dumps
 from custom_components.winix.const import ATTR_POWER, OFF_VALUE
-from custom_components.winix.driver import AirPurifierDriver, DehumidifierDriver
+from custom_components.winix.driver import (
+    AirPurifierDriver,
+    DehumidifierDriver,
+    WinixTransientError,
+)
 from homeassistant.exceptions import HomeAssistantError
 
+from .common import build_credentials  # noqa: TID251
+
 # ---------------------------------------------------------------------------
 # AirPurifierDriver tests
 # ---------------------------------------------------------------------------
@@ -66,6 +73,29 @@ async def test_control_success(mock_airpurifier_driver) -> None:
     response.text.assert_awaited_once()
 
 
+async def test_control_rotated_credentials() -> None:
+    """Test that a new identity id is used from the next request on."""
+
+    response = Mock()
+    response.raise_for_status = Mock()
+    response.text = AsyncMock(return_value="OK")
+    client = Mock()
+    client.get = AsyncMock(return_value=response)
+    credentials = build_credentials()
+    driver = AirPurifierDriver("device_1", client, credentials)
+
+    await driver.control(ATTR_POWER, OFF_VALUE)
+    credentials.identity_id = "new_identity_id"
+    await driver.control(ATTR_POWER, OFF_VALUE)
+
+    assert client.get.await_args.args[0] == AirPurifierDriver.CTRL_URL.format(
+        deviceid="device_1",
+        identityid="new_identity_id",
+        attribute="A02",
+        value="0",
+    )
+
+
 @pytest.mark.parametrize(
     "status",
     [
@@ -152,6 +182,42 @@ async def test_get_state(mock_airpurifier_driver_with_payload, expected) -> None
     assert state == expected
 
 
+async def test_get_state_unchanged() -> None:
+    """Test that a snapshot which was already seen is reported as unchanged."""
+
+    json_value = {
+        "body": {"data": [{"attributes": {"A02": "1"}, "creationTime": 1673449200634}]}
+    }
+    response = Mock()
+    response.read = AsyncMock(side_effect=lambda: json_dumps(json_value))
+    client = Mock()
+    client.get = AsyncMock(return_value=response)
+    driver = AirPurifierDriver("device_1", client, build_credentials())
+
+    assert await driver.get_state() == {"power": "on"}
+    assert await driver.get_state() is None
+
+    json_value["body"]["data"][0]["creationTime"] += 1000
+    assert await driver.get_state() == {"power": "on"}
+
+
+@pytest.mark.parametrize("body", [b"", b'{"body": ', b"<html>Bad Gateway</html>"])
+async def test_malformed_response(body) -> None:
+    """Test that an undecodable body is reported like a communication error."""
+
+    response = Mock()
+    response.read = AsyncMock(return_value=body)
+    client = Mock()
+    client.get = AsyncMock(return_value=response)
+    driver = AirPurifierDriver("device_1", client, build_credentials())
+
+    with pytest.raises(WinixTransientError, match="Invalid response from Winix"):
+        await driver.get_state()
+
+    with pytest.raises(HomeAssistantError, match="Invalid response from Winix"):
+        await driver.get_filter_life()
+
+
 # ---------------------------------------------------------------------------
 # DehumidifierDriver tests
 # ---------------------------------------------------------------------------
@@ -234,3 +300,22 @@ async def test_dehumidifier_get_state(
 
     state = await mock_dehumidifier_driver_with_payload.get_state()
     assert state == expected
+
+
+@patch("custom_components.winix.driver.WinixDriver._rpc_attr")
+@pytest.mark.parametrize(
+    ("category", "value", "expected"),
+    [
+        ("power", "on", ("D02", "1")),
+        ("mode", "shoes", ("D03", "04")),
+        ("target_humidity", 55, ("D05", "55")),
+        ("timer", 3, ("D15", "3")),
+    ],
+)
+async def test_dehumidifier_set_attr(
+    mock_rpc_attr, mock_dehumidifier_driver, category, value, expected
+) -> None:
+    """Test setting attributes by semantic name."""
+
+    await mock_dehumidifier_driver.set_attr(category, value)
+    assert mock_rpc_attr.call_args[0] == expected
@@ -23,6 +23,7 @@ from custom_components.winix.const import (
     PRESET_MODE_SLEEP,
     PRESET_MODES,
     SERVICE_PLASMAWAVE_ON,
+    TOWER_PRIME_MODEL,
     WINIX_DOMAIN,
 )
 from custom_components.winix.fan import (
@@ -30,6 +31,7 @@ from custom_components.winix.fan import (
     WinixPurifier,
     async_setup_entry,
 )
+from custom_components.winix.profile import build_profile
 from homeassistant.components.fan import FanEntityFeature
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant
@@ -114,7 +116,7 @@ def test_construction(hass: HomeAssistant) -> None:
     """Test device construction."""
     device_wrapper = Mock()
     device_wrapper.get_state = Mock(return_value={})
-    device_wrapper.fan_speeds = ORDERED_NAMED_FAN_SPEEDS
+    device_wrapper.profile = build_profile(Mock(product_group="Air01", model="C545"))
 
     device = WinixPurifier(device_wrapper, Mock())
     assert device.unique_id is not None
@@ -150,11 +152,16 @@ def test_device_attributes(hass: HomeAssistant) -> None:
     """Test device attributes."""
     device_wrapper = Mock()
     device_wrapper.get_state = Mock(return_value=None)
+    device_wrapper.state_version = 0
 
     device = WinixPurifier(device_wrapper, Mock())
     assert device.extra_state_attributes is not None
 
+    # The attributes are cached until the device data changes
     device_wrapper.get_state = Mock(return_value={"DUMMY_ATTR": 12})
+    assert "DUMMY_ATTR" not in device.extra_state_attributes
+
+    device_wrapper.state_version = 1
     assert device.extra_state_attributes["DUMMY_ATTR"] == 12
 
 
@@ -186,6 +193,7 @@ def test_device_percentage(state, is_sleep, is_auto, expected) -> None:
     type(device_wrapper).is_sleep = is_sleep
     type(device_wrapper).is_auto = is_auto
     device_wrapper.fan_speeds = ORDERED_NAMED_FAN_SPEEDS
+    device_wrapper.profile = build_profile(Mock(product_group="Air01", model="C545"))
     device_wrapper.get_state = Mock(return_value=state)
     device = WinixPurifier(device_wrapper, Mock())
     assert device.percentage is expected
@@ -258,6 +266,9 @@ async def test_async_set_percentage_tower_prime(
 ) -> None:
     """Map Tower Prime's maximum percentage to Super Clean."""
     mock_device_wrapper.fan_speeds = ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS
+    mock_device_wrapper.profile = build_profile(
+        Mock(product_group="Air01", model=TOWER_PRIME_MODEL)
+    )
     device = build_purifier(hass, mock_device_wrapper)
 
     await device.async_set_percentage(100)
@@ -0,0 +1,124 @@
+"""Test Winix filter life forecasting."""
+
+from datetime import UTC, datetime
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.forecast import SECONDS_PER_DAY, STORAGE_KEY, FilterUsage
+from homeassistant.core import HomeAssistant
+
+from .common import init_integration  # noqa: TID251
+
+# Midnight UTC
+START = 1673395200
+
+
+def test_daily_rate() -> None:
+    """Test the average usage per day."""
+
+    usage = FilterUsage(window_days=7)
+    usage.add(START, 100)
+    assert usage.daily_rate(START) is None
+
+    # 12 hours in the first day and 6 hours in the second day
+    usage.add(START + 12 * 3600, 112)
+    assert usage.daily_rate(START + 12 * 3600) is None
+
+    usage.add(START + 2 * SECONDS_PER_DAY, 118)
+    assert usage.daily_rate(START + 2 * SECONDS_PER_DAY) == 9
+    assert usage.hours == 118
+
+
+def test_daily_rate_window() -> None:
+    """Test that usage older than the window is forgotten."""
+
+    usage = FilterUsage(window_days=3)
+
+    # Hourly readings of a purifier running all the time for 5 days
+    for hour in range(5 * 24):
+        usage.add(START + hour * 3600, hour)
+
+    now = START + 5 * SECONDS_PER_DAY - 1
+    assert usage.daily_rate(now) == 24
+
+    # Idle for the next days
+    now = START + 10 * SECONDS_PER_DAY
+    usage.add(now, 5 * 24 - 1)
+    assert usage.daily_rate(now) == 0
+    assert usage.projected_replacement(now, 1000) is None
+
+
+def test_filter_replaced() -> None:
+    """Test that a lower filter_hour restarts the observation."""
+
+    usage = FilterUsage(window_days=7)
+    usage.add(START, 500)
+    usage.add(START + 2 * SECONDS_PER_DAY, 540)
+    usage.add(START + 2 * SECONDS_PER_DAY + 60, 0)
+
+    assert usage.hours == 0
+    assert usage.daily_rate(START + 2 * SECONDS_PER_DAY + 60) is None
+
+
+def test_projected_replacement() -> None:
+    """Test the projected replacement date."""
+
+    usage = FilterUsage(window_days=7)
+    usage.add(START, 100)
+    usage.add(START + 2 * SECONDS_PER_DAY, 124)
+
+    now = START + 2 * SECONDS_PER_DAY
+    assert usage.projected_replacement(now, 1000) == datetime(2023, 3, 27, tzinfo=UTC)
+
+    # Already past the max life
+    assert usage.projected_replacement(now, 50) == datetime(2023, 1, 13, tzinfo=UTC)
+
+
+def test_storage_round_trip() -> None:
+    """Test restoring the usage from storage."""
+
+    usage = FilterUsage(window_days=7)
+    usage.add(START, 100)
+    usage.add(START + 2 * SECONDS_PER_DAY, 124)
+
+    restored = FilterUsage.from_dict(usage.as_dict(), window_days=7)
+    assert restored.hours == 124
+    assert restored.daily_rate(START + 2 * SECONDS_PER_DAY) == 12
+
+    # Buckets stored with a different window are dropped
+    assert FilterUsage.from_dict(usage.as_dict(), window_days=30).hours is None
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_forecast_sensors(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+    hass_storage,
+) -> None:
+    """Test that the stored usage is restored for the purifier."""
+
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "mac": {
+                "hours": 1200,
+                "start": 0,
+                "day": 0,
+                "buckets": [0] * 30,
+            }
+        },
+    }
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    wrapper = entry.runtime_data.get_device_wrappers()[0]
+    assert wrapper.filter_usage.hours == 1257
+
+    entity_state = hass.states.get("sensor.winix_devicealias_filter_usage_rate")
+    assert entity_state is not None
+    assert entity_state.attributes.get("unit_of_measurement") == "h/d"
+
+    assert hass.states.get("sensor.winix_devicealias_filter_replacement") is not None
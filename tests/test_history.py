@@ -0,0 +1,150 @@
+"""Test Winix air quality history."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.winix.const import ATTR_AIR_AQI, ATTR_AIR_QVALUE, ATTR_PM25
+from custom_components.winix.history import AirQualityHistory, RollingStatistics
+
+from .common import build_mock_dehumidifier_wrapper, build_mock_wrapper  # noqa: TID251
+
+
+def test_rolling_statistics() -> None:
+    """Test min/max/mean over a sliding window."""
+
+    values = [5, 3, 8, 1, 7, 2]
+    window = 3
+    statistics = RollingStatistics(window)
+
+    for index, value in enumerate(values):
+        if index >= window:
+            statistics.evict(index - window, values[index - window])
+        statistics.add(index, value)
+
+        last = values[max(0, index - window + 1) : index + 1]
+        assert statistics.min == min(last)
+        assert statistics.max == max(last)
+        assert statistics.mean == round(sum(last) / len(last), 2)
+
+
+def test_history_statistics() -> None:
+    """Test the statistics reported for a metric."""
+
+    history = AirQualityHistory(capacity=6, windows=(60, 120), ema_alpha=0.5)
+    for timestamp, value in zip(range(0, 150, 30), [10, 20, 30, 40, 50], strict=True):
+        history.add(timestamp, {ATTR_AIR_QVALUE: value})
+
+    assert len(history) == 5
+    assert history.statistics(ATTR_AIR_QVALUE) == {
+        "min_last_1m": 40,
+        "max_last_1m": 50,
+        "mean_last_1m": 45,
+        "min_last_2m": 20,
+        "max_last_2m": 50,
+        "mean_last_2m": 35,
+        "ema": 40.62,
+    }
+
+    # Nothing recorded for the other metrics
+    assert history.statistics(ATTR_PM25)["mean_last_1m"] is None
+    assert history.statistics(ATTR_PM25)["ema"] is None
+    assert history.samples(ATTR_AIR_AQI) == []
+
+
+def test_history_windows_by_time() -> None:
+    """Test that the windows hold the samples of their duration whatever the interval."""
+
+    history = AirQualityHistory(capacity=10, windows=(300,))
+    # Polled every 30 seconds, then every 2 minutes with a skipped poll
+    for timestamp, value in [(0, 1), (30, 2), (60, 3), (180, 4), (300, 5), (540, 6)]:
+        history.add(timestamp, {ATTR_PM25: value})
+
+    statistics = history.statistics(ATTR_PM25)
+    assert statistics["min_last_5m"] == 5
+    assert statistics["mean_last_5m"] == 5.5
+
+    # A long gap empties the window but for the last sample
+    history.add(1000, {ATTR_PM25: 7})
+    assert history.statistics(ATTR_PM25)["mean_last_5m"] == 7
+
+
+def test_history_wraparound() -> None:
+    """Test that the oldest samples are overwritten once the buffer is full."""
+
+    history = AirQualityHistory(capacity=4, windows=(3600,))
+    for timestamp in range(10):
+        history.add(100 + timestamp, {ATTR_PM25: timestamp})
+
+    assert len(history) == 4
+    assert history.samples(ATTR_PM25) == [(106, 6), (107, 7), (108, 8), (109, 9)]
+
+    # The window is limited to the samples held by the buffer
+    statistics = history.statistics(ATTR_PM25)
+    assert statistics["min_last_1h"] == 6
+    assert statistics["max_last_1h"] == 9
+    assert statistics["mean_last_1h"] == 7.5
+
+
+def test_history_missing_values() -> None:
+    """Test that missing and out of range readings are skipped."""
+
+    history = AirQualityHistory(capacity=4, windows=(2,))
+    history.add(1, {ATTR_AIR_AQI: 3})
+    history.add(2, {ATTR_AIR_AQI: "bad"})
+    history.add(3, {ATTR_AIR_AQI: 300})
+    history.add(4, {})
+
+    assert history.samples(ATTR_AIR_AQI) == [(1, 3)]
+
+    # Both samples in the window are missing
+    statistics = history.statistics(ATTR_AIR_AQI)
+    assert statistics["min_last_2s"] is None
+    assert statistics["mean_last_2s"] is None
+    assert statistics["ema"] == 3
+
+    history.add(5, {ATTR_AIR_AQI: 5})
+    assert history.statistics(ATTR_AIR_AQI)["mean_last_2s"] == 5
+
+
+def test_history_set_windows() -> None:
+    """Test that new windows are computed from the recorded samples."""
+
+    history = AirQualityHistory(capacity=4, windows=(60,))
+    for timestamp in range(6):
+        history.add(timestamp * 60, {ATTR_PM25: timestamp})
+
+    history.set_windows((120, 3600))
+
+    assert history.windows == (120, 3600)
+    statistics = history.statistics(ATTR_PM25)
+    assert "mean_last_1m" not in statistics
+    assert statistics["mean_last_2m"] == 4.5
+    assert statistics["mean_last_1h"] == 3.5
+
+    history.add(360, {ATTR_PM25: 6})
+    assert history.statistics(ATTR_PM25)["mean_last_2m"] == 5.5
+
+
+def test_history_invalid_window() -> None:
+    """Test that empty windows are rejected."""
+
+    with pytest.raises(ValueError):
+        AirQualityHistory(capacity=4, windows=(0,))
+
+
+async def test_wrapper_records_history() -> None:
+    """Test that purifier updates are recorded."""
+
+    wrapper = build_mock_wrapper()
+    with patch(
+        "custom_components.winix.driver.AirPurifierDriver.get_state",
+        AsyncMock(return_value={ATTR_AIR_QVALUE: 71, ATTR_PM25: 12}),
+    ):
+        await wrapper.update()
+        await wrapper.update()
+
+    assert len(wrapper.history) == 2
+    assert wrapper.history.statistics(ATTR_AIR_QVALUE)["max_last_5m"] == 71
+
+    assert build_mock_dehumidifier_wrapper().history is None
@@ -25,6 +25,7 @@ from custom_components.winix.const import (
     WINIX_DOMAIN,
 )
 from custom_components.winix.humidifier import WinixDehumidifier, async_setup_entry
+from custom_components.winix.profile import build_profile
 from homeassistant.components.humidifier import (
     HumidifierAction,
     HumidifierEntityFeature,
@@ -51,6 +52,8 @@ def _mock_dehumidifier_wrapper() -> Mock:
     wrapper.device_stub.alias = "Dehumidifier1"
     wrapper.device_stub.model = "modelX"
     wrapper.device_stub.sw_version = "1.0"
+    wrapper.device_stub.product_group = "Deh01"
+    wrapper.profile = build_profile(wrapper.device_stub)
     wrapper.is_dehumidifier = True
     wrapper.is_on = False
     wrapper.async_turn_on = AsyncMock()
@@ -1 +1,120 @@
 """Test component setup."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix import async_prepare_devices
+from custom_components.winix.const import SERVICE_REMOVE_STALE_ENTITIES, WINIX_DOMAIN
+from custom_components.winix.helpers import WinixException
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .common import init_integration  # noqa: TID251
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_remove_stale_entities(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that the entities of the devices which are no longer known are removed."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    known_entity_ids = {
+        entity.entity_id
+        for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+    }
+
+    stale_device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(WINIX_DOMAIN, "oldmac")}
+    )
+    legacy_entity = entity_registry.async_get_or_create(
+        "fan",
+        WINIX_DOMAIN,
+        "fan.winix_oldmac",
+        config_entry=entry,
+        device_id=stale_device.id,
+    )
+    entity = entity_registry.async_get_or_create(
+        "humidifier",
+        WINIX_DOMAIN,
+        "dehumidifier_oldmac",
+        config_entry=entry,
+        device_id=stale_device.id,
+    )
+
+    await hass.services.async_call(
+        WINIX_DOMAIN, SERVICE_REMOVE_STALE_ENTITIES, blocking=True
+    )
+
+    assert entity_registry.async_get(legacy_entity.entity_id) is None
+    assert entity_registry.async_get(entity.entity_id) is None
+    assert device_registry.async_get(stale_device.id) is None
+    assert known_entity_ids
+    assert all(
+        entity_registry.async_get(entity_id) is not None
+        for entity_id in known_entity_ids
+    )
+
+
+async def test_prepare_devices_refreshes_tokens(hass: HomeAssistant) -> None:
+    """Test that rejected tokens are refreshed before logging in again."""
+
+    manager = Mock()
+    manager.prepare_devices_wrappers = AsyncMock(
+        side_effect=[WinixException({"result_code": "NotAuthorizedException"}), None]
+    )
+    refreshed = Mock()
+
+    with (
+        patch(
+            "custom_components.winix.Helpers.async_refresh_auth",
+            AsyncMock(return_value=refreshed),
+        ) as refresh_auth,
+        patch("custom_components.winix.Helpers.async_login") as login,
+    ):
+        assert (
+            await async_prepare_devices(hass, manager, "username", "password")
+            is refreshed
+        )
+
+    refresh_auth.assert_awaited_once_with(hass, manager.credentials)
+    login.assert_not_called()
+    assert manager.prepare_devices_wrappers.await_count == 2
+
+
+async def test_prepare_devices_login_after_failed_refresh(hass: HomeAssistant) -> None:
+    """Test that the stored credentials are used when the refresh is rejected."""
+
+    manager = Mock()
+    manager.prepare_devices_wrappers = AsyncMock(
+        side_effect=[WinixException({"result_code": "900"}), None]
+    )
+    logged_in = Mock()
+
+    with (
+        patch(
+            "custom_components.winix.Helpers.async_refresh_auth",
+            AsyncMock(
+                side_effect=WinixException({"result_code": "NotAuthorizedException"})
+            ),
+        ),
+        patch(
+            "custom_components.winix.Helpers.async_login",
+            AsyncMock(return_value=logged_in),
+        ) as login,
+    ):
+        assert (
+            await async_prepare_devices(hass, manager, "username", "password")
+            is logged_in
+        )
+
+    login.assert_awaited_once_with(hass, "username", "password")
+    manager.credentials.update.assert_called_once_with(logged_in)
+    assert manager.prepare_devices_wrappers.await_count == 2
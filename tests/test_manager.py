@@ -0,0 +1,414 @@
+"""Test the Winix manager polling."""
+
+from dataclasses import replace
+from itertools import combinations
+from datetime import timedelta
+from typing import Any
+from unittest.mock import Mock, patch
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.binary_sensor import BINARY_SENSOR_DESCRIPTIONS
+from custom_components.winix.const import (
+    CONF_FAST_STARTUP,
+    SIGNAL_DEVICE_POLLED,
+    TOWER_PRIME_MODEL,
+    WINIX_DOMAIN,
+    Features,
+)
+from custom_components.winix.device_wrapper import WinixDeviceWrapper
+from custom_components.winix.driver import WinixTransientError
+from custom_components.winix.fan import PURIFIER_DESCRIPTION
+from custom_components.winix.features import (
+    FEATURE_NAMES,
+    STORAGE_KEY as FEATURES_STORAGE_KEY,
+    async_get_feature_store,
+)
+from custom_components.winix.helpers import WinixException
+from custom_components.winix.humidifier import DEHUMIDIFIER_DESCRIPTION
+from custom_components.winix.manager import (
+    RETRY_INTERVAL_SECONDS,
+    get_device_phase,
+    get_device_platforms,
+)
+from custom_components.winix.number import NUMBER_DESCRIPTIONS
+from custom_components.winix.select import SELECT_DESCRIPTIONS
+from custom_components.winix.sensor import SENSOR_DESCRIPTIONS
+from custom_components.winix.switch import SWITCH_DESCRIPTIONS
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .common import (  # noqa: TID251
+    TEST_DEVICE_ID,
+    build_credentials,
+    init_integration,
+)
+
+AirPurifierDriver_TypeName = "custom_components.winix.driver.AirPurifierDriver"
+CHILD_LOCK_SWITCH_ID = "switch.winix_devicealias_child_lock"
+PM25_SENSOR_ID = "sensor.winix_devicealias_pm_2_5"
+
+PLATFORM_DESCRIPTIONS = {
+    Platform.BINARY_SENSOR: BINARY_SENSOR_DESCRIPTIONS,
+    Platform.FAN: (PURIFIER_DESCRIPTION,),
+    Platform.HUMIDIFIER: (DEHUMIDIFIER_DESCRIPTION,),
+    Platform.NUMBER: NUMBER_DESCRIPTIONS,
+    Platform.SELECT: SELECT_DESCRIPTIONS,
+    Platform.SENSOR: SENSOR_DESCRIPTIONS,
+    Platform.SWITCH: SWITCH_DESCRIPTIONS,
+}
+
+
+def test_device_phase() -> None:
+    """Test that the device phase is stable and spread over the interval."""
+
+    phases = [get_device_phase(f"device_{index}") for index in range(20)]
+
+    assert get_device_phase(TEST_DEVICE_ID) == get_device_phase(TEST_DEVICE_ID)
+    assert all(0 <= phase < 1 for phase in phases)
+    assert len(set(phases)) == 20
+    assert max(phases) - min(phases) > 0.5
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_device_polling(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that the device is polled on its own tick."""
+
+    await init_integration(hass, device_stub, device_data, aioclient_mock)
+    assert aioclient_mock.call_count == 1
+
+    # The device poll starts within one interval and repeats every interval
+    for polls in range(2, 4):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+        await hass.async_block_till_done()
+        assert aioclient_mock.call_count == polls
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_device_polling_retry(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that a transient failure is retried once."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+
+    # Only the retry is scheduled
+    manager.async_stop_polling()
+
+    with patch(
+        f"{AirPurifierDriver_TypeName}.get_state",
+        side_effect=WinixTransientError("boom"),
+    ) as get_state:
+        await manager._async_poll_device(wrapper, dt_util.utcnow())  # noqa: SLF001
+        assert get_state.call_count == 1
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=RETRY_INTERVAL_SECONDS + 1)
+        )
+        await hass.async_block_till_done()
+        assert get_state.call_count == 2
+
+        # No more retries once the retry failed
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=2 * RETRY_INTERVAL_SECONDS + 2)
+        )
+        await hass.async_block_till_done()
+        assert get_state.call_count == 2
+
+    assert entry.runtime_data.get_device_wrappers()[0].get_state()
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_device_polling_unchanged(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that only the poll diagnostics are notified when the device didn't report."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+    manager.async_stop_polling()
+    version = wrapper.state_version
+
+    # The cloud returns the same snapshot as during the setup
+    with patch(
+        "custom_components.winix.manager.async_dispatcher_send"
+    ) as dispatcher_send:
+        await manager._async_poll_device(wrapper, dt_util.utcnow())  # noqa: SLF001
+
+    assert aioclient_mock.call_count == 2
+    dispatcher_send.assert_called_once_with(
+        hass, SIGNAL_DEVICE_POLLED.format(wrapper.device_stub.mac.lower())
+    )
+    assert wrapper.state_version == version
+    assert wrapper.poll_metrics.polls == 2
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_fast_startup(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that the entities are set up from the stored features without polling."""
+
+    hass_storage[FEATURES_STORAGE_KEY] = {
+        "version": 1,
+        "key": FEATURES_STORAGE_KEY,
+        "data": {"mac": {"supports_child_lock": True, "supports_pm25": False}},
+    }
+
+    with patch(
+        f"{AirPurifierDriver_TypeName}.get_state",
+        side_effect=WinixTransientError("boom"),
+    ):
+        entry = await init_integration(
+            hass,
+            device_stub,
+            device_data,
+            aioclient_mock,
+            options={CONF_FAST_STARTUP: True},
+        )
+
+    assert entry.state is ConfigEntryState.LOADED
+    wrapper = entry.runtime_data.get_device_wrappers()[0]
+    assert not wrapper.polled
+    # The stored features stand for those of a poll
+    assert wrapper.features_discovered
+
+    assert hass.states.get("fan.winix_devicealias").state == STATE_UNAVAILABLE
+    assert hass.states.get(CHILD_LOCK_SWITCH_ID).state == STATE_UNAVAILABLE
+    assert hass.states.get(PM25_SENSOR_ID) is None
+
+    # The first successful poll adds the features found in the state
+    entry.runtime_data.async_stop_polling()
+    await entry.runtime_data._async_poll_device(wrapper, dt_util.utcnow())  # noqa: SLF001
+    await hass.async_block_till_done()
+
+    assert wrapper.polled
+    assert wrapper.features.supports_pm25
+    assert wrapper.features.supports_child_lock
+    assert hass.states.get("fan.winix_devicealias").state == "off"
+    assert hass.states.get(PM25_SENSOR_ID) is not None
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_fast_startup_unknown_device(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that devices without stored features are polled during the setup."""
+
+    entry = await init_integration(
+        hass,
+        device_stub,
+        device_data,
+        aioclient_mock,
+        options={CONF_FAST_STARTUP: True},
+    )
+
+    wrapper = entry.runtime_data.get_device_wrappers()[0]
+    assert wrapper.polled
+    assert wrapper.features_discovered
+    assert hass.states.get(PM25_SENSOR_ID) is not None
+
+    features = (await async_get_feature_store(hass)).get_features("mac")
+    assert features.supports_pm25
+    assert not features.supports_child_lock
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_device_discovery(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that devices are added, updated and removed without reloading."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+
+    changed_stub = replace(device_stub, alias="renamed", sw_version="2.0")
+    new_stub = replace(device_stub, id="device_2", mac="mac2", alias="newDevice")
+    aioclient_mock.get(
+        "https://us.api.winix-iot.com/common/event/sttus/devices/device_2",
+        json=device_data,
+    )
+
+    with (
+        patch(
+            "custom_components.winix.manager.Helpers.get_device_stubs",
+            return_value=[changed_stub, new_stub],
+        ),
+        patch("winix.WinixAccount.get_uuid"),
+    ):
+        await manager.async_discover_devices()
+        await hass.async_block_till_done()
+
+    # The existing device is updated in place
+    assert manager.get_device_wrappers()[0] is wrapper
+    assert wrapper.device_stub.alias == "renamed"
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(WINIX_DOMAIN, "mac")})
+    assert device.name == "Winix renamed"
+    assert device.sw_version == "2.0"
+
+    # The new device is polled and gets its entities
+    assert len(manager.get_device_wrappers()) == 2
+    assert hass.states.get("fan.winix_newdevice").state == "off"
+
+    with (
+        patch(
+            "custom_components.winix.manager.Helpers.get_device_stubs",
+            return_value=[new_stub],
+        ),
+        patch("winix.WinixAccount.get_uuid"),
+    ):
+        await manager.async_discover_devices()
+        await hass.async_block_till_done()
+
+    assert manager.get_device_wrappers()[0].device_stub == new_stub
+    assert device_registry.async_get_device(identifiers={(WINIX_DOMAIN, "mac")}) is None
+    assert hass.states.get("fan.winix_devicealias") is None
+    assert hass.states.get("fan.winix_newdevice") is not None
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+@pytest.mark.parametrize(
+    ("device_stubs_error", "models_error"),
+    [
+        (WinixException({"message": "boom"}), None),
+        (None, aiohttp.ClientError("boom")),
+        (None, TimeoutError()),
+    ],
+)
+async def test_device_discovery_failure(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+    device_stubs_error: Exception | None,
+    models_error: Exception | None,
+) -> None:
+    """Test that the devices are kept when the devices cannot be fetched."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    new_stub = replace(device_stub, id="device_2", mac="mac2", alias="newDevice")
+
+    with (
+        patch(
+            "custom_components.winix.manager.Helpers.get_device_stubs",
+            return_value=[new_stub],
+            side_effect=device_stubs_error,
+        ),
+        patch(
+            "custom_components.winix.manager.Helpers.get_models_filter_max_life",
+            side_effect=models_error,
+        ),
+        patch("winix.WinixAccount.get_uuid"),
+    ):
+        await manager.async_discover_devices()
+
+    # Neither the new device is added nor the missing one removed
+    assert [wrapper.device_stub for wrapper in manager.get_device_wrappers()] == [
+        device_stub
+    ]
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_platforms_loaded_when_needed(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that only the platforms of the devices are set up, others when needed."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+
+    assert Platform.FAN in manager.platforms
+    assert Platform.HUMIDIFIER not in manager.platforms
+    assert not hass.states.async_entity_ids(Platform.HUMIDIFIER)
+
+    dehumidifier_stub = replace(
+        device_stub,
+        id="device_2",
+        mac="mac2",
+        alias="dehumidifier",
+        product_group="Deh01",
+    )
+    aioclient_mock.get(
+        "https://us.api.winix-iot.com/common/event/sttus/devices/device_2",
+        json=device_data,
+    )
+
+    with patch(
+        "custom_components.winix.manager.Helpers.get_device_stubs",
+        return_value=[device_stub, dehumidifier_stub],
+    ):
+        await manager.async_discover_devices()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert Platform.HUMIDIFIER in manager.platforms
+    assert hass.states.async_entity_ids(Platform.HUMIDIFIER)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+
+
+@pytest.mark.parametrize(
+    ("product_group", "model", "model_id"),
+    [
+        ("Air01", "modelName", "modelId"),
+        ("Air01", TOWER_PRIME_MODEL, "modelId"),
+        ("Air01", "T800", "T800_US"),
+        ("Deh01", "modelName", "modelId"),
+    ],
+)
+def test_device_platforms(device_stub, product_group, model, model_id) -> None:
+    """Test that the platforms of a device agree with the entity descriptions."""
+
+    stub = replace(
+        device_stub, product_group=product_group, model=model, model_id=model_id
+    )
+
+    for count in range(len(FEATURE_NAMES) + 1):
+        for names in combinations(FEATURE_NAMES, count):
+            wrapper = WinixDeviceWrapper(Mock(), stub, Mock(), build_credentials())
+            features = Features()
+            for name in names:
+                setattr(features, name, True)
+            wrapper.restore_features(features)
+
+            assert get_device_platforms(wrapper) == {
+                platform
+                for platform, descriptions in PLATFORM_DESCRIPTIONS.items()
+                if any(description.exists_fn(wrapper) for description in descriptions)
+            }, names
@@ -0,0 +1,35 @@
+"""Test Winix runtime counters."""
+
+from custom_components.winix.driver import WinixTransientError
+from custom_components.winix.metrics import CacheMetrics, PollMetrics
+
+
+def test_poll_metrics() -> None:
+    """Test the latency and outcome of the recent polls."""
+    metrics = PollMetrics(window=3)
+    assert metrics.success_rate is None
+
+    metrics.add_success(0.1)
+    metrics.add_failure(WinixTransientError("Timeout"))
+    metrics.add_success(0.3)
+    metrics.add_failure(ValueError("Bad value"))
+
+    # The first poll has left the window
+    assert metrics.success_rate == 33.3
+    assert metrics.as_dict() == {
+        "polls": 4,
+        "failures": 2,
+        "errors": {"WinixTransientError": 1, "ValueError": 1},
+        "success_rate": 33.3,
+        "last_error": "Bad value",
+        "last_success": metrics.last_success,
+        "latency_last_ms": 300.0,
+        "latency_mean_ms": 200.0,
+        "latency_max_ms": 300.0,
+    }
+
+
+def test_cache_metrics() -> None:
+    """Test the cache hit rate."""
+    assert CacheMetrics().as_dict()["hit_rate"] is None
+    assert CacheMetrics(hits=3, misses=1).as_dict()["hit_rate"] == 0.75
@@ -0,0 +1,88 @@
+"""Test the setup pipeline."""
+
+import asyncio
+
+import pytest
+
+from custom_components.winix.pipeline import SetupPipeline
+
+
+async def test_run_concurrently() -> None:
+    """Test that independent steps overlap and results are passed on."""
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def _step(name: str, value: int) -> int:
+        started.append(name)
+        await release.wait()
+        return value
+
+    async def _sum(a: int, b: int) -> int:
+        return a + b
+
+    async def _release() -> None:
+        await asyncio.sleep(0)
+        # Both independent steps are running before either completes
+        assert started == ["a", "b"]
+        release.set()
+
+    pipeline = SetupPipeline("test")
+    pipeline.add("a", lambda: _step("a", 1))
+    pipeline.add("b", lambda: _step("b", 2))
+    pipeline.add("release", _release)
+    pipeline.add("sum", _sum, requires=("a", "b"))
+
+    results = await pipeline.async_run()
+
+    assert results == {"a": 1, "b": 2, "release": None, "sum": 3}
+    assert pipeline.timings["sum"].start >= pipeline.timings["a"].end
+    assert pipeline.elapsed >= pipeline.timings["sum"].end
+
+    timings = pipeline.as_dict()
+    assert set(timings["steps"]) == {"a", "b", "release", "sum"}
+    assert timings["elapsed_ms"] is not None
+
+
+async def test_failure_cancels_pending_steps() -> None:
+    """Test that the first failure is raised and the other steps are cancelled."""
+    cancelled = False
+
+    async def _fail() -> None:
+        raise ValueError("failed")
+
+    async def _wait() -> None:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def _dependent(_: None) -> None:
+        pytest.fail("Dependent step should not run")
+
+    pipeline = SetupPipeline("test")
+    pipeline.add("fail", _fail)
+    pipeline.add("wait", _wait)
+    pipeline.add("dependent", _dependent, requires=("fail",))
+
+    with pytest.raises(ValueError, match="failed"):
+        await pipeline.async_run()
+
+    assert cancelled
+    assert "dependent" not in pipeline.timings
+
+
+def test_add_validation() -> None:
+    """Test that duplicate and unknown steps are rejected."""
+
+    async def _step() -> None:
+        pass
+
+    pipeline = SetupPipeline("test")
+    pipeline.add("a", _step)
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        pipeline.add("a", _step)
+    with pytest.raises(ValueError, match="unknown"):
+        pipeline.add("b", _step, requires=("c",))
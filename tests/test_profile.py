@@ -0,0 +1,141 @@
+"""Test Winix device capability profiles."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.winix.const import (
+    AIRFLOW_SUPER,
+    DEHUMIDIFIER_FAN_SPEEDS,
+    DEHUMIDIFIER_MODES,
+    MODE_AUTO,
+    MODE_MANUAL,
+    MODEL_CAPABILITIES,
+    ORDERED_NAMED_FAN_SPEEDS,
+    ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS,
+    ModelCapabilities,
+)
+from custom_components.winix.profile import (
+    PRODUCT_GROUP_AIR_PURIFIER,
+    PRODUCT_GROUP_DEHUMIDIFIER,
+    build_profile,
+)
+from homeassistant.util.percentage import (
+    ordered_list_item_to_percentage,
+    percentage_to_ordered_list_item,
+)
+
+
+def _build_stub(
+    product_group: str | None, model: str | None = "C545", model_id: str | None = None
+) -> Mock:
+    """Return a device stub."""
+    device_stub = Mock()
+    device_stub.alias = "Device"
+    device_stub.model = model
+    device_stub.model_id = model_id
+    device_stub.product_group = product_group
+    return device_stub
+
+
+@pytest.mark.parametrize(
+    ("model", "expected"),
+    [
+        ("C545", ORDERED_NAMED_FAN_SPEEDS),
+        (None, ORDERED_NAMED_FAN_SPEEDS),
+        ("Tower Prime", ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS),
+    ],
+)
+def test_air_purifier_profile(model, expected) -> None:
+    """Test air purifier capabilities."""
+
+    profile = build_profile(_build_stub("Air01", model))
+
+    assert profile.product_group == PRODUCT_GROUP_AIR_PURIFIER
+    assert profile.is_air_purifier
+    assert not profile.is_dehumidifier
+    assert profile.fan_speeds == expected
+    assert profile.speed_count == len(expected)
+    assert profile.modes == [MODE_AUTO, MODE_MANUAL]
+    assert profile.supports_air_quality
+
+
+def test_dehumidifier_profile() -> None:
+    """Test dehumidifier capabilities."""
+
+    profile = build_profile(_build_stub("Deh01"))
+
+    assert profile.product_group == PRODUCT_GROUP_DEHUMIDIFIER
+    assert profile.is_dehumidifier
+    assert profile.fan_speeds == DEHUMIDIFIER_FAN_SPEEDS
+    assert AIRFLOW_SUPER not in profile.speed_percentages
+    assert profile.modes == DEHUMIDIFIER_MODES
+    assert not profile.supports_air_quality
+
+
+@pytest.mark.parametrize("product_group", ["Unknown", "", None])
+def test_unsupported_product_group(product_group) -> None:
+    """Test that unsupported devices are rejected."""
+
+    with pytest.raises(ValueError, match="Unsupported product_group"):
+        build_profile(_build_stub(product_group))
+
+
+@pytest.mark.parametrize(
+    "fan_speeds", [ORDERED_NAMED_FAN_SPEEDS, ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS]
+)
+def test_speed_tables(fan_speeds) -> None:
+    """Test that the lookup tables match Home Assistant's percentage mapping."""
+
+    model = (
+        "Tower Prime" if fan_speeds is ORDERED_NAMED_TOWER_PRIME_FAN_SPEEDS else None
+    )
+    profile = build_profile(_build_stub("Air01", model))
+
+    for speed in fan_speeds:
+        assert profile.speed_to_percentage(speed) == ordered_list_item_to_percentage(
+            fan_speeds, speed
+        )
+
+    for percentage in range(101):
+        assert profile.percentage_to_speed(
+            percentage
+        ) == percentage_to_ordered_list_item(fan_speeds, percentage)
+
+    assert profile.speed_to_percentage(None) is None
+    assert profile.percentage_to_speed(150) == fan_speeds[-1]
+
+    # The tables are shared by the devices of the same model
+    assert (
+        build_profile(_build_stub("Air01", model)).percentage_speeds
+        is profile.percentage_speeds
+    )
+
+
+@pytest.mark.parametrize(
+    ("model_id", "known_model", "features"),
+    [
+        ("C545", True, frozenset()),
+        ("T800_US", True, frozenset({"supports_pm25"})),
+        ("unknown", False, frozenset()),
+        (None, False, frozenset()),
+    ],
+)
+def test_model_capabilities(model_id, known_model, features) -> None:
+    """Test the capabilities declared for the models."""
+    profile = build_profile(_build_stub("Air01", model_id=model_id))
+
+    assert profile.known_model == known_model
+    assert profile.features == features
+
+
+def test_model_fan_speeds_override() -> None:
+    """Test that the model fan speeds replace those of the product group."""
+    fan_speeds = [AIRFLOW_SUPER]
+    with patch.dict(
+        MODEL_CAPABILITIES, {"custom": ModelCapabilities(fan_speeds=fan_speeds)}
+    ):
+        profile = build_profile(_build_stub("Air01", model_id="Custom"))
+
+    assert profile.fan_speeds == fan_speeds
+    assert profile.speed_count == 1
@@ -0,0 +1,175 @@
+"""Test Winix refresh profiling."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.const import (
+    PHASE_DECODE,
+    PHASE_FLAGS,
+    PHASE_HTTP,
+    PHASE_PARSE,
+    SERVICE_PROFILE,
+    WINIX_DOMAIN,
+)
+from custom_components.winix.profiler import PROFILER_DATA, Profiler
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .common import TEST_DEVICE_ID, init_integration  # noqa: TID251
+
+
+def test_profiler_report() -> None:
+    """Test the per-phase breakdown and the top offenders."""
+    profiler = Profiler(top_count=2)
+
+    profiler.add("Bedroom", PHASE_HTTP, 0.2)
+    profiler.add("Bedroom", PHASE_HTTP, 0.4)
+    profiler.add("Bedroom", PHASE_PARSE, 0.001)
+    profiler.add("Office", PHASE_HTTP, 0.3)
+
+    totals = profiler.phase_totals()
+    assert totals[PHASE_HTTP].count == 3
+    assert totals[PHASE_HTTP].max == 0.4
+    assert totals[PHASE_HTTP].mean == pytest.approx(0.3)
+
+    report = profiler.report()
+    assert "Device Bedroom" in report
+    assert "Device Office" in report
+
+    offenders = report.split("Top offenders\n")[1].splitlines()
+    assert offenders == [
+        "       400.0 ms  Bedroom  http",
+        "       300.0 ms  Office  http",
+    ]
+
+
+def test_profiler_measure() -> None:
+    """Test measuring a block."""
+    profiler = Profiler()
+
+    with profiler.measure("Bedroom", PHASE_FLAGS):
+        pass
+
+    assert profiler.phase_totals()[PHASE_FLAGS].count == 1
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_profile_service(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test profiling the refresh and writing the report."""
+
+    await init_integration(hass, device_stub, device_data, aioclient_mock)
+
+    response = await hass.services.async_call(
+        WINIX_DOMAIN,
+        SERVICE_PROFILE,
+        {"duration": 10},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["devices"] == 1
+    assert response["report"] == hass.config.path("winix_profile.txt")
+
+    # Only one profile can run at a time
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            WINIX_DOMAIN, SERVICE_PROFILE, {}, blocking=True, return_response=True
+        )
+
+    # The device reported again since the setup
+    device_data["body"]["data"][0]["creationTime"] += 1000
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        f"https://us.api.winix-iot.com/common/event/sttus/devices/{TEST_DEVICE_ID}",
+        json=device_data,
+    )
+    manager = hass.config_entries.async_entries(WINIX_DOMAIN)[0].runtime_data
+    await manager.async_refresh()
+
+    with patch("custom_components.winix.profiler._write_report") as write_report:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+        await hass.async_block_till_done()
+
+    path, report = write_report.call_args[0]
+    assert path == response["report"]
+    for phase in (PHASE_HTTP, PHASE_DECODE, PHASE_PARSE, PHASE_FLAGS):
+        assert f"  {phase} " in report
+
+    # The devices are no longer profiled
+    wrapper = manager.get_device_wrappers()[0]
+    assert wrapper.tracer.profiler is None
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_profile_finished_on_unload(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that unloading the entry finishes the running profile."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+
+    await hass.services.async_call(
+        WINIX_DOMAIN,
+        SERVICE_PROFILE,
+        {"duration": 10},
+        blocking=True,
+        return_response=True,
+    )
+    assert wrapper.tracer.profiler is not None
+
+    with patch("custom_components.winix.profiler._write_report") as write_report:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert write_report.call_count == 1
+        assert wrapper.tracer.profiler is None
+        assert PROFILER_DATA not in hass.data
+
+        # The timer was cancelled
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+        await hass.async_block_till_done()
+        assert write_report.call_count == 1
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_profile_finished_on_stop(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that stopping Home Assistant finishes the running profile."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    wrapper = entry.runtime_data.get_device_wrappers()[0]
+
+    await hass.services.async_call(
+        WINIX_DOMAIN,
+        SERVICE_PROFILE,
+        {"duration": 10},
+        blocking=True,
+        return_response=True,
+    )
+
+    with patch("custom_components.winix.profiler._write_report") as write_report:
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+        await hass.async_block_till_done()
+
+    write_report.assert_called_once()
+    assert wrapper.tracer.profiler is None
+    assert PROFILER_DATA not in hass.data
@@ -5,7 +5,8 @@ from unittest.mock import AsyncMock, MagicMock, Mock
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.winix.const import WINIX_DOMAIN
+from custom_components.winix.const import DEHUMIDIFIER_FAN_SPEEDS, WINIX_DOMAIN
+from custom_components.winix.profile import build_profile
 from custom_components.winix.select import (
     SELECT_DESCRIPTIONS,
     WinixSelectEntity,
@@ -27,6 +28,8 @@ def _mock_dehumidifier_wrapper() -> MagicMock:
     wrapper.device_stub.alias = "Dehumidifier1"
     wrapper.device_stub.model = "modelX"
     wrapper.device_stub.sw_version = "1.0"
+    wrapper.device_stub.product_group = "Deh01"
+    wrapper.profile = build_profile(wrapper.device_stub)
     wrapper.is_dehumidifier = True
     wrapper.features.supports_brightness_level = False
     wrapper.async_set_speed = AsyncMock(return_value=True)
@@ -99,6 +102,13 @@ def test_brightness_available_follows_is_on(is_on, expected_available) -> None:
 # ---------------------------------------------------------------------------
 
 
+def test_fan_speed_options() -> None:
+    """fan_speed options are the fan speeds of the device profile."""
+    entity = WinixSelectEntity(_mock_dehumidifier_wrapper(), Mock(), FAN_SPEED_DESC)
+
+    assert entity.options == DEHUMIDIFIER_FAN_SPEEDS
+
+
 @pytest.mark.parametrize(
     ("state", "expected_available"),
     [
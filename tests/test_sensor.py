@@ -1,17 +1,23 @@
 """Test Winix sensors."""
 
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
 
 from custom_components.winix.const import ATTR_AIR_QUALITY, WINIX_DOMAIN
+from custom_components.winix.driver import WinixTransientError
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import UnitOfDensity
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from .common import init_integration  # noqa: TID251
 
 TEST_DEVICE_ID = "847207352CE0_364yr8i989"
 PM25_SENSOR_ID = "sensor.winix_devicealias_pm_2_5"
+DATA_AGE_SENSOR_ID = "sensor.winix_devicealias_data_age"
 
 
 @pytest.mark.usefixtures("enable_custom_integrations")
@@ -141,3 +147,69 @@ async def test_sensor_pm25_missing(
 
     entity_state = hass.states.get(PM25_SENSOR_ID)
     assert entity_state is None
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_diagnostic_sensors(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test the sensors computed from the poll metadata."""
+
+    await init_integration(hass, device_stub, device_data, aioclient_mock)
+
+    entity_state = hass.states.get("sensor.winix_devicealias_wi_fi_signal")
+    assert entity_state is not None
+    assert entity_state.state == "-55"
+
+    # Time elapsed since the utcTimestamp of the response
+    entity_state = hass.states.get(DATA_AGE_SENSOR_ID)
+    assert entity_state is not None
+    assert int(entity_state.state) > 0
+
+    entity_state = hass.states.get("sensor.winix_devicealias_poll_latency")
+    assert entity_state is not None
+    assert int(entity_state.state) >= 0
+
+    entity_state = hass.states.get("sensor.winix_devicealias_poll_success_rate")
+    assert entity_state is not None
+    assert float(entity_state.state) == 100
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_diagnostic_sensors_unchanged_snapshot(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that the poll diagnostics keep updating while the device doesn't report."""
+
+    entry = await init_integration(hass, device_stub, device_data, aioclient_mock)
+    manager = entry.runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+    manager.async_stop_polling()
+    data_age = int(hass.states.get(DATA_AGE_SENSOR_ID).state)
+
+    # The cloud keeps returning the snapshot of the setup
+    freezer.tick(60)
+    await manager._async_poll_device(wrapper, dt_util.utcnow())  # noqa: SLF001
+    await hass.async_block_till_done()
+
+    assert int(hass.states.get(DATA_AGE_SENSOR_ID).state) == data_age + 60
+
+    # Failed polls are reported as well
+    freezer.tick(60)
+    with patch(
+        "custom_components.winix.driver.AirPurifierDriver.get_state",
+        side_effect=WinixTransientError("boom"),
+    ):
+        await manager._async_poll_device(wrapper, dt_util.utcnow())  # noqa: SLF001
+        await hass.async_block_till_done()
+
+    assert int(hass.states.get(DATA_AGE_SENSOR_ID).state) == data_age + 120
+    entity_state = hass.states.get("sensor.winix_devicealias_poll_success_rate")
+    assert float(entity_state.state) < 100
@@ -0,0 +1,73 @@
+"""Test Winix snapshot and restore services."""
+
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.const import (
+    ATTR_MODE,
+    ATTR_POWER,
+    MODE_AUTO,
+    ON_VALUE,
+    SERVICE_RESTORE,
+    SERVICE_SNAPSHOT,
+    WINIX_DOMAIN,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from .common import init_integration  # noqa: TID251
+
+AirPurifierDriver_TypeName = "custom_components.winix.driver.AirPurifierDriver"
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_snapshot_restore(
+    hass: HomeAssistant,
+    hass_storage,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test saving and restoring a snapshot."""
+
+    await init_integration(hass, device_stub, device_data, aioclient_mock)
+
+    response = await hass.services.async_call(
+        WINIX_DOMAIN,
+        SERVICE_SNAPSHOT,
+        {"name": "night"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"name": "night", "devices": 1}
+    assert hass_storage["winix.snapshots"]["data"]["night"]["mac"][ATTR_POWER] == "off"
+
+    manager = hass.config_entries.async_entries(WINIX_DOMAIN)[0].runtime_data
+    wrapper = manager.get_device_wrappers()[0]
+    wrapper.get_state().update({ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_AUTO})
+
+    with patch(f"{AirPurifierDriver_TypeName}.set_attr") as set_attr:
+        response = await hass.services.async_call(
+            WINIX_DOMAIN,
+            SERVICE_RESTORE,
+            {"name": "night"},
+            blocking=True,
+            return_response=True,
+        )
+
+    # Only power is written since the snapshot was powered off
+    set_attr.assert_called_once_with(ATTR_POWER, "off")
+    assert response["updated"] == 1
+    assert response["commands_sent"] == 1
+    assert response["commands_skipped"] == 3
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            WINIX_DOMAIN,
+            SERVICE_RESTORE,
+            {"name": "unknown"},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,93 @@
+"""Test Winix device tracing."""
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.const import (
+    SERVICE_START_TRACE,
+    SERVICE_STOP_TRACE,
+    WINIX_DOMAIN,
+)
+from custom_components.winix.trace import DeviceTracer
+from homeassistant.core import HomeAssistant
+
+from .common import TEST_DEVICE_ID, init_integration  # noqa: TID251
+
+
+def test_tracer_disabled() -> None:
+    """Test that nothing is captured until tracing is started."""
+    tracer = DeviceTracer("device", capacity=3)
+
+    assert not tracer.enabled
+    assert tracer.events() == []
+
+    tracer.start()
+    for index in range(5):
+        if tracer.enabled and tracer.sample("update"):
+            tracer.record("update", index)
+
+    # Only the latest events are kept
+    assert [event["data"] for event in tracer.events()] == [2, 3, 4]
+    assert [event["data"] for event in tracer.stop()] == [2, 3, 4]
+    assert not tracer.enabled
+
+
+def test_tracer_sampling() -> None:
+    """Test that each event is sampled independently."""
+    tracer = DeviceTracer("device")
+    tracer.start(sample_rate=3)
+
+    captured = []
+    for index in range(7):
+        if tracer.sample("response"):
+            captured.append(("response", index))
+        if tracer.sample("update"):
+            captured.append(("update", index))
+
+    assert captured == [
+        ("response", 0),
+        ("update", 0),
+        ("response", 3),
+        ("update", 3),
+        ("response", 6),
+        ("update", 6),
+    ]
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_trace_services(
+    hass: HomeAssistant,
+    device_stub,
+    device_data,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test starting and stopping a trace."""
+
+    await init_integration(hass, device_stub, device_data, aioclient_mock)
+
+    response = await hass.services.async_call(
+        WINIX_DOMAIN, SERVICE_START_TRACE, {}, blocking=True, return_response=True
+    )
+    assert response == {"devices": 1}
+
+    # The device reported again since the setup
+    device_data["body"]["data"][0]["creationTime"] += 1000
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        f"https://us.api.winix-iot.com/common/event/sttus/devices/{TEST_DEVICE_ID}",
+        json=device_data,
+    )
+    manager = hass.config_entries.async_entries(WINIX_DOMAIN)[0].runtime_data
+    await manager.async_refresh()
+
+    response = await hass.services.async_call(
+        WINIX_DOMAIN, SERVICE_STOP_TRACE, {}, blocking=True, return_response=True
+    )
+    assert [event["event"] for event in response["mac"]] == ["response", "update"]
+    assert response["mac"][1]["data"]["on"] is False
+
+    # Stopped tracers are not reported
+    response = await hass.services.async_call(
+        WINIX_DOMAIN, SERVICE_STOP_TRACE, {}, blocking=True, return_response=True
+    )
+    assert response == {}
@@ -0,0 +1,103 @@
+"""Test the Winix transport."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.winix.transport import (
+    TokenBucket,
+    WinixTransport,
+    async_get_transport,
+)
+from homeassistant.core import HomeAssistant
+
+TEST_URL = "https://us.api.winix-iot.com/common/event/sttus/devices/device_1"
+ENDPOINT = "us.api.winix-iot.com/common/event/sttus/devices/*"
+
+
+async def test_token_bucket_burst() -> None:
+    """Test that tokens beyond the burst wait for the refill."""
+
+    bucket = TokenBucket(rate=100, capacity=2)
+
+    start = time.monotonic()
+    await bucket.async_acquire()
+    await bucket.async_acquire()
+    assert time.monotonic() - start < 0.01
+
+    # 3 more tokens at 100 per second
+    for _ in range(3):
+        await bucket.async_acquire()
+    assert time.monotonic() - start >= 0.029
+
+
+async def test_concurrency_limit() -> None:
+    """Test that no more than max_concurrency requests are in flight."""
+
+    running = 0
+    peak = 0
+
+    async def request(method, url, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+        response = Mock()
+        response.read = AsyncMock()
+        return response
+
+    session = Mock()
+    session.request = request
+    transport = WinixTransport(session, rate=1000, burst=100, max_concurrency=2)
+
+    responses = await asyncio.gather(*(transport.get(TEST_URL) for _ in range(6)))
+
+    assert peak == 2
+    for response in responses:
+        response.read.assert_awaited_once()
+
+
+async def test_get_reads_body(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test that the response can be used after the slot is released."""
+
+    aioclient_mock.get(TEST_URL, json={"body": {}})
+    aioclient_mock.post(TEST_URL, text="ok")
+
+    transport = async_get_transport(hass)
+    assert async_get_transport(hass) is transport
+
+    response = await transport.get(TEST_URL)
+    assert await response.json() == {"body": {}}
+
+    response = await transport.post(TEST_URL, data="payload")
+    assert await response.text() == "ok"
+    assert aioclient_mock.call_count == 2
+
+    # The requests are summarized without the device and identity ids
+    assert [
+        (request["method"], request["endpoint"], request["status"])
+        for request in transport.recent_requests
+    ] == [("GET", ENDPOINT, 200), ("POST", ENDPOINT, 200)]
+
+
+def test_entry_phases() -> None:
+    """Test that entries get distinct phases and slots are reused."""
+
+    transport = WinixTransport(Mock())
+
+    phases = [transport.async_register_entry(f"entry{index}") for index in range(4)]
+    assert phases[0] == 0
+    assert len(set(phases)) == 4
+    assert all(0 <= phase < 1 for phase in phases)
+
+    # Registering again keeps the phase
+    assert transport.async_register_entry("entry2") == phases[2]
+
+    transport.async_unregister_entry("entry1")
+    assert transport.async_register_entry("entry4") == phases[1]